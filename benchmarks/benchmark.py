@@ -0,0 +1,371 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+# benchmarks the rendering and scaffolding hot paths of the program, using synthetic JSON files
+# the results can be saved as JSON and compared against a previous run, to catch performance regressions
+# usage: python benchmark.py [--repeat=N] [--target=path] [--output=path] [--baseline=path] [--threshold=0.1] [--only=name,name] [--actions=auto|yes|no]
+
+import os, sys, gc, json, time, shutil, platform, tempfile
+
+# make the program's classes importable
+root_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, root_path)
+
+from classes import Application, Journal, Pack, Template
+
+class Benchmark :
+	"""Generates synthetic JSON files with different shapes and measures how long the program takes to process them."""
+
+	# the shapes of the synthetic JSON files, each with the settings used to generate it
+	# files = number of files, dirs = number of directories they're spread across, depth = nesting levels,
+	# placeholders = placeholders per file, multiplier = the {n} used by the multiplier placeholders,
+	# extensions = number of file extensions with copyright information
+	catalogues = {
+		"many_files" : {"files" : 3000, "dirs" : 60, "depth" : 2, "placeholders" : 20, "multiplier" : 4, "extensions" : 4},
+		"deep_nesting" : {"files" : 400, "dirs" : 120, "depth" : 30, "placeholders" : 20, "multiplier" : 4, "extensions" : 4},
+		"dense_placeholders" : {"files" : 100, "dirs" : 5, "depth" : 1, "placeholders" : 5000, "multiplier" : 2, "extensions" : 4},
+		"large_multipliers" : {"files" : 100, "dirs" : 5, "depth" : 1, "placeholders" : 20, "multiplier" : 20000, "extensions" : 4},
+		"copyright_extensions" : {"files" : 1000, "dirs" : 10, "depth" : 1, "placeholders" : 20, "multiplier" : 4, "extensions" : 200}
+	}
+
+	def __init__(self, target_path, repeat, actions) :
+		# instance variables
+		# path to the directory where the synthetic JSON files and the created projects are placed
+		# NOTE: should be on a RAM backed file system (ex: tmpfs), so that the disk doesn't dominate the results
+		self.target_path = target_path
+		# number of times each measurement is repeated
+		self.repeat = repeat
+		# stores the results of each measurement, indexed by name
+		self.results = {}
+		# the names of the measurements that failed, since what they timed didn't do its work
+		self.failures = []
+		# True if the project and file actions are timed from start to finish, False otherwise
+		self.actions = actions
+
+	# builds the synthetic JSON files for a catalogue shape, in its own data directory
+	# returns the path to the data directory
+	def buildCatalogue(self, name) :
+		settings = self.catalogues[name]
+		data_path = os.path.join(self.target_path, name, "data")
+		os.makedirs(data_path, exist_ok = True)
+
+		# the keywords, with the copyright information for each extension
+		extensions = ["ext" + str(i) for i in range(settings["extensions"])]
+		replaces = {"general" : {"tab" : "\t"}}
+		for extension in extensions :
+			replaces[extension] = {"start" : "/*", "end" : "*/", "char" : "*"}
+		keywords = {
+			"author" : "Benchmark Author",
+			"company" : "benchmark company",
+			"copyright" : {
+				"text" : "|!start!||!char{59}!|\n|!char!| |!project_name!| v1.0.0|!tab{10}!||!char!|\n|!char!| Copyright |!author!||!tab{7}!||!char!|\n|!char{59}!||!end!|",
+				"replaces" : replaces
+			}
+		}
+
+		# the content of each file, with the requested number of placeholders
+		placeholders = ["|!project_name!|", "|!file_name[uc]!|", "|!company[t]!|", "|!author[lc]!|", "|!tab{" + str(settings["multiplier"]) + "}!|", "|!missing!|"]
+		parts = ["|!copyright!|\n"]
+		for i in range(settings["placeholders"]) :
+			parts.append("line " + str(i) + " " + placeholders[i % len(placeholders)] + "\n")
+		content = "".join(parts)
+
+		# spread the files across the directories, each directory nested up to the requested depth
+		structure = {}
+		dirs = []
+		for i in range(settings["dirs"]) :
+			if (i % settings["depth"] == 0) :
+				parent = structure
+			parent = parent.setdefault("d" + str(i), {})
+			dirs.append(parent)
+		for i in range(settings["files"]) :
+			dirs[i % len(dirs)]["file" + str(i) + "." + extensions[i % len(extensions)]] = content
+
+		# write the JSON files
+		data = {
+			"project" : {"bench" : structure},
+			"file" : {"bench" : {"extension" : extensions[0], "content" : content}},
+			"help" : {},
+			"keywords" : keywords
+		}
+		for json_name in data :
+			file_object = open(os.path.join(data_path, json_name + ".json"), "w", encoding = "utf-8")
+			json.dump(data[json_name], file_object)
+			file_object.close()
+
+		return(data_path)
+
+	# creates an Application object with the data of a project action on the catalogue loaded, without executing it
+	# raises RuntimeError if the action's data couldn't be loaded
+	def buildApplication(self, data_path) :
+		app_obj = Application.Application(data_path, False)
+		if (not app_obj.prepareAction(["project", self.target_path, "benchmark", "bench"])) :
+			raise RuntimeError("The data in \"" + data_path + "\" couldn't be loaded.")
+
+		# the keyword set by the project action
+		app_obj.keywords["project_name"] = "Benchmark"
+
+		return(app_obj)
+
+	# times a function, calling setup before each repetition without timing it
+	# check is called after each repetition, without timing it, and returns an error message if the function didn't do its work
+	# or None otherwise, in which case the measurement fails, since it would have timed the error path
+	# stores the result with the number of items and bytes processed by each call
+	def measure(self, name, function, setup = None, items = 0, bytes_count = 0, check = None) :
+		runs = []
+		for i in range(self.repeat) :
+			if (setup != None) :
+				setup()
+
+			gc.collect()
+			start_time = time.perf_counter()
+			value = function()
+			runs.append(time.perf_counter() - start_time)
+
+			error = check(value) if (check != None) else None
+			if (error != None) :
+				print("%-45s %10s %s" % (name, "FAILED", error))
+				self.failures.append(name)
+				return
+
+		runs.sort()
+		median = runs[len(runs) // 2]
+		self.results[name] = {
+			"min" : runs[0],
+			"median" : median,
+			"max" : runs[-1],
+			"items" : items,
+			"items_per_second" : (items / median) if (median > 0) else 0,
+			"bytes" : bytes_count,
+			"bytes_per_second" : (bytes_count / median) if (median > 0) else 0
+		}
+
+		print("%-45s %10.2f ms %14.0f items/s %10.2f MB/s" % (name, median * 1000, self.results[name]["items_per_second"], self.results[name]["bytes_per_second"] / 1e6))
+
+	# executes an action as if it was called from the command line, opening the JSON files as main.py does
+	# returns a tuple with True if successful or False otherwise, and the feedback messages it printed
+	def executeAction(self, data_path, args) :
+		app_obj = Application.Application(data_path, False, Pack.Pack.openData(data_path + os.sep))
+		try :
+			return(app_obj.executeCaptured(args))
+		finally :
+			app_obj.pack.close()
+
+	# returns a function that checks if an action, executed by executeAction(), created the provided path
+	# the function returns an error message if the action failed or None otherwise
+	def checkAction(self, created_path) :
+		def check(value) :
+			success, output = value
+			if (not success or "=> Success:" not in output) :
+				# NOTE: only the 1st message is given, since it's the one that explains the failure
+				return("the action failed: " + (output.strip().splitlines() or [""])[0])
+			if (not os.path.exists(created_path)) :
+				return("the action didn't create \"" + created_path + "\"")
+			return(None)
+
+		return(check)
+
+	# executes the file action once, without timing it, to check that the actions do their work on this platform
+	# returns an error message if they don't or None otherwise
+	# NOTE: the program builds the actions' paths with the Windows separator, so elsewhere they create files with
+	#		backslashes in their names instead of the requested ones
+	def checkActions(self, name) :
+		data_path = self.buildCatalogue(name)
+		output_path = os.path.join(self.target_path, name, "output")
+		os.makedirs(output_path)
+
+		try :
+			return(self.checkAction(os.path.join(output_path, "single.ext0"))(self.executeAction(data_path, ["file", output_path, "single", "bench", "--no-cache"])))
+		finally :
+			shutil.rmtree(os.path.join(self.target_path, name), ignore_errors = True)
+
+	# runs all the measurements for a catalogue shape
+	def runCatalogue(self, name) :
+		data_path = self.buildCatalogue(name)
+		output_path = os.path.join(self.target_path, name, "output")
+		pack_path = os.path.join(data_path, "templates.pack")
+
+		# compiling the JSON files
+		def removePack() :
+			if (os.path.exists(pack_path)) :
+				os.remove(pack_path)
+		self.measure(name + ".pack_build", lambda : self.buildApplication(data_path).pack.close(), removePack, 0, os.path.getsize(os.path.join(data_path, "project.json")))
+
+		app_obj = self.buildApplication(data_path)
+
+		# decoding the project type
+		self.measure(name + ".updateJsonData", lambda : app_obj.updateJsonData("bench"), lambda : Template.Template.clearCache())
+		app_obj.updateJsonData("bench")
+
+		# the files, with their content, of the project type
+		files = []
+		for entry in app_obj.planStructure(app_obj.json_data, "") :
+			if (entry[0] == "file") :
+				files.append((entry[1], entry[3]))
+		content_bytes = sum(len(content) for key, content in files)
+
+		# rendering the files' content, with and without the compiled templates cached
+		def renderFiles() :
+			for key, content in files :
+				app_obj.replaceKeyWords(app_obj.keywords, content)
+		self.measure(name + ".replaceKeyWords", renderFiles, None, len(files), content_bytes)
+		self.measure(name + ".replaceKeyWords_cold", renderFiles, lambda : Template.Template.clearCache(), len(files), content_bytes)
+
+		# building the copyright text of each extension
+		extensions = [extension for extension in app_obj.keywords["copyright"]["replaces"] if (extension != "general")]
+		def buildCopyrights() :
+			for extension in extensions :
+				app_obj.buildCopyrightString(extension)
+		self.measure(name + ".buildCopyrightString", buildCopyrights, None, len(extensions))
+
+		# rendering the files, including their copyright text
+		self.measure(name + ".renderFile", lambda : [app_obj.renderFile(key, content) for key, content in files], None, len(files), content_bytes)
+
+		# creating the whole structure on disk
+		structure_path = os.path.join(output_path, "structure")
+		def cleanStructure() :
+			shutil.rmtree(output_path, ignore_errors = True)
+			os.makedirs(structure_path)
+		def checkStructure(success) :
+			if (not success) :
+				return("the structure wasn't created")
+			if (len(os.listdir(structure_path)) == 0) :
+				return("the structure wasn't created in \"" + structure_path + "\"")
+			return(None)
+		self.measure(name + ".createStructure", lambda : app_obj.createStructure(app_obj.json_data, structure_path + os.sep, Journal.Journal()), cleanStructure, len(files), content_bytes, checkStructure)
+
+		app_obj.pack.close()
+
+		if (not self.actions) :
+			shutil.rmtree(os.path.join(self.target_path, name), ignore_errors = True)
+			return
+
+		# executing the project and file actions from start to finish
+		def cleanOutput() :
+			shutil.rmtree(output_path, ignore_errors = True)
+			os.makedirs(output_path)
+		# NOTE: the cache on the disk isn't used, so that the files are rendered on every repetition
+		project_path = os.path.join(output_path, "proj")
+		self.measure(name + ".project_action", lambda : self.executeAction(data_path, ["project", output_path, "proj", "bench", "--no-cache"]), cleanOutput, len(files), content_bytes, self.checkAction(project_path))
+		self.measure(name + ".file_action", lambda : self.executeAction(data_path, ["file", output_path, "single", "bench", "--no-cache"]), cleanOutput, 1, 0, self.checkAction(os.path.join(output_path, "single.ext0")))
+
+		# executing the project action with its files already in the cache on the disk
+		cleanOutput()
+		self.executeAction(data_path, ["project", output_path, "proj", "bench"])
+		self.measure(name + ".project_action_cached", lambda : self.executeAction(data_path, ["project", output_path, "proj", "bench"]), cleanOutput, len(files), content_bytes, self.checkAction(project_path))
+
+		shutil.rmtree(os.path.join(self.target_path, name), ignore_errors = True)
+
+	# compares the results with the ones from a previous run
+	# a measurement regressed if its median time grew more than the threshold (ex: 0.1 = 10%)
+	# returns the number of regressions
+	def compare(self, baseline, threshold) :
+		regressions = 0
+
+		print("\n=> Comparison with the baseline (threshold " + str(round(threshold * 100, 1)) + "%):")
+		for name in sorted(self.results) :
+			if (name not in baseline.get("results", {})) :
+				print("\t%-45s %10s" % (name, "new"))
+				continue
+
+			base_median = baseline["results"][name]["median"]
+			ratio = (self.results[name]["median"] / base_median) if (base_median > 0) else 1.0
+			status = ""
+			if (ratio > 1 + threshold) :
+				status = "REGRESSION"
+				regressions += 1
+			elif (ratio < 1 - threshold) :
+				status = "improvement"
+
+			print("\t%-45s %9.2fx %s" % (name, ratio, status))
+
+		return(regressions)
+
+# process the options, given in the same --name=value format used by main.py
+options = {"repeat" : "5", "target" : "", "output" : "", "baseline" : "", "threshold" : "0.1", "only" : "", "actions" : "auto"}
+for arg in sys.argv[1:] :
+	name, sep, value = arg[2:].partition("=")
+	if (not arg.startswith("--") or name not in options) :
+		print("=> ERROR: The option \"" + arg + "\" is not valid.")
+		sys.exit(2)
+	options[name] = value
+if (options["actions"] not in ("auto", "yes", "no")) :
+	print("=> ERROR: The option \"--actions\" must be auto, yes or no.")
+	sys.exit(2)
+
+# the project and file actions build their paths with the Windows separator, so by default they're only timed on Windows
+actions = (options["actions"] == "yes" or (options["actions"] == "auto" and os.sep == "\\"))
+if (not actions and options["actions"] == "auto") :
+	print("=> Warning: The project and file actions are only timed on Windows. Use --actions=yes to time them on this platform.\n")
+
+# by default use a RAM backed directory, if there is one
+target_path = options["target"]
+if (len(target_path) == 0) :
+	target_path = "/dev/shm" if (os.path.isdir("/dev/shm")) else tempfile.gettempdir()
+target_path = os.path.abspath(tempfile.mkdtemp(prefix = "projman-benchmark.", dir = target_path))
+
+# the cache on the disk is kept with the other files of the benchmark, so that the user's cache isn't touched
+os.environ["PROJMAN_CACHE"] = os.path.join(target_path, "cache", "renders.db")
+
+benchmark = Benchmark(target_path, max(1, int(options["repeat"])), actions)
+names = options["only"].split(",") if (len(options["only"]) > 0) else list(Benchmark.catalogues)
+for name in names :
+	if (name not in Benchmark.catalogues) :
+		print("=> ERROR: The catalogue \"" + name + "\" doesn't exist. The catalogues are: " + ", ".join(Benchmark.catalogues) + ".")
+		sys.exit(2)
+
+# run from the benchmark's directory, so that anything created with a relative path is removed with it
+original_cwd = os.getcwd()
+os.chdir(target_path)
+try :
+	# check that the actions work before timing anything, since their measurements would only time the error path
+	if (benchmark.actions) :
+		error = benchmark.checkActions(names[0])
+		if (error != None) :
+			print("=> ERROR: The project and file actions can't be timed on this platform, since " + error + ". Use --actions=no to time the other measurements.")
+			sys.exit(1)
+
+	for name in names :
+		benchmark.runCatalogue(name)
+finally :
+	os.chdir(original_cwd)
+	shutil.rmtree(target_path, ignore_errors = True)
+
+results = {
+	"python" : platform.python_version(),
+	"platform" : platform.platform(),
+	"repeat" : benchmark.repeat,
+	"results" : benchmark.results
+}
+
+# save the results
+if (len(options["output"]) > 0) :
+	file_object = open(options["output"], "w", encoding = "utf-8")
+	json.dump(results, file_object, indent = "\t", sort_keys = True)
+	file_object.close()
+
+# compare them with a previous run
+regressions = 0
+if (len(options["baseline"]) > 0) :
+	file_object = open(options["baseline"], "r", encoding = "utf-8")
+	baseline = json.load(file_object)
+	file_object.close()
+
+	regressions = benchmark.compare(baseline, float(options["threshold"]))
+
+# a measurement that failed can't be trusted, so the run fails as well
+if (len(benchmark.failures) > 0) :
+	print("\n=> ERROR: The measurements " + ", ".join(benchmark.failures) + " failed.")
+
+if (regressions > 0 or len(benchmark.failures) > 0) :
+	sys.exit(1)
@@ -0,0 +1,29 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+class ActionError(Exception) :
+	"""Raised by the Library class when an action fails, with the action's Result, which has all its feedback messages.
+	Everything the action created was already removed, except what is listed in the Result's paths."""
+
+	def __init__(self, message, result = None) :
+		Exception.__init__(self, message)
+
+		# instance variables
+		# the Result of the action that failed, or None if it wasn't executed
+		self.result = result
+
+class ArgumentError(ActionError) :
+	"""Raised when the arguments or options given for an action aren't valid."""
+
+class TypeNotFoundError(ActionError) :
+	"""Raised when the project or file type isn't defined in its JSON file."""
@@ -11,22 +11,111 @@
 # 															  #
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-import os, json, re
-from classes import CLI
+# NOTE: the modules only needed by some of the actions are imported by the methods that use them,
+# so that each action only pays for the modules it needs
+import os, sys, time
+from classes import CLI, Pack
 
 class Application :
 	"""This is the application's main class."""
 
-	def __init__(self, json_path) :
+	# the name of the JSON file, in the data directory, needed by each action
+	# actions not listed don't need a JSON file
+	action_json = {"project" : "project", "file" : "file", "help" : "help", "sync" : "project"}
+
+	# the actions that create files from the JSON file's content
+	rendering_actions = ("project", "file", "sync")
+
+	# the actions that record everything they create, so that it can be undone if they fail
+	# NOTE: the sync action changes existing files, which can't be undone, so it isn't recorded
+	journaled_actions = ("project", "file")
+
+	# files expected to be longer than this, in characters, are rendered in chunks while they're written
+	# so that their whole content is never in memory
+	stream_length = 1048576
+
+	# when rendering in a pool of processes is requested, structures whose files' content add up to less than this,
+	# in characters, are still rendered by the main process, since starting the processes would take longer
+	parallel_length = 1048576
+
+	# the rendered content of the files is only looked for in the cache on the disk for structures whose files' content add up
+	# to at least this, in characters, or for files expected to be at least this long, since anything smaller is rendered
+	# faster than the cache can be opened
+	cache_length = 262144
+	# files expected to be shorter than this, in characters, are never looked for in the cache on the disk,
+	# since they're rendered faster than they're found
+	cache_file_length = 16384
+
+	# the project name found for each directory, along with the root markers used
+	# NOTE: shared by all the actions executed by this process, so that the batch and daemon actions
+	#       only search each directory once
+	project_names = {}
+
+	# json_path is the path to the directory with the JSON files
+	# unless execute is False, the action in the command line is executed right away
+	# pack is the compiled version of the JSON files, if it was already opened (ex: by another Application object), or None
+	def __init__(self, json_path, execute = True, pack = None) :
 		# instance variables
 		# path to the directory with the JSON files
-		self.json_path = json_path.replace("/", "\\")
+		# NOTE: built with the system's separator, so that the JSON files are found on any system
+		self.json_path = json_path.replace("/", os.sep)
 		# contains the keywords to be replaced in the files content and the replacement strings
+		# NOTE: while an action is executed, it's the action's scope of the keywords (see buildKeywords()), and each
+		#       directory and file add their own keywords on top of these, without copying them (see KeywordScope)
 		self.keywords = {}
 		# stores the decoded content of the action's JSON file
 		self.json_data = {}
+		# the kind of the node of the action's JSON file stored in self.json_data (ex: "file" for a file template)
+		self.json_kind = None
+		# the name of the action's JSON file, without the extension
+		self.json_name = None
+		# the compiled version of the JSON files, which is read instead of the JSON files themselves
+		self.pack = pack
+		# stores the time, in seconds, spent loading the data and executing the actions
+		self.timings = {"data" : 0.0, "action" : 0.0}
+		# records the directories and files created by the action being executed, so they can be removed if it fails
+		self.journal = None
+		# the metrics of the action being executed, or None if it isn't being measured
+		self.metrics = None
+		# syncs the directories and files written by the action being executed to the disk, or None if they aren't synced
+		self.durability = None
+		# stores the files' content already rendered while creating a structure,
+		# indexed by the file's source string and the values of the keywords it uses
+		self.rendered_files = {}
+		# stores the copyright text already built for each file extension,
+		# indexed by the extension and the values of the keywords it uses
+		self.copyright_strings = {}
+		# function called with the Metrics object of each action executed, once it's done
+		# NOTE: when set, every action is measured (used by the batch and daemon actions to collect the metrics)
+		self.metrics_hook = None
+		# the stream where the feedback messages are printed
+		self.output = sys.stdout
+		# the paths of the projects' directories, files and archives created by the action being executed
+		self.created_paths = []
+		# the error messages printed by the action being executed, without their prefix, in the order they were printed
+		self.errors = []
+		# the unexpected exception raised by the action being executed, or None if there wasn't one
+		self.exception = None
+		# the cache on the disk with the rendered content of the files, created the 1st time it's needed
+		# NOTE: it's kept for all the actions executed by this object (ex: the actions in a batch)
+		self.cache_obj = None
+		# the cache used by the action being executed, or None if it doesn't use the cache
+		self.render_cache = None
+		# True if the files of the structure being created are looked for in the cache
+		self.cache_structure = False
+		# the CLI object with the action being executed
+		self.cli_obj = None
+
+		# make sure json_path ends with a separator
+		if (not self.json_path.endswith(os.sep)) :
+			self.json_path += os.sep
+
+		# the actions are executed later by the caller, with executeCaptured() (ex: by the Library class)
+		if (not execute) :
+			return
+
 		# instantiate the CLI class to process what should be done by the program
-		self.cli_obj = CLI.CLI()
+		self.cli_obj = CLI.CLI(None, self.output)
 
 		# check if the command provided is valid
 		if (self.cli_obj.action == None) :
@@ -34,44 +123,222 @@ class Application :
 			# NOTE: the feedback message is printed by the CLI class
 			return
 
-		# make sure json_path ends with a backslash
-		if (not self.json_path.endswith("\\")) :
-			self.json_path += "\\"
+		# open the compiled version of the JSON files, building it if needed
+		if (self.pack == None) :
+			start_time = time.perf_counter()
+			self.pack = Pack.Pack.openData(self.json_path)
+			self.timings["data"] += time.perf_counter() - start_time
+
+		# an archive written to stdout can't be mixed with the feedback messages, so they're printed to stderr instead
+		# NOTE: only this object's streams are changed, sys.stdout is left as it is for the archive
+		if (self.cli_obj.options["output-archive"] == "-") :
+			self.output = sys.stderr
+			self.cli_obj.output = sys.stderr
+
+		# execute the requested action
+		# NOTE: the feedback message is printed by the methods
+		if (not self.executeAction()) :
+			# something went wrong while executing the action, so bail out
+			return
+
+	# executes the action stored in self.cli_obj, measuring it if requested
+	# returns True if successful, False otherwise
+	def executeAction(self) :
+		# NOTE: the metrics and durability of the action executing this one (ex: a batch) are restored once it's done
+		parent_metrics = self.metrics
+		parent_durability = self.durability
+		self.metrics = None
+		self.durability = None
+		if (self.cli_obj.options["timings"] or self.cli_obj.options["metrics-json"] != None or self.metrics_hook != None) :
+			from classes import Metrics
+			self.metrics = Metrics.Metrics(self.cli_obj.argv[1:] + self.cli_obj.option_args)
+			started = self.metrics.start()
+
+		try :
+			return(self.runAction())
+		finally :
+			if (self.metrics != None) :
+				self.metrics.stop("action", started, True)
+				self.reportMetrics()
+
+			self.metrics = parent_metrics
+			self.durability = parent_durability
+
+	# processes an action's arguments and loads the data it needs, without executing it,
+	# so that its parts can be called on their own (ex: by the benchmark)
+	# args are the action's arguments, as they would be given in the command line
+	# returns True if successful, False otherwise
+	def prepareAction(self, args) :
+		# open the compiled version of the JSON files, building it if needed
+		if (self.pack == None) :
+			self.pack = Pack.Pack.openData(self.json_path)
 
-		# make sure the action's JSON file exists
-		action_json_path = self.json_path + self.cli_obj.action + ".json"
-		if (not os.path.isfile(action_json_path)) :
-			# it doesn't, so bail out
-			print("=> ERROR: Couldn't find the \"" + self.cli_obj.action + ".json\" file.")
-			return()
+		self.cli_obj = CLI.CLI([""] + args, self.output)
+		if (self.cli_obj.action == None) :
+			# NOTE: the feedback message is printed by the CLI class
+			return(False)
 
-		# instantiate the JSON decoder
-		self.json_decoder = json.JSONDecoder()
+		return(self.loadActionData())
 
-		# grab the parsed content of this action's JSON file
-		self.json_data = self.parseJSON(action_json_path)
+	# loads the data needed by the action stored in self.cli_obj
+	# returns True if successful, False otherwise
+	def loadActionData(self) :
+		start_time = time.perf_counter()
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		# make sure the compiled version of the JSON files is up to date
+		self.pack.refresh()
+
+		# check if this action needs a JSON file
+		self.json_name = self.action_json.get(self.cli_obj.action, None)
+		if (self.json_name != None) :
+			# make sure the action's JSON file exists
+			if (not self.pack.hasJSON(self.json_name)) :
+				# it doesn't, so bail out
+				self.printError("Couldn't find the \"" + self.json_name + ".json\" file.")
+				return(False)
 
 		# grab the parsed content of keywords.json file, if it exists
-		keywords_json_path = self.json_path + "keywords.json"
-		if (os.path.isfile(keywords_json_path)) :
-			self.keywords = self.parseJSON(keywords_json_path)
+		self.keywords = self.buildKeywords(self.loadJSON("keywords") or {})
+		self.copyright_strings = {}
+
+		self.timings["data"] += time.perf_counter() - start_time
+		if (self.metrics != None) :
+			self.metrics.stop("load_data", started)
+
+		# the actions that create files reuse the file contents already split into their segments
+		if (self.cli_obj.action in self.rendering_actions) :
+			from classes import Template
+			self.pack.template_loader = Template.Template.preload
+		else :
+			self.pack.template_loader = None
+
+		return(True)
+
+	# loads the data needed by the action stored in self.cli_obj and executes it
+	# returns True if successful, False otherwise
+	def runAction(self) :
+		start_time = time.perf_counter()
+		data_time = self.timings["data"]
+		self.created_paths = []
+
+		if (not self.loadActionData()) :
+			return(False)
+
+		# the rendered content of the files is kept in the cache on the disk, unless it was disabled
+		self.render_cache = None
+		self.cache_structure = False
+		if (self.cli_obj.action in self.rendering_actions and not self.cli_obj.options["no-cache"]) :
+			if (self.cache_obj == None) :
+				from classes import RenderCache
+				self.cache_obj = RenderCache.RenderCache()
+
+			self.render_cache = self.cache_obj
+			self.render_cache.metrics = self.metrics
+
+		# the directories and files written by the action are synced to the disk, if requested
+		if (self.cli_obj.options["durability"] != "none") :
+			from classes import Durability
+			self.durability = Durability.Durability(self.cli_obj.options["durability"], self.metrics)
+
+		# some actions record everything they create, so that it can be undone if they fail
+		self.journal = None
+		if (self.cli_obj.action in self.journaled_actions) :
+			from classes import Journal
+			self.journal = Journal.Journal(self.cli_obj.options["journal"], self.cli_obj.argv[1:] + self.cli_obj.option_args, os.getcwd(), self.durability, self.cli_obj.args, self.cli_obj.options)
+			if (not self.journal.open()) :
+				# the journal file couldn't be created, so bail out
+				self.printError("The journal file \"" + self.cli_obj.options["journal"] + "\" couldn't be created.")
+				self.journal = None
+				return(False)
 
 		# call the method that will execute the requested action
 		# NOTE: the feedback message is printed by the methods
-		if (not getattr(self, "execute" + self.cli_obj.action.capitalize(), False)()) :
-			# something went wrong while executing the action, so bail out
-			return
+		success = False
+		try :
+			success = getattr(self, "execute" + self.cli_obj.action.capitalize(), False)()
+			return(success)
+		finally :
+			if (self.journal != None) :
+				# undo everything created by an action that failed, or forget it if the action was successful
+				if (success) :
+					self.journal.commit()
+				else :
+					self.rollbackJournal(self.journal)
+
+				self.journal.close()
+				self.journal = None
+
+			# write the content rendered by the action to the cache
+			if (self.render_cache != None) :
+				if (self.metrics != None) :
+					started = self.metrics.start()
+
+				self.render_cache.flush()
+				self.render_cache.metrics = None
+
+				if (self.metrics != None) :
+					self.metrics.stop("cache", started)
+
+			# the time spent loading data during the action isn't counted as executing the action
+			self.timings["action"] += time.perf_counter() - start_time - (self.timings["data"] - data_time)
+
+	# prints and/or saves the metrics of the action that was executed, as requested, and hands them to the hook
+	def reportMetrics(self) :
+		if (self.cli_obj.options["timings"]) :
+			print(self.metrics.toTable(), file = self.output)
+
+		metrics_path = self.cli_obj.options["metrics-json"]
+		if (metrics_path != None) :
+			import json
+
+			json_string = json.dumps(self.metrics.toDict(), indent = "\t")
+			if (metrics_path == "-") :
+				print(json_string, file = self.output)
+			else :
+				try :
+					file_object = open(metrics_path, "w", encoding = "utf-8")
+					file_object.write(json_string + "\n")
+					file_object.close()
+				except OSError as e :
+					self.printError("The metrics file \"" + metrics_path + "\" couldn't be created.")
+
+		if (self.metrics_hook != None) :
+			self.metrics_hook(self.metrics)
+
+	# returns the decoded content of a JSON file in the data directory, given its name without the extension
+	# returns None if the file doesn't exist
+	def loadJSON(self, name) :
+		return(self.pack.getNode(name))
 
-	# opens and decodes the contents of the provided JSON file
-	# NOTE: checking if the file exists should be done by the caller method
-	def parseJSON(self, file_path) :
-		# grab the content of the json file
-		file_object = open(file_path, "r", encoding = "utf-8")
-		json_string = file_object.read()
-		file_object.close()
+	# builds the scope of the keywords for an action, given the keywords in keywords.json
+	# the scope has layers, searched in order: the keywords set by the action, the ones in keywords.json and
+	# the ones computed when they're used (ex: the date), so that setting or computing a keyword doesn't copy the others
+	# NOTE: the files' directories and the files themselves add layers on top of this one (see KeywordScope)
+	def buildKeywords(self, keywords) :
+		from classes import ComputedKeywords, KeywordScope
+
+		computed = ComputedKeywords.ComputedKeywords({
+			"date" : lambda : time.strftime("%Y-%m-%d"),
+			"year" : lambda : time.strftime("%Y"),
+			"git_author" : lambda : self.readGitConfig("user.name"),
+			"git_email" : lambda : self.readGitConfig("user.email")
+		})
+
+		return(KeywordScope.KeywordScope({}, KeywordScope.KeywordScope(keywords, computed)))
+
+	# returns the value of a git configuration setting (ex: user.name), or an empty string if it isn't available
+	def readGitConfig(self, name) :
+		import subprocess
+
+		try :
+			result = subprocess.run(["git", "config", "--get", name], stdout = subprocess.PIPE, stderr = subprocess.DEVNULL, timeout = 5)
+		except (OSError, subprocess.SubprocessError) as e :
+			# git isn't installed or didn't answer in time
+			return("")
 
-		# decode json_string and return it
-		return(self.json_decoder.decode(json_string))
+		return(result.stdout.decode("utf-8", "replace").strip())
 
 	# creates a new project
 	# returns True if successful, False otherwise
@@ -79,12 +346,17 @@ class Application :
 		# create the necessary local variables
 		project_name = self.cli_obj.args["project_name"]
 		project_type = self.cli_obj.args["project_type"]
-		project_path = self.cli_obj.args["action_path"]
+		locations = self.cli_obj.args["locations"]
 
 		# get the information relevant for the desired project_type
 		if (not self.updateJsonData(project_type)) :
 			# the project_type isn't defined, so bail out
-			print("=> ERROR: The project type \"" + project_type + "\" isn't defined in \"" + self.cli_obj.action + ".json\".\n")
+			self.printError("The project type \"" + project_type + "\" isn't defined in \"" + self.cli_obj.action + ".json\".\n")
+			return(False)
+
+		# make sure the project_type is a project's tree
+		if (self.json_kind != "project") :
+			self.printError("The project type \"" + project_type + "\" isn't valid for \"" + self.cli_obj.action + ".json\".")
 			return(False)
 
 		# this string will be inserted into any file's content where |!project_name!| is present
@@ -93,34 +365,287 @@ class Application :
 		self.keywords["project_type"] = project_type
 		# this string will be inserted into any file's content where |!no_www_domain!| is present
 		self.keywords["no_www_domain"] = project_name[4:] if (project_name.startswith("www.")) else project_name
+		# this string will be inserted into any file's content, in the project's directory, where |!dir_name!| is present
+		self.keywords["dir_name"] = project_name
+
+		# write the project into an archive instead, if requested
+		# NOTE: the feedback message is printed by the method
+		if (self.cli_obj.options["output-archive"] != None) :
+			if (len(locations) > 1) :
+				self.printError("The option --output-archive can't be used with more than one location.")
+				return(False)
+
+			return(self.archiveProject(project_name, self.cli_obj.options["output-archive"]))
+
+		# create the project in all the locations, if there are several
+		# NOTE: the feedback messages are printed by the method
+		if (len(locations) > 1) :
+			return(self.createProjects(project_name, locations))
 
 		# create the project's directory
+		# NOTE: if anything fails, executeAction() removes everything created
+		# NOTE: any error messages should be printed by createProject()
+		if (not self.createProject(project_name, locations[0], self.journal)) :
+			return(False)
+
+		# make everything durable, as requested
+		# NOTE: the feedback message is printed by the method
+		if (not self.finishDurability()) :
+			return(False)
+
+		# at this point everything went OK
+		self.created_paths.append(locations[0] + project_name + "\\")
+		print("=> Success: Project " + project_name + " created!", file = self.output)
+		return(True)
+
+	# creates a project's directory, with its structure, in a location
+	# everything created is recorded in journal, so that it can be removed if anything fails
+	# rendered has the content of the structure's files already rendered, as returned by renderStructure(), or None
+	# returns True if successful, False otherwise
+	def createProject(self, project_name, location, journal, rendered = None) :
+		project_path = location + project_name + "\\"
+
+		# make sure the project's directory doesn't exist yet
+		if (os.path.exists(project_path)) :
+			self.printError("The project's directory couldn't be created.")
+			return(False)
+
+		# remove the staging directories left by a previous attempt that stopped before moving them into place
+		self.sweepStaging(project_name, location)
+
+		# create the staging directory, next to the project's directory so that it's on the same drive
+		# the structure is created inside it and then moved into place in one step
+		staging_path = location + "." + project_name + "." + os.urandom(4).hex() + ".staging\\"
 		try :
-			os.makedirs(project_path)
+			self.makeDirs(staging_path, journal)
 		except OSError as e :
-			# the project's directory already exists
-			print("=> ERROR: The project's directory couldn't be created.")
+			# the staging directory couldn't be created
+			self.printError("The project's directory couldn't be created.")
 			return(False)
 
 		# create the structure
-		if (not self.createStructure(self.json_data, project_path)) :
-			# something went wrong
-			# remove any of the structure created
-			self.deleteDir(project_path)
-
-			# bail out
+		if (not self.createStructure(self.json_data, staging_path, journal, rendered)) :
+			# something went wrong, bail out
 			# NOTE: any error messages should be printed by createStructure()
 			return(False)
 
+		# move the project's directory into place
+		try :
+			os.rename(staging_path.rstrip("\\"), project_path.rstrip("\\"))
+		except OSError as e :
+			# the project's directory was created in the meantime
+			self.printError("The project's directory couldn't be created.")
+			return(False)
+
+		# the structure is now in the project's directory, so that's where it's removed from if anything else fails
+		try :
+			journal.rebase(staging_path, project_path)
+		except OSError as e :
+			self.printError("The journal file couldn't be written.")
+			return(False)
+
+		# make the move durable, if requested
+		if (self.durability != None) :
+			try :
+				self.durability.syncDirectory(location)
+			except OSError as e :
+				self.printError("The directories and files couldn't be synced to the disk.")
+				return(False)
+
+		return(True)
+
+	# removes the staging directories of a project, left in a location by an action that stopped before moving them into place
+	# NOTE: only the directories named by createProject() are removed
+	def sweepStaging(self, project_name, location) :
+		import re, shutil
+
+		try :
+			names = os.listdir(location)
+		except OSError as e :
+			# the location doesn't exist yet, so there is nothing to remove
+			return
+
+		pattern = re.compile(r"^\." + re.escape(project_name) + r"\.[0-9a-f]{8}\.staging$")
+		for name in names :
+			if (pattern.match(name) != None) :
+				shutil.rmtree(location + name, ignore_errors = True)
+				print("=> Warning: The staging directory \"" + location + name + "\" was left by an action that didn't finish and was removed.", file = self.output)
+
+	# creates a project's directory, with its structure, in several locations at the same time
+	# the files are rendered only once and each location is created by its own thread, with its own journal,
+	# so that everything created in a location that fails is removed without affecting the other locations
+	# returns True if the project was created in all the locations, False otherwise
+	def createProjects(self, project_name, locations) :
+		import concurrent.futures
+		from classes import Journal, ThreadOutput
+
+		# the journal file can only record a single location
+		if (self.cli_obj.options["journal"] != None) :
+			self.printError("The option --journal can't be used with more than one location.")
+			return(False)
+
+		# render the files once, for all the locations
+		# NOTE: the plan's entries are in the same order for any path
+		rendered = self.renderStructure(self.planStructure(self.json_data, ""))
+
+		# the metrics and the durability are shared by all the threads
+		if (self.metrics != None) :
+			self.metrics.enableLocking()
+		if (self.durability != None) :
+			self.durability.enableLocking()
+
+		# create the locations, at most as many at the same time as there are writer threads,
+		# keeping the messages printed for each location apart
+		journals = [Journal.Journal(None, None, None, self.durability) for location in locations]
+		results = []
+		output = ThreadOutput.ThreadOutput(self.output)
+		self.output = output
+		try :
+			with concurrent.futures.ThreadPoolExecutor(min(self.cli_obj.options["writers"], len(locations))) as executor :
+				futures = [executor.submit(output.run, self.createProject, project_name, location, journal, rendered) for location, journal in zip(locations, journals)]
+
+			for future in futures :
+				results.append(future.result())
+		finally :
+			self.output = output.stream
+
+			# NOTE: if a thread raised an unexpected exception, everything created in the remaining locations is removed
+			for journal in journals[len(results):] :
+				journal.rollback()
+
+		# report each location, in order, removing everything created in the ones that failed
+		failed_count = 0
+		for location, journal, result in zip(locations, journals, results) :
+			print(result[1], end = "", file = self.output)
+
+			if (result[0]) :
+				journal.commit()
+				self.created_paths.append(location + project_name + "\\")
+				print("=> Success: Project " + project_name + " created in \"" + location + "\"!", file = self.output)
+				continue
+
+			failed_count += 1
+			if (self.rollbackJournal(journal)) :
+				self.printError("Project " + project_name + " couldn't be created in \"" + location + "\", everything created there was removed.")
+			else :
+				self.printError("Project " + project_name + " couldn't be created in \"" + location + "\".")
+
+		# make everything durable, as requested
+		# NOTE: the feedback message is printed by the method
+		if (not self.finishDurability()) :
+			return(False)
+
+		if (failed_count > 0) :
+			self.printError("Project " + project_name + " couldn't be created in " + str(failed_count) + " of " + str(len(locations)) + " locations.")
+			return(False)
+
 		# at this point everything went OK
-		print("=> Success: Project " + project_name + " created!")
+		print("=> Success: Project " + project_name + " created in " + str(len(locations)) + " locations!", file = self.output)
+		return(True)
+
+	# writes a new project into an archive, or to stdout if the archive's path is "-", instead of creating it on the disk
+	# returns True if successful, False otherwise
+	def archiveProject(self, project_name, archive_path) :
+		from classes import Archive
+
+		# create the archive
+		archive_obj = Archive.Archive(archive_path, self.durability)
+		try :
+			archive_obj.open()
+
+			# record the archive, so that it's removed if anything fails
+			# NOTE: an archive that already existed isn't recorded, so that a rollback doesn't remove the user's file
+			if (archive_obj.created) :
+				self.journal.record("file", archive_path)
+		except OSError as e :
+			self.printError("The archive \"" + archive_path + "\" couldn't be created.")
+			return(False)
+
+		# write the structure into the archive
+		# NOTE: any error messages about the structure are printed by archiveStructure()
+		try :
+			success = self.archiveStructure(self.json_data, archive_obj, project_name)
+		except OSError as e :
+			self.printError("The archive \"" + archive_path + "\" couldn't be written.")
+			success = False
+
+		# the archive is closed even if something failed, so that executeAction() can remove it
+		try :
+			archive_obj.close()
+		except OSError as e :
+			if (success) :
+				self.printError("The archive \"" + archive_path + "\" couldn't be written.")
+			success = False
+
+		if (not success) :
+			return(False)
+
+		# make the archive durable, as requested
+		# NOTE: the feedback message is printed by the method
+		if (not self.finishDurability()) :
+			return(False)
+
+		# at this point everything went OK
+		if (archive_path != "-") :
+			self.created_paths.append(archive_path)
+		print("=> Success: Project " + project_name + " written to " + ("stdout" if (archive_path == "-") else "the archive \"" + archive_path + "\"") + "!", file = self.output)
+		return(True)
+
+	# updates an existing project with the current content of its project type
+	# only the files that are missing or whose content is different are written
+	# returns True if successful, False otherwise
+	def executeSync(self) :
+		# create the necessary local variables
+		project_name = self.cli_obj.args["project_name"]
+		project_type = self.cli_obj.args["project_type"]
+		project_path = self.cli_obj.args["action_path"]
+
+		# get the information relevant for the desired project_type
+		if (not self.updateJsonData(project_type)) :
+			# the project_type isn't defined, so bail out
+			self.printError("The project type \"" + project_type + "\" isn't defined in \"" + self.json_name + ".json\".\n")
+			return(False)
+
+		# make sure the project_type is a project's tree
+		if (self.json_kind != "project") :
+			self.printError("The project type \"" + project_type + "\" isn't valid for \"" + self.json_name + ".json\".")
+			return(False)
+
+		# the same keywords used when the project was created
+		self.keywords["project_name"] = project_name.title()
+		self.keywords["project_type"] = project_type
+		self.keywords["no_www_domain"] = project_name[4:] if (project_name.startswith("www.")) else project_name
+		self.keywords["dir_name"] = project_name
+
+		# make sure the project's directory exists
+		if (not os.path.isdir(project_path)) :
+			try :
+				os.mkdir(project_path)
+			except OSError as e :
+				self.printError("The project's directory couldn't be created.")
+				return(False)
+
+		# update the structure
+		counts = self.syncStructure(self.json_data, project_path)
+		if (counts == None) :
+			# something went wrong, bail out
+			# NOTE: any error messages should be printed by syncStructure()
+			return(False)
+
+		# make everything durable, as requested
+		# NOTE: the feedback message is printed by the method
+		if (not self.finishDurability()) :
+			return(False)
+
+		# at this point everything went OK
+		print("=> Success: Project " + project_name + " synced! " + str(counts["added"]) + " file(s) added, " + str(counts["changed"]) + " changed and " + str(counts["unchanged"]) + " unchanged.", file = self.output)
 		return(True)
 
 	# creates a new file
 	# returns True if successful, False otherwise
 	def executeFile(self) :
 		# create the necessary local variables
-		file_name = self.cli_obj.args["file_name"]
+		file_names = self.cli_obj.args["file_names"]
 		file_type = self.cli_obj.args["file_type"]
 		file_path = self.cli_obj.args["action_path"]
 		config_flags = self.cli_obj.args["config_flags"]
@@ -128,56 +653,87 @@ class Application :
 		# get the information relevant for the desired file_type
 		if (not self.updateJsonData(file_type)) :
 			# the file_type isn't defined, so bail out
-			print("=> ERROR: The file type \"" + file_type + "\" isn't defined in \"" + self.cli_obj.action + ".json\".\n")
+			self.printError("The file type \"" + file_type + "\" isn't defined in \"" + self.cli_obj.action + ".json\".\n")
+			return(False)
+
+		# make sure the file_type is a file template, and not a group of them
+		if (self.json_kind != "file" or "extension" not in self.json_data) :
+			self.printError("The file type \"" + file_type + "\" isn't valid for \"" + self.cli_obj.action + ".json\".")
 			return(False)
 
 		# extract the file's extension from self.json_data
 		file_extension = self.json_data["extension"]
-		# update self.json_data to be the file's content
-		self.json_data = self.json_data["content"]
-
-		# at this point self.json_data should be a string with the content for the requested file_type
-		if (not isinstance(self.json_data, str)) :
+		# update self.json_data to be the file's content, or the asset it's copied from
+		if (self.isAsset(self.json_data)) :
+			self.json_data = {"@asset" : self.json_data["@asset"]}
+		else :
+			self.json_data = self.json_data["content"]
+
+		# at this point self.json_data should be a string with the content for the requested file_type or an asset
+		if (not isinstance(self.json_data, str) and not self.isAsset(self.json_data)) :
 			# self.json_data is not a string, so bail out
-			print("=> ERROR: The file type \"" + file_type + "\" isn't valid for \"" + self.cli_obj.action + ".json\".")
+			self.printError("The file type \"" + file_type + "\" isn't valid for \"" + self.cli_obj.action + ".json\".")
 			return(False)
 
 		# process the flags
 		if ("f" in config_flags) :
 			# if the config flag "f" was given, create all the directories in the file's path that don't exist
-			# create all the directories as needed (ignoring the exceptions when a directory already exists)
+			# create all the directories as needed
 			# if any directory can't be created an error message will be given later when the file fails to be created
-			os.makedirs(file_path, exist_ok = True)
+			try :
+				self.makeDirs(file_path)
+			except OSError as e :
+				pass
 		elif ("o" not in config_flags) :
-			# if the config flag "o" was NOT given, don't create the file if it already exists
-			# check if the file already exists
-			if (os.path.exists(file_path + "\\" + file_name + "." + file_extension)) :
-				# it does, so bail out
-				print("=> ERROR: The file already exists. Use the flag \"o\" if you want the existing file to be overwritten.")
+			# if the config flag "o" was NOT given, don't create any of the files if one of them already exists
+			# read the content of the directory once, instead of checking each file
+			# NOTE: the names are compared the same way the file system does (case insensitive on Windows)
+			try :
+				existing_names = set(os.path.normcase(entry.name) for entry in os.scandir(file_path))
+			except OSError as e :
+				# the directory doesn't exist, so none of the files do
+				existing_names = set()
+
+			# check if any of the files already exists
+			found = [file_name for file_name in file_names if (os.path.normcase(file_name + "." + file_extension) in existing_names)]
+			if (len(found) > 0) :
+				# at least one does, so bail out
+				if (len(file_names) == 1) :
+					self.printError("The file already exists. Use the flag \"o\" if you want the existing file to be overwritten.")
+				else :
+					self.printError("The file(s) " + ", ".join(file_name + "." + file_extension for file_name in found) + " already exist. Use the flag \"o\" if you want the existing files to be overwritten.")
 				return(False)
 
 		# this string will be inserted into any file's content where |!project_name!| is present
 		# since the project name wasn't provided in the cmd find it based on the file's destination
 		self.keywords["project_name"] = self.findProjectName(file_path)
-		# this string will be inserted into any file's content where |!file_name!| is present
-		self.keywords["file_name"] = file_name
 		# this string will be inserted into any file's content where |!file_type!| is present
 		self.keywords["file_type"] = file_type
+		# this string will be inserted into any file's content where |!dir_name!| is present
+		self.keywords["dir_name"] = os.path.basename(os.path.abspath(file_path.replace("\\", os.sep)))
+
+		# create the files
+		# NOTE: if anything fails, executeAction() removes the files and any directories created for them
+		for file_name in file_names :
+			# this string will be inserted into any file's content where |!file_name!| is present
+			self.keywords["file_name"] = file_name
+
+			if (not self.createStructure({file_name + "." + file_extension : self.json_data}, file_path)) :
+				# something went wrong, bail out
+				# NOTE: any error messages should be printed by createStructure()
+				return(False)
 
-		# create the structure
-		if (not self.createStructure({file_name + "." + file_extension : self.json_data}, file_path)) :
-			# something went wrong, bail out
-			# NOTE: any error messages should be printed by createStructure()
-			# delete the file
-			try :
-				os.remove(file_path + file_name)
-			except OSError as e :
-				pass
-
+		# make everything durable, as requested
+		# NOTE: the feedback message is printed by the method
+		if (not self.finishDurability()) :
 			return(False)
 
 		# at this point everything went OK
-		print("=> Success: File " + file_name + " created!")
+		self.created_paths.extend(file_path + file_name + "." + file_extension for file_name in file_names)
+		if (len(file_names) == 1) :
+			print("=> Success: File " + file_names[0] + " created!", file = self.output)
+		else :
+			print("=> Success: " + str(len(file_names)) + " files created!", file = self.output)
 		return(True)
 
 	# show help information
@@ -187,15 +743,16 @@ class Application :
 		topic = self.cli_obj.args["topic"]
 
 		# process the requested topic
-		help_string = ""
+		# NOTE: the help text is built as a list of lines
+		help_lines = []
 		if (topic == None) :
 			# no topic was provided
 			# show the list of topics
-			help_string += "=> To obtain information about a specific topic type \"help topic_name\", where topic_name is one of the following:"
+			help_lines.append("=> To obtain information about a specific topic type \"help topic_name\", where topic_name is one of the following:")
 
 			# loop through the topics that have help information
-			for key in self.json_data :
-				help_string += "\n\t- " + key
+			for key in self.pack.getKeys(self.json_name) :
+				help_lines.append("\t- " + key)
 		else:
 			# a topic was provided
 			# split the topic into its parts
@@ -216,84 +773,341 @@ class Application :
 			# get the information relevant for the desired topic
 			if (not self.updateJsonData(topic)) :
 				# the file_type isn't defined, so bail out
-				print("=> ERROR: The topic \"" + topic + "\" isn't defined in \"" + self.cli_obj.action + ".json\".\n")
+				self.printError("The topic \"" + topic + "\" isn't defined in \"" + self.cli_obj.action + ".json\".\n")
 				return(False)
 
 			# at this point self.json_data should be a string with the help text for the requested topic
-			if (not isinstance(self.json_data, str)) :
-				# self.json_data is not a string, so bail out
-				print("=> ERROR: The topic \"" + topic + "\" isn't valid in \"" + self.cli_obj.action + ".json\".\n")
+			if (self.json_kind != "help") :
+				# self.json_data is not a help text, so bail out
+				self.printError("The topic \"" + topic + "\" isn't valid in \"" + self.cli_obj.action + ".json\".\n")
 				return(False)
 
 			# store the help string
-			help_string = self.json_data
+			help_lines.append(self.json_data)
 
 			# if a subtopic was provided, add the extra information
 			if (sub_topic) :
 				if (topic_parts[1] == "type") :
-					# get the relevant JSON file's content
-					sub_topic_json_data = self.parseJSON(self.json_path + topic_parts[0] + ".json")
-
 					# check if the topic is "project"
 					if (topic_parts[0] == "project") :
 						# it is, so only loop through the 1st tier of the JSON file
 						# loop through the JSON's content
-						for key in sub_topic_json_data :
-							help_string += "\n\t- " + key
+						for key in self.pack.getKeys(topic_parts[0]) or [] :
+							help_lines.append("\t- " + key)
 					else :
-						# it isn't, so loop through all the tiers of the JSON file
-						# loop through the JSON's content
-						for key in sub_topic_json_data :
-							help_string += "\n\t- " + self.buildTypesString(key, sub_topic_json_data[key])
+						# it isn't, so list the types of all the tiers of the JSON file, grouped by their 1st tier
+						help_lines.extend("\t- " + types_string for types_string in self.buildTypesStrings(topic_parts[0]))
 
 		# print the help text
-		print(help_string)
+		print("\n".join(help_lines), file = self.output)
 
 		# at this point everything went OK
 		return(True)
 
-	# builds and returns a string with all the type supported by the various actions
-	# NOTE: called recursively
-	def buildTypesString(self, parent_str, data) :
-		res = ""
-
-		# loop through the data
-		for key in data :
-			# check if key's value is a string
-			if (isinstance(data[key], str)) :
-				# it is, so this is an end tier which is to be ignored
-				continue
+	# executes each of the actions in a manifest file, in order, and reports the result of each one
+	# returns True if all actions were successful, False otherwise
+	def executeBatch(self) :
+		import json
+
+		# create the necessary local variables
+		manifest_path = self.cli_obj.args["manifest_path"]
+
+		# grab the list of actions in the manifest
+		operations = self.readManifest(manifest_path)
+		if (operations == None) :
+			# the manifest isn't valid, so bail out
+			self.printError("The manifest \"" + manifest_path + "\" couldn't be read.\nIt should be a JSON array or one JSON value per line, with each action's arguments.\n")
+			return(False)
+
+		# stores the report for each action
+		report = []
+
+		# if the batch is being measured, collect the metrics of each action as well
+		# NOTE: they're saved with the batch's metrics, instead of each action saving its own
+		batch_metrics = self.metrics
+		parent_hook = self.metrics_hook
+		option_args = [arg for arg in self.cli_obj.option_args if (not arg.startswith("--metrics-json="))]
+		if (batch_metrics != None) :
+			self.metrics_hook = batch_metrics.children.append
+
+		# loop through the actions
+		for index, operation in enumerate(operations) :
+			# execute the action
+			# NOTE: the options given to the batch apply to all actions, unless they're overridden
+			metrics_count = len(batch_metrics.children) if (batch_metrics != None) else 0
+			success, output = self.executeCaptured(operation[:1] + option_args + operation[1:])
+
+			report.append({"operation" : index + 1, "args" : operation, "success" : success, "output" : output.strip()})
+			if (batch_metrics != None and len(batch_metrics.children) > metrics_count) :
+				report[-1]["metrics"] = batch_metrics.children[-1].toDict()
+
+			# print this action's report
+			print("=> " + ("Success" if success else "ERROR") + ": [" + str(index + 1) + "] " + " ".join(operation), file = self.output)
+			for line in report[-1]["output"].splitlines() :
+				if (len(line) > 0) :
+					print("\t" + line, file = self.output)
+
+		self.metrics_hook = parent_hook
+
+		# print the summary
+		failed_count = len([item for item in report if not item["success"]])
+		print("=> Batch finished: " + str(len(report) - failed_count) + " action(s) succeeded, " + str(failed_count) + " failed.", file = self.output)
+
+		# write the report to a file, if requested
+		if (self.cli_obj.options["report"] != None) :
+			try :
+				file_object = open(self.cli_obj.options["report"], "w", encoding = "utf-8")
+				json.dump(report, file_object, indent = "\t")
+				file_object.close()
+			except OSError as e :
+				self.printError("The report file \"" + self.cli_obj.options["report"] + "\" couldn't be created.")
+				return(False)
 
-			# this isn't an end tier
-			# update the type string with this tier's sub-tiers
-			res += self.buildTypesString(parent_str + ":" + key, data[key]) + "  "
+		return(failed_count == 0)
 
-		# check if this tier had any valid sub-tiers
-		if (len(res) == 0) :
-			# it didn't, so the type is the tier itself
-			res = parent_str
+	# starts the daemon, which keeps this object loaded and executes the actions requested by clients
+	# returns True if the daemon stopped normally, False otherwise
+	def executeDaemon(self) :
+		# create the necessary local variables
+		from classes import Daemon
+
+		daemon_path = self.cli_obj.options["daemon-file"]
+		if (daemon_path == None) :
+			daemon_path = Daemon.Daemon.defaultDaemonPath()
+
+		return(Daemon.Daemon(self, daemon_path).run())
+
+	# undoes an action that didn't finish, using the journal file it was writing
+	# returns True if successful, False otherwise
+	def executeRollback(self) :
+		# undo what the action created before it stopped
+		# NOTE: the feedback message is printed by the method
+		journal = self.undoJournal(self.cli_obj.args["journal_path"])
+		if (journal == None) :
+			return(False)
+
+		# NOTE: the removals were already made durable, as requested, by rollbackJournal()
+		if (self.durability != None) :
+			print(self.durability.report(), file = self.output)
+
+		# at this point everything went OK
+		print("=> Success: The action \"" + " ".join(journal.command) + "\" was undone!", file = self.output)
+		return(True)
 
-		return(res.strip())
+	# undoes an action that didn't finish, using the journal file it was writing, and then executes it again
+	# returns True if successful, False otherwise
+	def executeResume(self) :
+		# undo what the action created before it stopped
+		# NOTE: the feedback message is printed by the method
+		journal = self.undoJournal(self.cli_obj.args["journal_path"])
+		if (journal == None) :
+			return(False)
+
+		# NOTE: the removals were already made durable, as requested, by rollbackJournal()
+		if (self.durability != None) :
+			print(self.durability.report(), file = self.output)
+
+		# execute the action again, from the same directory and with the same options
+		parent_cli_obj = self.cli_obj
+		current_dir = os.getcwd()
+		try :
+			if (journal.cwd != None) :
+				os.chdir(journal.cwd)
+
+			if (journal.args != None and journal.options != None and len(journal.command) > 0) :
+				# use the arguments and options as they were processed, so that they aren't split or expanded again
+				self.cli_obj = CLI.CLI.fromArgs(journal.command[0].lower(), journal.args, journal.options, journal.command, self.output)
+			else :
+				self.cli_obj = CLI.CLI(parent_cli_obj.argv[:1] + journal.command)
+
+			if (self.cli_obj.action not in self.journaled_actions) :
+				# the journal doesn't have a valid action
+				# NOTE: if the arguments aren't valid, the feedback message is printed by the CLI class
+				if (self.cli_obj.action != None) :
+					self.printError("The command \"" + self.cli_obj.action + "\" can't be resumed.")
+				return(False)
+
+			return(self.executeAction())
+		finally :
+			self.cli_obj = parent_cli_obj
+			os.chdir(current_dir)
+
+	# reads a journal file and removes everything recorded in it
+	# returns the Journal object if successful, None otherwise
+	def undoJournal(self, journal_path) :
+		from classes import Journal
+
+		# read the journal file
+		journal = Journal.Journal.load(journal_path)
+		if (journal == None) :
+			# it couldn't be read, so bail out
+			self.printError("The journal file \"" + journal_path + "\" couldn't be read.")
+			return(None)
+
+		# remove everything the action created
+		# NOTE: the journal file is deleted, unless something couldn't be removed
+		success = self.rollbackJournal(journal)
+		journal.close()
+
+		if (not success) :
+			self.printError("The action \"" + " ".join(journal.command) + "\" couldn't be completely undone.")
+			return(None)
+
+		return(journal)
+
+	# executes an action, given its arguments as they would be given in the command line, without the program's path
+	# all the feedback messages printed by the action are captured instead
+	# returns a tuple with True if successful or False otherwise, and the captured messages
+	# NOTE: cli_obj is the CLI object with the arguments already processed, or None to process them here
+	def executeCaptured(self, args, cli_obj = None) :
+		import io
+
+		# the current CLI object and stream, which are replaced while the action is executed
+		parent_cli_obj = self.cli_obj
+		parent_output = self.output
+
+		# capture all the feedback messages of this action
+		# NOTE: what the previous action created is forgotten, even if this one is rejected before it's executed
+		output = io.StringIO()
+		self.output = output
+		self.errors = []
+		self.exception = None
+		self.created_paths = []
+		try :
+			# process the action's arguments as if they came from the command line
+			self.cli_obj = cli_obj
+			if (self.cli_obj == None) :
+				self.cli_obj = CLI.CLI((parent_cli_obj.argv[:1] if (parent_cli_obj != None) else [""]) + args, output)
+
+			if (self.cli_obj.action == None) :
+				# the arguments aren't valid
+				# NOTE: the feedback message is printed by the CLI class
+				success = False
+			elif (parent_cli_obj != None and (self.cli_obj.action == "daemon" or self.cli_obj.action == parent_cli_obj.action)) :
+				# daemons can't be started from other actions and batches can't be nested
+				self.printError("The command \"" + self.cli_obj.action + "\" can't be used inside a " + parent_cli_obj.action + ".")
+				success = False
+			elif (self.cli_obj.options["output-archive"] == "-") :
+				# stdout isn't the caller's output (ex: the daemon's client), so the archive would be mixed with other output
+				self.printError("The archive can't be written to stdout here. Use the option --output-archive with the archive's path instead.")
+				success = False
+			else :
+				try :
+					success = self.executeAction()
+				except Exception as e :
+					# report the error, so the caller can move on to the next action
+					self.exception = e
+					self.printError(type(e).__name__ + ": " + str(e))
+					success = False
+		finally :
+			self.cli_obj = parent_cli_obj
+			self.output = parent_output
+
+		return((success, output.getvalue()))
+
+	# prints an error message, with the "=> ERROR: " prefix, and keeps it in the list of the action's errors
+	# NOTE: the message is kept without any leading or trailing new lines
+	def printError(self, message) :
+		print("=> ERROR: " + message, file = self.output)
+		self.errors.append(message.strip("\n"))
+
+	# reads a manifest file, or stdin if the path is "-", and returns the list of actions in it
+	# the manifest can be a JSON array or have one JSON value per line (JSONL)
+	# each action is either an array with the arguments, as they would be given in the command line,
+	# or an object with the keys "action", "path", "name", "type", "flags", "topic" and "options"
+	# returns None if the manifest isn't valid
+	def readManifest(self, manifest_path) :
+		import json
+
+		# grab the content of the manifest
+		try :
+			if (manifest_path == "-") :
+				manifest_string = sys.stdin.read()
+			else :
+				file_object = open(manifest_path, "r", encoding = "utf-8")
+				manifest_string = file_object.read()
+				file_object.close()
+		except OSError as e :
+			return(None)
+
+		# decode the manifest
+		try :
+			operations = json.loads(manifest_string)
+
+			# check if the manifest has a single action
+			if (not isinstance(operations, list) or (len(operations) > 0 and all(isinstance(item, str) for item in operations))) :
+				operations = [operations]
+		except ValueError as e :
+			# it isn't a JSON array, so try one JSON value per line
+			try :
+				operations = [json.loads(line) for line in manifest_string.splitlines() if len(line.strip()) > 0]
+			except ValueError as e :
+				return(None)
+
+		# convert each action into its list of arguments
+		res = []
+		for operation in operations :
+			if (isinstance(operation, dict)) :
+				if (not isinstance(operation.get("options", {}), dict)) :
+					return(None)
+
+				args = [operation[key] for key in ("action", "path", "name", "type", "flags", "topic") if key in operation]
+				for name, value in operation.get("options", {}).items() :
+					# flag options are given without a value, and left out if they're false
+					# options that can be given several times, such as --location, can have a list with their values
+					if (value is True) :
+						args.append("--" + name)
+					elif (isinstance(value, list) and name in CLI.CLI.repeatable_options) :
+						args.extend("--" + name + "=" + str(item) for item in value)
+					elif (value is not False and value != None) :
+						args.append("--" + name + "=" + str(value))
+				operation = args
+
+			# make sure all arguments are strings
+			if (not isinstance(operation, list) or len(operation) == 0 or not all(isinstance(arg, str) for arg in operation)) :
+				return(None)
+
+			res.append(operation)
+
+		return(res)
+
+	# builds and returns a list with a string for each 1st tier of a JSON file, with all the types inside it
+	def buildTypesStrings(self, name) :
+		# group the file templates by their 1st tier, in the order they're in the JSON file
+		# NOTE: the types are read from the compiled file's index, without decoding the JSON file
+		groups = {}
+		for colon_path, kind in self.pack.getTypes(name, kinds = ("file",), sort = False) :
+			groups.setdefault(colon_path.split(":")[0], []).append(colon_path)
+
+		# build the string for each 1st tier
+		# a 1st tier without file templates inside it is listed as it is
+		return(["  ".join(groups.get(key, [key])) for key in self.pack.getKeys(name) or []])
 
 	# searches the selected JSON file for the needed information
 	# the changes will be made to self.json_data
 	# return True if successful or False otherwise
 	def updateJsonData(self, keys_str) :
 		# split the string with the keys into a list
-		keys = keys_str.split(":")
+		# use the keys in lowercase
+		keys = [key.lower() for key in keys_str.split(":")]
 
-		# loop through the keys
-		for key in keys :
-			# use the key in lowercase
-			key = key.lower()
+		# check if these keys exist in the JSON file
+		position = self.pack.findNode(self.json_name, keys)
+		if (position == None) :
+			# the keys aren't defined, so bail out
+			return(False)
 
-			# check if this key exists in the JSON file
-			if (key not in self.json_data) :
-				# the key isn't defined, so bail out
-				return(False)
+		# the keys exist, so update self.json_data with only the requested part of the JSON file
+		start_time = time.perf_counter()
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		self.json_data = self.pack.decodeNode(position)
+		self.json_kind = self.pack.getKind(self.json_name, keys)
 
-			# the key exists, so update self.json_data
-			self.json_data = self.json_data[key]
+		self.timings["data"] += time.perf_counter() - start_time
+		if (self.metrics != None) :
+			self.metrics.stop("updateJsonData", started)
 
 		# at this point everything went OK
 		return(True)
@@ -305,204 +1119,818 @@ class Application :
 			# there isn't, so bail out
 			return("")
 
-		# build the dictionary with relevant keywords and replacement strings
-		# start by add all the keywords
-		replacements = self.keywords.copy()
+		# the text is only built once for each extension and values of the keywords it uses
+		# NOTE: the keywords in the replaces don't change the text, so only the other keywords' values are needed
+		# NOTE: if any of the replaces for the extension has placeholders of its own, the text is always built
+		from classes import Template
+		template = Template.Template.compile(self.keywords["copyright"]["text"])
+		extension_replaces = self.keywords["copyright"]["replaces"][file_extension]
+		general_replaces = self.keywords["copyright"]["replaces"].get("general", {})
+		values = tuple(self.keywords.get(keyword, None) for keyword in template.getKeywords() if (keyword != "copyright" and keyword not in extension_replaces and keyword not in general_replaces))
+		values = tuple(value if (isinstance(value, str)) else None for value in values)
+		memo_key = (file_extension, values)
+		if (memo_key in self.copyright_strings) :
+			return(self.copyright_strings[memo_key])
+
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		# build the scope with the relevant keywords and replacement strings, searched in order:
+		# the copyright entries, which are removed, the general replaces, the copyright replaces relevant for this
+		# file extension and all the keywords
+		# NOTE: the keywords aren't copied, only the ones used by the text are searched
+		from classes import KeywordScope
+		replacements = KeywordScope.KeywordScope({"copyright" : None}, KeywordScope.KeywordScope(general_replaces, KeywordScope.KeywordScope(extension_replaces, self.keywords)))
 
-		# remove the copyright entries
-		del replacements["copyright"]
+		# replace the placeholders with this file's extension copyright information
+		copyright_string = self.replaceKeyWords(replacements, self.keywords["copyright"]["text"])
 
-		# add the copyright replaces relevant for this file extension
-		replacements.update(self.keywords["copyright"]["replaces"][file_extension])
+		if (self.metrics != None) :
+			self.metrics.stop("buildCopyrightString", started)
+			self.metrics.count("copyright_blocks")
 
-		# add the general replaces, if any
-		if ("general" in self.keywords["copyright"]["replaces"]) :
-			replacements.update(self.keywords["copyright"]["replaces"]["general"])
+		# NOTE: a text whose values have placeholders of their own, or that could form new ones, depends on other keywords
+		if (template.isSelfContained(tuple(replacements.get(keyword, None) for keyword in template.getKeywords()))) :
+			self.copyright_strings[memo_key] = copyright_string
 
-		# replace the placeholders with this file's extension copyright information
-		# and return the finished copyright text
-		return(self.replaceKeyWords(replacements, self.keywords["copyright"]["text"]))
+		# return the finished copyright text
+		return(copyright_string)
 
 	# loops through the structure and creates all the files and folders
 	# with their respective content
+	# the directories are created in order and the rendered files are handed to a pool of writer threads
+	# everything created is recorded in journal, or in the action's journal if it's None
+	# rendered has the content of the files already rendered, as returned by renderStructure(), or None to render them here
 	# return True if successful or False otherwise
-	def createStructure(self, structure, path) :
-		# loop each item and process them
-		for key in structure :
-			# determine if this entry is a file or a directory
-			if (isinstance(structure[key], str)) :
-				# this entry is a file
+	def createStructure(self, structure, path, journal = None, rendered = None) :
+		from classes import Writer
 
-				# grab the content to be inserted in this file
-				file_content = structure[key]
+		if (journal == None) :
+			journal = self.journal
 
-				# build the dictionary with replacement keywords
-				replacements = self.keywords.copy()
+		# build the list of directories and files to be created
+		plan = self.planStructure(structure, path)
 
-				# determine this file's extension
-				aux_pos = key.rfind(".")
-				if (aux_pos == -1) :
-					file_extension = ""
-				else :
-					file_extension = key[aux_pos + 1:]
+		# start the writer threads
+		# NOTE: there is no need for more threads than files and a single file is written without threads
+		file_count = len([entry for entry in plan if entry[0] == "file" or entry[0] == "asset"])
+		writer = Writer.Writer(min(self.cli_obj.options["writers"], file_count) if (file_count > 1) else 0, journal, self.metrics, self.durability)
 
-				# add this file's name and type to the replacements
-				replacements["file_name"] = key[:aux_pos]
-				replacements["file_type"] = file_extension
+		# stores the position in plan of the 1st entry that couldn't be created
+		failed_index = None
 
-				# check if this file requires the copyright text to be inserted
-				if ("|!copyright!|" in file_content) :
-					# it does
-					# add the copyright replacement information
-					replacements["copyright"] = self.buildCopyrightString(file_extension)
+		# files with the same content as a previous file can be created as links to that file, if requested
+		# NOTE: they're only created once all the other files are written
+		dedup_mode = self.cli_obj.options["dedup"]
+		# stores the path of the 1st file with each content, indexed by the content
+		original_paths = {}
+		# stores a tuple (position in plan, path, path of the file with the same content) for each duplicated file
+		duplicates = []
+
+		# stores the keywords' scope of each directory, indexed by the keys of the directory and its parents
+		directory_scopes = {}
+
+		try :
+			# loop each entry of the plan and process them
+			self.rendered_files = {}
+			if (rendered == None) :
+				self.selectRenderCache(plan)
+				rendered = self.renderInParallel(plan)
+			for index, entry in enumerate(plan) :
+				# stop as soon as any file couldn't be written
+				if (writer.failed()) :
+					break
+
+				if (entry[0] == "file") :
+					# this entry is a file
+					# render the file's content, unless it was already rendered by the pool of processes, and queue it to be written
+					file_content = rendered[index] if (index in rendered) else self.renderFile(entry[1], entry[3], self.getDirectoryScope(entry[-1], directory_scopes))
+
+					# check if a previous file has the same content
+					# NOTE: empty files and files rendered in chunks are always written
+					if (dedup_mode != "copy" and isinstance(file_content, str) and len(file_content) > 0) :
+						if (file_content in original_paths) :
+							duplicates.append((index, entry[2], original_paths[file_content]))
+							continue
+
+						original_paths[file_content] = entry[2]
+
+					writer.put(index, entry[2], file_content)
+				elif (entry[0] == "asset") :
+					# this entry is a file copied from the asset store, as it is
+					source_path = self.findAsset(entry[3])
+					if (source_path == None) :
+						# the asset's path isn't valid
+						failed_index = index
+						break
+
+					writer.putCopy(index, entry[2], source_path, self.cli_obj.options["asset-link"])
+				elif (entry[0] == "dir") :
+					# this entry is a directory
+					try :
+						if (self.metrics != None) :
+							started = self.metrics.start()
+
+						# create the folder
+						os.mkdir(entry[2])
+						journal.record("dir", entry[2])
+
+						# make its entry in the parent directory durable, if requested
+						if (self.durability != None) :
+							self.durability.syncParent(entry[2])
+
+						if (self.metrics != None) :
+							self.metrics.stop("mkdir", started)
+							self.metrics.count("directories")
+					except OSError as e :
+						# the directory couldn't be created
+						failed_index = index
+						break
+
+		finally :
+			# wait for all the files to be written
+			# NOTE: also when rendering a file raised an exception, so that the writer threads are always stopped
+			file_failed_index = writer.close()
+		if (file_failed_index != None and (failed_index == None or file_failed_index < failed_index)) :
+			failed_index = file_failed_index
+		self.rendered_files = {}
+
+		# create the duplicated files that would have been reached, as links to the 1st file with the same content
+		duplicates = [duplicate for duplicate in duplicates if (failed_index == None or duplicate[0] < failed_index)]
+		if (len(duplicates) > 0) :
+			writer = Writer.Writer(min(self.cli_obj.options["writers"], len(duplicates)) if (len(duplicates) > 1) else 0, journal, self.metrics, self.durability)
+			try :
+				for duplicate in duplicates :
+					writer.putCopy(duplicate[0], duplicate[1], duplicate[2], dedup_mode)
+			finally :
+				file_failed_index = writer.close()
+			if (file_failed_index != None and (failed_index == None or file_failed_index < failed_index)) :
+				failed_index = file_failed_index
+
+			if (failed_index == None) :
+				print("=> Dedup: " + str(len(duplicates)) + " file(s) with the same content as another file, " + str(writer.linked_bytes) + " bytes saved.", file = self.output)
+
+		# print the warnings for the entries that would have been reached
+		for entry in plan[:failed_index] :
+			if (entry[0] == "warning") :
+				print("=> Warning: The value for the key \"" + entry[1] + "\" is not valid.", file = self.output)
+
+		# check if everything went ok
+		if (failed_index == None) :
+			return(True)
+
+		# print the error messages for the entry that failed and each of its parent directories
+		entry = plan[failed_index]
+		if (entry[0] == "file") :
+			self.printError("The file \"" + entry[1] + "\" couldn't be created.\nMake sure all directories in the path provided exist.")
+		elif (entry[0] == "asset") :
+			self.printError("The file \"" + entry[1] + "\" couldn't be created.\nMake sure the asset \"" + entry[3] + "\" exists and all directories in the path provided exist.")
+		else :
+			self.printError("The directory \"" + entry[1] + "\" already exists.")
+
+		for key in reversed(entry[-1]) :
+			self.printError("The directory \"" + key + "\" already exists.")
+
+		return(False)
+
+	# loops through the structure and writes all the files and folders, with their respective content, into an archive,
+	# inside a directory named root_name, instead of creating them on the disk
+	# the entries are written in the structure's order, as they're rendered
+	# return True if successful or False otherwise
+	# raises OSError if the archive couldn't be written
+	def archiveStructure(self, structure, archive_obj, root_name) :
+		# build the list of directories and files to be written
+		plan = self.planStructure(structure, root_name + "\\")
+
+		# stores the position in plan of the 1st entry that couldn't be written
+		failed_index = None
+
+		# stores the keywords' scope of each directory, indexed by the keys of the directory and its parents
+		directory_scopes = {}
+
+		archive_obj.addDirectory(root_name)
 
-				# replace the keywords with their respective new strings
-				file_content = self.replaceKeyWords(replacements, file_content)
+		# loop each entry of the plan and process them
+		self.rendered_files = {}
+		self.selectRenderCache(plan)
+		rendered = self.renderInParallel(plan)
+		for index, entry in enumerate(plan) :
+			# the entry's path inside the archive
+			name = "/".join((root_name,) + entry[-1] + (entry[1],))
 
-				# create and open the file in write mode
+			if (self.metrics != None) :
+				started = self.metrics.start()
+
+			if (entry[0] == "file") :
+				# this entry is a file
+				# render the file's content, unless it was already rendered by the pool of processes, and add it to the archive
+				# NOTE: the content is encoded exactly as it's written to a file
+				file_content = rendered[index] if (index in rendered) else self.renderFile(entry[1], entry[3], self.getDirectoryScope(entry[-1], directory_scopes))
+
+				# NOTE: the time spent rendering isn't counted as writing the archive
+				if (self.metrics != None) :
+					started = self.metrics.start()
+
+				if (isinstance(file_content, str)) :
+					file_content = self.encodeContent(file_content)
+					archive_obj.addFile(name, (file_content,), len(file_content))
+				else :
+					archive_obj.addFile(name, (self.encodeContent(chunk) for chunk in file_content))
+			elif (entry[0] == "asset") :
+				# this entry is a file copied from the asset store, as it is
+				source_path = self.findAsset(entry[3])
 				try :
-					file_object = open(path + key, "w", encoding = "utf-8")
-					file_object.write(file_content)
-					file_object.close()
+					source_object = open(source_path, "rb") if (source_path != None) else None
 				except OSError as e :
-					# the file couldn't be created
-					print("=> ERROR: The file \"" + key + "\" couldn't be created.\nMake sure all directories in the path provided exist.")
-					return(False)
-			elif (isinstance(structure[key], dict)) :
-				# this entry is a directory
+					source_object = None
+
+				if (source_object == None) :
+					# the asset's path isn't valid or it couldn't be read
+					failed_index = index
+					break
+
 				try :
-					# create the new path with this folder
-					new_path = path + "\\" + key + "\\"
-
-					# create the folder
-					os.mkdir(new_path)
-
-					# check if this folder has folders and/or files inside it
-					if (len(structure[key]) > 0) :
-						# it has, so call this method recursively
-						if (not self.createStructure(structure[key], new_path)) :
-							# something couldn't be created
-							print("=> ERROR: The directory \"" + key + "\" already exists.")
-							return(False)
-				except OSError as e :
-					# the directory couldn't be created
-					print("=> ERROR: The directory \"" + key + "\" already exists.")
-					return(False)
+					archive_obj.addFile(name, iter(lambda : source_object.read(1048576), b""), os.fstat(source_object.fileno()).st_size)
+				finally :
+					source_object.close()
+			elif (entry[0] == "dir") :
+				# this entry is a directory
+				archive_obj.addDirectory(name)
 			else :
-				# the data type of this entry is not valid
-				# ignore, but give message
-				print("=> Warning: The value for the key \"" + key + "\" is not valid.")
+				continue
 
-		# at this point everything went ok
-		return(True)
+			if (self.metrics != None) :
+				if (entry[0] == "dir") :
+					self.metrics.stop("archive", started)
+					self.metrics.count("directories")
+				else :
+					self.metrics.addLatency("write", self.metrics.stop("archive", started))
+					self.metrics.count("files")
 
-	# recursive method that will delete a directory and all its contents
-	# returns True if successful, False if not
-	def deleteDir(self, path) :
-		# if the path is NOT a folder, return False
-		if (not os.path.isdir(path)) :
-			return(False)
+		self.rendered_files = {}
+
+		# print the warnings for the entries that would have been reached
+		for entry in plan[:failed_index] :
+			if (entry[0] == "warning") :
+				print("=> Warning: The value for the key \"" + entry[1] + "\" is not valid.", file = self.output)
+
+		# check if everything went ok
+		if (failed_index == None) :
+			return(True)
+
+		# print the error message for the asset that failed
+		entry = plan[failed_index]
+		self.printError("The file \"" + entry[1] + "\" couldn't be created.\nMake sure the asset \"" + entry[3] + "\" exists.")
+
+		return(False)
+
+	# loops through the structure and creates the files and folders that don't exist
+	# and rewrites the files whose content is different
+	# files and folders that aren't in the structure are left untouched
+	# returns a dictionary with the number of files "added", "changed" and "unchanged" if successful or None otherwise
+	def syncStructure(self, structure, path) :
+		from classes import Writer
+
+		# build the list of directories and files in the structure
+		plan = self.planStructure(structure, path)
+
+		# start the writer threads
+		file_count = len([entry for entry in plan if entry[0] == "file" or entry[0] == "asset"])
+		writer = Writer.Writer(min(self.cli_obj.options["writers"], file_count) if (file_count > 1) else 0, None, self.metrics, self.durability)
+
+		counts = {"added" : 0, "changed" : 0, "unchanged" : 0}
+
+		# stores the position in plan of the 1st entry that couldn't be updated
+		failed_index = None
+
+		# stores the keywords' scope of each directory, indexed by the keys of the directory and its parents
+		directory_scopes = {}
+
+		try :
+			# loop each entry of the plan and process them
+			self.rendered_files = {}
+			self.selectRenderCache(plan)
+			rendered = self.renderInParallel(plan)
+			for index, entry in enumerate(plan) :
+				# stop as soon as any file couldn't be written
+				if (writer.failed()) :
+					break
+
+				if (entry[0] == "file") :
+					# this entry is a file
+					# render the file's content, unless it was already rendered by the pool of processes, and compare it with the file on disk
+					file_content = rendered[index] if (index in rendered) else self.renderFile(entry[1], entry[3], self.getDirectoryScope(entry[-1], directory_scopes))
+					state = self.compareFile(entry[2], file_content)
+					counts[state] += 1
+
+					if (state != "unchanged") :
+						# NOTE: files rendered in chunks can only be read once, so they're rendered again
+						if (not isinstance(file_content, str)) :
+							file_content = self.renderFile(entry[1], entry[3], self.getDirectoryScope(entry[-1], directory_scopes))
+
+						writer.put(index, entry[2], file_content)
+				elif (entry[0] == "asset") :
+					# this entry is a file copied from the asset store, as it is
+					source_path = self.findAsset(entry[3])
+					if (source_path == None) :
+						# the asset's path isn't valid
+						failed_index = index
+						break
+
+					try :
+						source_object = open(source_path, "rb")
+						state = self.compareFile(entry[2], source_object)
+						source_object.close()
+					except OSError as e :
+						# the asset couldn't be read
+						failed_index = index
+						break
+
+					counts[state] += 1
+					if (state != "unchanged") :
+						writer.putCopy(index, entry[2], source_path, "copy")
+				elif (entry[0] == "dir") :
+					# this entry is a directory
+					# create it if it doesn't exist yet
+					if (not os.path.isdir(entry[2])) :
+						try :
+							os.mkdir(entry[2])
+							if (self.durability != None) :
+								self.durability.syncParent(entry[2])
+						except OSError as e :
+							# the directory couldn't be created
+							failed_index = index
+							break
+
+		finally :
+			# wait for all the files to be written
+			# NOTE: also when rendering a file raised an exception, so that the writer threads are always stopped
+			file_failed_index = writer.close()
+		if (file_failed_index != None and (failed_index == None or file_failed_index < failed_index)) :
+			failed_index = file_failed_index
+		self.rendered_files = {}
+
+		# print the warnings for the entries that would have been reached
+		for entry in plan[:failed_index] :
+			if (entry[0] == "warning") :
+				print("=> Warning: The value for the key \"" + entry[1] + "\" is not valid.", file = self.output)
+
+		# check if everything went ok
+		if (failed_index == None) :
+			return(counts)
+
+		# print the error message for the entry that failed
+		entry = plan[failed_index]
+		if (entry[0] == "dir") :
+			self.printError("The directory \"" + entry[1] + "\" couldn't be created.")
+		elif (entry[0] == "asset") :
+			self.printError("The file \"" + entry[1] + "\" couldn't be updated.\nMake sure the asset \"" + entry[3] + "\" exists.")
+		else :
+			self.printError("The file \"" + entry[1] + "\" couldn't be updated.")
+
+		return(None)
+
+	# compares a file on disk with its expected content, which is either a string, an iterator with the chunks
+	# of a string or a file opened in binary mode
+	# the sizes are compared first and the contents only if the sizes match
+	# returns "added" if the file doesn't exist, "changed" if its content is different or "unchanged"
+	def compareFile(self, file_path, content) :
+		# the expected content, as bytes, in chunks
+		# NOTE: the files are written in text mode, so the line endings are the system's
+		if (isinstance(content, str)) :
+			chunks = [self.encodeContent(content)]
+		elif (hasattr(content, "read")) :
+			chunks = iter(lambda : content.read(1048576), b"")
+		else :
+			chunks = (self.encodeContent(chunk) for chunk in content)
 
-		# loop through each item in this directory
-		for item in os.listdir(path) :
-			# build the items full path
-			item_path = path + "\\" + item
+		try :
+			file_object = open(file_path, "rb")
+		except FileNotFoundError as e :
+			return("added")
+		except OSError as e :
+			return("changed")
 
-			# if this item is a file, delete it
-			if (os.path.isfile(item_path)) :
-				os.remove(item_path)
+		try :
+			# compare the sizes, when they're known without reading the whole content
+			file_size = os.fstat(file_object.fileno()).st_size
+			if (isinstance(content, str)) :
+				expected_size = len(chunks[0])
+			elif (hasattr(content, "read")) :
+				expected_size = os.fstat(content.fileno()).st_size
 			else :
-				# it's a directory, so call this method with the directory's path
-				if (not self.deleteDir(item_path)) :
-					# the directory could not be deleted
-					return(False)
+				expected_size = None
+
+			if (expected_size != None and expected_size != file_size) :
+				return("changed")
+
+			# compare the contents, a chunk at a time
+			for chunk in chunks :
+				if (file_object.read(len(chunk)) != chunk) :
+					return("changed")
+
+			# make sure the file doesn't have anything else
+			if (len(file_object.read(1)) > 0) :
+				return("changed")
+		finally :
+			file_object.close()
+
+		return("unchanged")
+
+	# returns a string encoded exactly as it's written to a file
+	def encodeContent(self, content) :
+		if (os.linesep != "\n") :
+			content = content.replace("\n", os.linesep)
+
+		return(content.encode("utf-8"))
+
+	# creates a directory and any of its parent directories that don't exist, recording each of them in the journal,
+	# or in the action's journal if it's None
+	# raises OSError if any of the directories couldn't be created
+	def makeDirs(self, path, journal = None) :
+		if (journal == None) :
+			journal = self.journal
+
+		# find the directories that don't exist, from the innermost one
+		missing = []
+		path = path.rstrip("\\")
+		while (not os.path.isdir(path)) :
+			missing.append(path)
+
+			# NOTE: a relative path ends with an empty parent, which is the current directory
+			parent = os.path.dirname(path)
+			if (parent == path or len(parent) == 0) :
+				break
+			path = parent
+
+		# create them, from the outermost one
+		for path in reversed(missing) :
+			try :
+				os.mkdir(path)
+			except FileExistsError as e :
+				# the directory was created in the meantime (ex: by the thread of another location), so it isn't recorded
+				if (os.path.isdir(path)) :
+					continue
+				raise
+
+			journal.record("dir", path)
+
+			if (self.durability != None) :
+				self.durability.syncParent(path)
+
+	# makes everything written by the action durable, as requested with the --durability option, and reports the time spent
+	# path is a directory whose entries were changed after the files were written (ex: by a move), or None
+	# returns True if successful, False otherwise
+	def finishDurability(self, path = None) :
+		if (self.durability == None) :
+			return(True)
 
-		# now that we have cleared this directory of items, delete it
 		try :
-			os.rmdir(path)
+			if (path != None) :
+				self.durability.syncDirectory(path)
+			self.durability.finish()
 		except OSError as e :
-			# the directory could not be deleted
+			self.printError("The directories and files couldn't be synced to the disk.")
 			return(False)
 
-		# at this point everything went ok
+		print(self.durability.report(), file = self.output)
 		return(True)
 
+	# removes everything recorded in a journal, warning about anything that couldn't be removed
+	# returns True if everything was removed, False otherwise
+	def rollbackJournal(self, journal) :
+		# the directories with the removed entries, which are synced to make the removals durable, if requested
+		parents = dict.fromkeys(os.path.dirname(entry[1].rstrip("\\")) or "." for entry in journal.entries)
+
+		success = journal.rollback()
+
+		if (self.durability != None) :
+			try :
+				for path in parents :
+					if (os.path.isdir(path)) :
+						self.durability.syncDirectory(path)
+				self.durability.finish()
+			except OSError as e :
+				print("=> Warning: The removal of the directories and files couldn't be synced to the disk.", file = self.output)
+
+		if (success) :
+			return(True)
+
+		for entry in journal.entries :
+			print("=> Warning: The " + ("file" if (entry[0] == "file") else "directory") + " \"" + entry[1] + "\" couldn't be removed.", file = self.output)
+
+		return(False)
+
+	# returns True if a value from the JSON files is an asset, False otherwise
+	# an asset is an object with the key "@asset" and the path to a file, relative to the asset store,
+	# which is copied without any of its keywords being replaced
+	def isAsset(self, value) :
+		return(isinstance(value, dict) and isinstance(value.get("@asset", None), str))
+
+	# returns the full path to a file in the asset store (the "assets" directory inside the data directory)
+	# returns None if the path isn't inside the asset store
+	def findAsset(self, asset_name) :
+		parts = asset_name.replace("/", "\\").split("\\")
+		if (".." in parts or ":" in asset_name or len(parts[0]) == 0) :
+			return(None)
+
+		return(self.json_path + "assets\\" + "\\".join(parts))
+
+	# loops through the structure and builds the list of directories and files to be created, in order
+	# each entry is a tuple with the type of entry ("dir", "file", "asset" or "warning"), its key, its full path,
+	# its content (for files) or asset name (for assets) and a tuple with the keys of its parent directories
+	# NOTE: called recursively
+	def planStructure(self, structure, path, parents = (), plan = None) :
+		if (plan == None) :
+			plan = []
+
+		# loop each item and process them
+		for key in structure :
+			# determine if this entry is a file or a directory
+			if (isinstance(structure[key], str)) :
+				# this entry is a file
+				plan.append(("file", key, path + key, structure[key], parents))
+			elif (self.isAsset(structure[key])) :
+				# this entry is a file copied from the asset store
+				plan.append(("asset", key, path + key, structure[key]["@asset"], parents))
+			elif (isinstance(structure[key], dict)) :
+				# this entry is a directory
+				# create the new path with this folder
+				new_path = path + "\\" + key + "\\"
+
+				plan.append(("dir", key, new_path, None, parents))
+
+				# add any folders and/or files inside it
+				self.planStructure(structure[key], new_path, parents + (key,), plan)
+			else :
+				# the data type of this entry is not valid
+				# ignore, but give message
+				plan.append(("warning", key, None, None, parents))
+
+		return(plan)
+
+	# returns the keywords' scope of the files inside a directory, given the keys of the directory and its parents
+	# the files in the structure's top directory use the action's scope
+	# NOTE: each directory's scope is only built once, and stored in scopes
+	def getDirectoryScope(self, parents, scopes) :
+		if (len(parents) == 0) :
+			return(self.keywords)
+
+		if (parents not in scopes) :
+			from classes import KeywordScope
+
+			# this string will be inserted into any file's content, in this directory, where |!dir_name!| is present
+			scopes[parents] = KeywordScope.KeywordScope({"dir_name" : parents[-1]}, self.keywords)
+
+		return(scopes[parents])
+
+	# replaces the keywords in a file's content with their respective new strings
+	# scope is the keywords' scope of the file's directory, or None for the action's scope
+	# returns the final content of the file
+	def renderFile(self, key, file_content, scope = None) :
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		# add this file's keywords on top of its directory's keywords
+		# NOTE: the keywords aren't copied, so the cost only depends on the keywords the file uses
+		from classes import KeywordScope, Template
+		template = Template.Template.compile(file_content)
+		replacements = KeywordScope.KeywordScope(self.buildFileReplacements(key, file_content), self.keywords if (scope == None) else scope)
+
+		# gather the values of the keywords the file uses, so that it's rendered with a plain dictionary
+		# NOTE: if the file's final string could depend on other keywords (ex: its placeholders could overlap each other),
+		#       it's rendered with the whole scope instead, and never reused
+		values = ()
+		reusable = not template.overlapping
+		if (reusable) :
+			resolved = replacements.resolve(template.getKeywords())
+			values = tuple(resolved[keyword] if (isinstance(resolved.get(keyword, None), str)) else None for keyword in template.getKeywords())
+			reusable = template.isSelfContained(values)
+			if (reusable) :
+				replacements = resolved
+
+		# replace the keywords with their respective new strings
+		# NOTE: large files are handed to the writer as an iterator with the chunks of their content
+		length = template.estimateLength(replacements)
+		if (length > self.stream_length) :
+			file_content = template.iterRender(replacements)
+		elif (not reusable) :
+			file_content = self.replaceKeyWords(replacements, file_content)
+		else :
+			# files with the same source string and the same values for the keywords it uses are only rendered once
+			render_key = (file_content, values)
+			if (render_key in self.rendered_files) :
+				file_content = self.rendered_files[render_key]
+			else :
+				# look for the file's content in the cache on the disk, rendering it if it isn't there
+				render_cache = self.getRenderCache(length)
+				cache_key = render_cache.buildKey(("file",) + render_key) if (render_cache != None) else None
+				rendered = render_cache.get(cache_key) if (cache_key != None) else None
+				if (rendered == None) :
+					rendered = self.replaceKeyWords(replacements, file_content)
+					if (cache_key != None) :
+						render_cache.put(cache_key, rendered)
+
+				file_content = rendered
+				self.rendered_files[render_key] = file_content
+
+		if (self.metrics != None) :
+			self.metrics.addLatency("render", self.metrics.stop("renderFile", started))
+
+		return(file_content)
+
+	# builds the dictionary with the replacement keywords that are specific to a file, which are added to the keywords
+	def buildFileReplacements(self, key, file_content) :
+		# determine this file's extension
+		aux_pos = key.rfind(".")
+		if (aux_pos == -1) :
+			file_extension = ""
+		else :
+			file_extension = key[aux_pos + 1:]
+
+		# add this file's name and type to the replacements
+		replacements = {"file_name" : key[:aux_pos], "file_type" : file_extension}
+
+		# check if this file requires the copyright text to be inserted
+		if ("|!copyright!|" in file_content) :
+			# it does
+			# add the copyright replacement information
+			replacements["copyright"] = self.buildCopyrightString(file_extension)
+
+		return(replacements)
+
+	# decides if the rendered content of the plan's files is looked for in the cache on the disk, depending on their size
+	def selectRenderCache(self, plan) :
+		self.cache_structure = (self.render_cache != None and sum(len(entry[3]) for entry in plan if (entry[0] == "file" and len(entry[3]) >= self.cache_file_length)) >= self.cache_length)
+
+	# returns the cache on the disk where a file expected to be length characters long is looked for,
+	# or None if it should be rendered without the cache
+	def getRenderCache(self, length) :
+		if (self.render_cache == None or length < self.cache_file_length or (not self.cache_structure and length < self.cache_length)) :
+			return(None)
+
+		return(self.render_cache)
+
+	# renders the content of all the plan's files, so that it can be written to several places without rendering it again
+	# returns a dictionary with the rendered content of the files, indexed by their position in the plan
+	# NOTE: files rendered in chunks are left out and rendered again where they're written, since their whole content is never in memory
+	def renderStructure(self, plan) :
+		self.selectRenderCache(plan)
+		rendered = self.renderInParallel(plan)
+
+		# render the files the pool of processes didn't
+		directory_scopes = {}
+		self.rendered_files = {}
+		for index, entry in enumerate(plan) :
+			if (entry[0] == "file" and index not in rendered) :
+				file_content = self.renderFile(entry[1], entry[3], self.getDirectoryScope(entry[-1], directory_scopes))
+				if (isinstance(file_content, str)) :
+					rendered[index] = file_content
+		self.rendered_files = {}
+
+		return(rendered)
+
+	# renders the content of the plan's files in a pool of processes, if it was requested and the files are large enough
+	# files that would be rendered in chunks are left to renderFile(), since their whole content is never in memory
+	# returns a dictionary with the rendered content of the files, indexed by their position in the plan
+	# NOTE: the content is the same as if the files were rendered by renderFile()
+	def renderInParallel(self, plan) :
+		process_count = self.cli_obj.options["jobs"]
+		files = [(index, entry) for index, entry in enumerate(plan) if (entry[0] == "file")]
+		if (process_count < 2 or len(files) < 2 or sum(len(entry[3]) for index, entry in files) < self.parallel_length) :
+			return({})
+
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		from classes import KeywordScope, RenderPool, Template
+
+		# the files to be rendered by the pool, each one a tuple with its content and the values of the keywords it uses
+		tasks = []
+		# the key of each file to be rendered by the pool in the cache on the disk, or None if it isn't kept in the cache
+		cache_keys = []
+		# stores the keywords' scope of each directory, indexed by the keys of the directory and its parents
+		directory_scopes = {}
+		# stores the render key of each file, indexed by the file's position in the plan
+		positions = {}
+		# stores the position in tasks of each file's content, indexed by the file's source string and the values of the keywords it uses
+		# NOTE: files with the same source string and values are only rendered once, the same as in renderFile()
+		render_keys = {}
+		# stores the content of the files found in the cache on the disk, indexed by their render key
+		found = {}
+		for index, entry in files :
+			template = Template.Template.compile(entry[3])
+			# NOTE: files whose placeholders could overlap each other need all the keywords, so they're rendered by renderFile()
+			if (template.overlapping) :
+				continue
+
+			replacements = KeywordScope.KeywordScope(self.buildFileReplacements(entry[1], entry[3]), self.getDirectoryScope(entry[-1], directory_scopes))
+			replacements = replacements.resolve(template.getKeywords())
+			length = template.estimateLength(replacements)
+			if (length > self.stream_length) :
+				continue
+
+			values = tuple(replacements[keyword] if (isinstance(replacements.get(keyword, None), str)) else None for keyword in template.getKeywords())
+			# NOTE: files whose final string could depend on other keywords (ex: values with placeholders of their own)
+			#       are rendered by renderFile() with the whole scope, since neither the cache nor the keys here would see them
+			if (not template.isSelfContained(values)) :
+				continue
+
+			render_key = (entry[3], values)
+			if (render_key not in render_keys and render_key not in found) :
+				# look for the file's content in the cache on the disk
+				render_cache = self.getRenderCache(length)
+				cache_key = render_cache.buildKey(("file", entry[3], values)) if (render_cache != None) else None
+				content = render_cache.get(cache_key) if (cache_key != None) else None
+				if (content != None) :
+					found[render_key] = content
+				else :
+					render_keys[render_key] = len(tasks)
+					tasks.append((entry[3], replacements))
+					cache_keys.append(cache_key)
+
+					if (self.metrics != None) :
+						self.metrics.count("placeholders", len([segment for segment in template.segments if (not isinstance(segment, str))]))
+
+			positions[index] = render_key
+
+		# render the files that weren't found in the cache
+		rendered = None
+		if (len(tasks) > 1) :
+			rendered = RenderPool.RenderPool(min(process_count, len(tasks))).render(tasks)
+
+		if (self.metrics != None) :
+			self.metrics.stop("renderInParallel", started)
+
+		# NOTE: if the pool couldn't be used, the files that weren't found in the cache are rendered by the main process
+		if (rendered != None) :
+			for render_key in render_keys :
+				found[render_key] = rendered[render_keys[render_key]]
+				if (cache_keys[render_keys[render_key]] != None) :
+					self.render_cache.put(cache_keys[render_keys[render_key]], found[render_key])
+
+		return({index : found[positions[index]] for index in positions if (positions[index] in found)})
+
 	# searches the string for |!keyword!| and replaces them
 	# NOTE: any keywords found in string not present in replacements will be replaced by an empty string
+	# NOTE: the string is compiled once and each compiled template is rendered in a single pass
 	def replaceKeyWords(self, replacements, string) :
-		# the pattern to identify the placeholders
-		re_pattern = "\|!([^{!\[\]]+)(\{\d+\})?(\[[^{!\[\]]+\])?!\|"
-
-		# the map between case tag in the regex and the String class function to use
-		str_func = {"lc" : "lower", "uc" : "upper", "t" : "title"}
-
-		# loop while there are keywords in the string
-		re_matches = re.search(re_pattern, string)
-		while (re_matches != None) :
-			# grab the re_matches groups
-			match_groups = re_matches.groups("")
-			match_count = len(match_groups)
-
-			# check if the keyword found is present in replacements and is a string
-			if (match_groups[0] in replacements and isinstance(replacements[match_groups[0]], str)) :
-				# it is
-				# build the replacement string
-				new_string = replacements[match_groups[0]]
-			else :
-				# it isn't
-				# replace the keyword with an empty string
-				new_string = ""
-
-			# check if there is any other information provided
-			if (len(new_string) > 0 and match_count > 1) :
-				# there is
-				# loop through the remaining matches
-				i = 1
-				while (i < match_count):
-					# check if this match is a multiplier
-					if (match_groups[i].startswith("{") and match_groups[i].endswith("}")) :
-						# it is
-						# update the replacement string
-						new_string *= int(match_groups[i][1:-1])
-					# check if this match is a case enforcer
-					elif (match_groups[i].startswith("[") and match_groups[i].endswith("]")) :
-						# it is
-						# check if this case enforcer is valid
-						case_enforcer = match_groups[i][1:-1].lower()
-						if (case_enforcer in str_func) :
-							# it is
-							# update the replacement string
-							new_string = getattr(new_string, str_func[case_enforcer], new_string)()
-
-					i += 1
-
-			# replace the keyword with the new_string
-			string = string.replace("|!" + "".join(match_groups) + "!|", new_string)
-
-			# check the pattern again
-			re_matches = re.search(re_pattern, string)
-
-		# return the final string
+		from classes import Template
+
+		template = Template.Template.compile(string)
+		if (self.metrics == None) :
+			return(template.render(replacements))
+
+		started = self.metrics.start()
+		string = template.render(replacements)
+		self.metrics.stop("replaceKeyWords", started)
+		self.metrics.count("placeholders", len([segment for segment in template.segments if (not isinstance(segment, str))]))
+
 		return(string)
 
-	# searches all the directories in the path provided for the project folder
-	# the project folder is the 1st folder found with a ".git" directory
+	# searches the path provided, and its parent directories, for the project folder
+	# the project folder is the 1st folder with one of the root markers (by default a ".git" directory)
 	# if none can be found, then an empty string will be returned
 	def findProjectName(self, destination_path) :
-		result = ""
-
-		# loop through the path provided untill a ".git" folder is found or the drive folder is reached
-		while (re.search("^[a-zA-Z]:\\\\$", destination_path) == None) :
-			# check if this directory has a ".git folder"
-			if (".git" in os.listdir(destination_path)) :
-				# it does
-				result = re.search("^.+\\\\([^\\\\]+)\\\\?$", destination_path).group(1)
+		markers = self.cli_obj.options.get("root-markers", (".git",))
+
+		# convert the path to the OS's format and make it absolute
+		# NOTE: the paths are built with "\\" throughout the application
+		if (os.sep != "\\") :
+			destination_path = destination_path.replace("\\", os.sep)
+		directory = os.path.abspath(destination_path)
+
+		# loop through the path provided untill a root marker is found or the root directory is reached
+		result = None
+		visited = []
+		while (result == None) :
+			# check if this directory was already searched
+			if ((directory, markers) in self.project_names) :
+				result = self.project_names[(directory, markers)]
 				break
 
-			# move to the parent directory
-			destination_path = os.path.dirname(destination_path)
+			visited.append(directory)
+
+			# check if this directory has one of the root markers
+			# NOTE: a single stat per marker, instead of listing the whole directory
+			for marker in markers :
+				if (os.path.exists(os.path.join(directory, marker))) :
+					# it does
+					result = os.path.basename(directory)
+					break
+			else :
+				# move to the parent directory
+				parent = os.path.dirname(directory)
+				if (parent == directory) :
+					# this is the root directory, so there is no project folder
+					result = ""
+				directory = parent
 
 		# cosmetic changes to the result
 		result = result.title()
 
+		# store the result for all the directories searched
+		for directory in visited :
+			self.project_names[(directory, markers)] = result
+
 		return(result)
@@ -0,0 +1,187 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os
+
+class Archive :
+	"""Writes directories and files straight into a tar, tar.gz or zip archive, in a single sequential write,
+	without creating them on the disk.
+	All the entries have the same date and permissions, so the same entries, in the same order, always give the same archive."""
+
+	# the archive format of each file extension
+	formats = {".tar" : "tar", ".tar.gz" : "tar.gz", ".tgz" : "tar.gz", ".zip" : "zip"}
+
+	# the date of all the entries, as a Unix timestamp (1980-01-01, the earliest date a zip archive can store)
+	# NOTE: the SOURCE_DATE_EPOCH environment variable, used by reproducible builds, takes precedence
+	default_mtime = 315532800
+
+	# the size, in bytes, up to which the content of a file whose size isn't known is kept in memory,
+	# before being added to a tar archive, which needs the size before the content
+	spool_size = 16777216
+
+	def __init__(self, archive_path, durability = None) :
+		# instance variables
+		# path to the archive, or "-" to write it to stdout
+		self.archive_path = archive_path
+		# the archive's format, based on its extension, or "tar" when it's written to stdout
+		self.format = "tar" if (archive_path == "-") else self.getFormat(archive_path)
+		# syncs the archive to the disk once it's written, or None if it isn't synced
+		self.durability = durability
+		# the date of all the entries, as a Unix timestamp
+		self.mtime = self.default_mtime
+		# the file where the archive is written
+		self.file_object = None
+		# True if the archive's file was created by open(), False if it already existed or the archive is written to stdout
+		self.created = False
+		# the compressed stream of a tar.gz archive
+		self.gzip_object = None
+		# the object writing the entries of a tar or a zip archive
+		self.tar_object = None
+		self.zip_object = None
+
+		try :
+			self.mtime = max(self.default_mtime, int(os.environ.get("SOURCE_DATE_EPOCH", self.default_mtime)))
+		except ValueError as e :
+			pass
+
+	# returns the format of an archive, given its path, or None if its extension isn't supported
+	@classmethod
+	def getFormat(cls, archive_path) :
+		for extension in cls.formats :
+			if (archive_path.lower().endswith(extension)) :
+				return(cls.formats[extension])
+
+		return(None)
+
+	# creates the archive, ready to have entries added
+	# raises OSError if the archive couldn't be created
+	def open(self) :
+		if (self.archive_path == "-") :
+			# NOTE: the feedback messages are printed to stderr while the archive is written to stdout
+			import sys
+			self.file_object = sys.stdout.buffer
+		else :
+			try :
+				self.file_object = open(self.archive_path, "xb")
+				self.created = True
+			except FileExistsError as e :
+				self.file_object = open(self.archive_path, "wb")
+
+		if (self.format == "zip") :
+			import zipfile
+			self.zip_object = zipfile.ZipFile(self.file_object, "w", zipfile.ZIP_DEFLATED)
+		else :
+			import tarfile
+
+			# NOTE: the gzip header has a date as well, which is set to the entries' date
+			target = self.file_object
+			if (self.format == "tar.gz") :
+				import gzip
+				self.gzip_object = gzip.GzipFile("", "wb", 9, self.file_object, self.mtime)
+				target = self.gzip_object
+
+			self.tar_object = tarfile.open(fileobj = target, mode = "w|", format = tarfile.PAX_FORMAT)
+
+	# adds a directory, given its path inside the archive with "/" as the separator
+	# raises OSError if it couldn't be written
+	def addDirectory(self, name) :
+		if (self.zip_object != None) :
+			self.zip_object.writestr(self.buildZipInfo(name + "/", 0o40755), b"")
+		else :
+			import tarfile
+			self.tar_object.addfile(self.buildTarInfo(name, tarfile.DIRTYPE, 0o755))
+
+	# adds a file, given its path inside the archive with "/" as the separator, an iterable with its content in chunks
+	# of bytes and its size in bytes, or None if it isn't known
+	# raises OSError if it couldn't be written
+	def addFile(self, name, chunks, size = None) :
+		if (self.zip_object != None) :
+			# NOTE: files whose size isn't known could be larger than what a zip archive can store without its extensions
+			with self.zip_object.open(self.buildZipInfo(name, 0o100644), "w", force_zip64 = (size == None)) as entry_object :
+				for chunk in chunks :
+					entry_object.write(chunk)
+			return
+
+		import io, tarfile
+
+		# a tar archive needs each file's size before its content
+		if (size == None) :
+			import tempfile
+			content_object = tempfile.SpooledTemporaryFile(self.spool_size)
+			for chunk in chunks :
+				content_object.write(chunk)
+			size = content_object.tell()
+			content_object.seek(0)
+		else :
+			content_object = io.BytesIO(b"".join(chunks))
+
+		try :
+			tar_info = self.buildTarInfo(name, tarfile.REGTYPE, 0o644)
+			tar_info.size = size
+			self.tar_object.addfile(tar_info, content_object)
+		finally :
+			content_object.close()
+
+	# returns the information of a tar archive's entry, with the same date and owner as all the others
+	def buildTarInfo(self, name, entry_type, mode) :
+		import tarfile
+
+		tar_info = tarfile.TarInfo(name)
+		tar_info.type = entry_type
+		tar_info.mode = mode
+		tar_info.mtime = self.mtime
+		tar_info.uid = 0
+		tar_info.gid = 0
+		tar_info.uname = ""
+		tar_info.gname = ""
+
+		return(tar_info)
+
+	# returns the information of a zip archive's entry, with the same date and system as all the others
+	# mode has the entry's type and permissions, as in a Unix file system
+	def buildZipInfo(self, name, mode) :
+		import time, zipfile
+
+		zip_info = zipfile.ZipInfo(name, time.gmtime(self.mtime)[:6])
+		zip_info.compress_type = zipfile.ZIP_DEFLATED
+		zip_info.create_system = 3
+		zip_info.external_attr = mode << 16
+		if (name.endswith("/")) :
+			# NOTE: 0x10 is MS-DOS' directory attribute
+			zip_info.external_attr |= 0x10
+
+		return(zip_info)
+
+	# finishes the archive and closes it, syncing it to the disk if requested
+	# NOTE: the file is always closed, even if the archive couldn't be finished
+	# raises OSError if it couldn't be finished
+	def close(self) :
+		try :
+			if (self.zip_object != None) :
+				self.zip_object.close()
+			if (self.tar_object != None) :
+				self.tar_object.close()
+			if (self.gzip_object != None) :
+				self.gzip_object.close()
+
+			# make the archive durable, if requested
+			if (self.durability != None and self.archive_path != "-") :
+				self.durability.syncFile(self.file_object)
+		finally :
+			if (self.archive_path == "-") :
+				self.file_object.flush()
+			else :
+				self.file_object.close()
+
+		if (self.durability != None and self.archive_path != "-") :
+			self.durability.syncParent(self.archive_path)
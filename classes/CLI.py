@@ -16,32 +16,72 @@ import sys
 class CLI :
 	"""Processes the command line parameters passed to this program when it was called"""
 
-	def __init__(self) :
+	# tuple with the valid actions
+	valid_actions = ("project", "file", "help", "batch", "daemon", "rollback", "resume", "sync")
+
+	# dictionary with the valid options
+	# each option has a tuple with its default value and the name of the method that converts the provided value
+	# NOTE: the value of the options without a method is stored as it was provided
+	valid_options = {
+		"writers" : (4, "convertPositiveInt"),
+		"report" : (None, None),
+		"daemon-file" : (None, None),
+		"startup-report" : (False, "convertSwitch"),
+		"root-markers" : ((".git",), "convertList"),
+		"journal" : (None, None),
+		"timings" : (False, "convertSwitch"),
+		"metrics-json" : (None, None),
+		"asset-link" : ("copy", "convertLinkMode"),
+		"dedup" : ("copy", "convertLinkMode"),
+		"jobs" : (1, "convertPositiveInt"),
+		"durability" : ("none", "convertDurability"),
+		"output-archive" : (None, "convertArchivePath"),
+		"no-cache" : (False, "convertSwitch"),
+		"location" : ((), "convertNonEmpty")
+	}
+
+	# the options that can be given several times, whose values are stored in a tuple, in the order they were given
+	repeatable_options = ("location",)
+
+	def __init__(self, argv = None, output = None) :
 		# the argument format expected by this program are as follow:
 		# 1st arg = the action to be executed (ex: project, file)
 		# ... args = dependent on the requested action. See the action's method below for further details
+		# NOTE: by default the arguments are the ones in sys.argv, but a list with the same format can be provided
+		# NOTE: by default the feedback messages are printed to sys.stdout, but any other stream can be provided
 
 		# instance variables
+		# the stream where the feedback messages are printed
+		self.output = sys.stdout if (output == None) else output
+		# stores the command line arguments being processed
+		self.argv = list(sys.argv if (argv == None) else argv)
 		# stores the action that should be executed by the program
 		self.action = None
 		# stores the necessary arguments for the requested action, to be used by the Application class
 		self.args = {}
+		# stores the options provided in the format --name=value, to be used by the Application class
+		self.options = {}
+		# stores the options exactly as they were provided
+		self.option_args = []
+
+		# extract the options from the arguments
+		# NOTE: the feedback message is printed by the method
+		if (not self.processOptions()) :
+			# something is wrong with the options
+			return
 
 		# check if there are the mandatory #arguments
 		# NOTE: there is always an implicit 0th argument with the path to the file being called
-		if (len(sys.argv) < 2) :
+		if (len(self.argv) < 2) :
 			# there aren't, so bail out
-			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help\".\n")
+			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help\".\n", file = self.output)
 			return
 
-		# tuple with the valid actions
-		valid_action = ("project", "file", "help")
-
 		# check if the action requested is valid
-		requested_action = sys.argv[1].lower()
-		if (requested_action not in valid_action) :
+		requested_action = self.argv[1].lower()
+		if (requested_action not in self.valid_actions) :
 			# it isn't, so bail out
-			print("=> ERROR: The command \"" + requested_action + "\" is not valid.\nFor further information type \"help\".\n")
+			print("=> ERROR: The command \"" + requested_action + "\" is not valid.\nFor further information type \"help\".\n", file = self.output)
 			return
 
 		# the action is valid, so store it
@@ -55,74 +95,359 @@ class CLI :
 			# bail out
 			return
 
+	# builds the CLI object of an action from its arguments and options, given as Python values instead of a command line
+	# (ex: by the Library class), so that nothing is split or expanded
+	# args are the action's arguments, as stored by its process method, and can be stored later (ex: with storeProjectArgs())
+	# options are the options' values, already converted, and the options not provided have their default value
+	# argv is the equivalent command line, without the path to the program, which only describes the action (ex: in its metrics)
+	@classmethod
+	def fromArgs(cls, action, args = None, options = None, argv = None, output = None) :
+		# NOTE: the command line isn't processed, so the instance variables are set here instead of in __init__()
+		cli_obj = cls.__new__(cls)
+		cli_obj.output = sys.stdout if (output == None) else output
+		cli_obj.argv = [""] + list(argv if (argv != None) else [action])
+		cli_obj.action = action
+		cli_obj.args = dict(args or {})
+		cli_obj.options = {name : cls.valid_options[name][0] for name in cls.valid_options}
+		# NOTE: the options with several values are kept in tuples, even if they're given in lists (ex: read from a JSON file)
+		for name, value in (options or {}).items() :
+			cli_obj.options[name] = tuple(value) if (isinstance(value, list)) else value
+		cli_obj.option_args = []
+
+		return(cli_obj)
+
+	# removes the options from the command line arguments and stores them, converted to the expected data type
+	# options not provided are stored with their default value
+	def processOptions(self) :
+		# store the default values
+		for name in self.valid_options :
+			self.options[name] = self.valid_options[name][0]
+
+		# loop through the arguments, keeping the ones that aren't options
+		# NOTE: there is always an implicit 0th argument with the path to the file being called
+		positional_args = self.argv[:1]
+		for arg in self.argv[1:] :
+			if (not arg.startswith("--")) :
+				positional_args.append(arg)
+				continue
+
+			# split the option into its name and value
+			name, value = arg[2:].partition("=")[::2]
+			if (name not in self.valid_options) :
+				# the option isn't valid, so bail out
+				print("=> ERROR: The option \"--" + name + "\" is not valid.\nFor further information type \"help\".\n", file = self.output)
+				return(False)
+
+			# convert the value
+			try :
+				converter = self.valid_options[name][1]
+				value = value if (converter == None) else getattr(self, converter)(value)
+			except ValueError as e :
+				# the value isn't valid for this option, so bail out
+				print("=> ERROR: The value \"" + value + "\" is not valid for the option \"--" + name + "\".\n", file = self.output)
+				return(False)
+
+			if (name in self.repeatable_options) :
+				self.options[name] += (value,)
+			else :
+				self.options[name] = value
+
+			self.option_args.append(arg)
+
+		# remove the options from the arguments
+		self.argv = positional_args
+
+		# all OK
+		return(True)
+
+	# converts the value of an option that is a switch, which can't have a value, into True
+	# raises ValueError if a value was provided
+	def convertSwitch(self, value) :
+		if (len(value) > 0) :
+			raise ValueError(value)
+
+		return(True)
+
+	# converts an option's value given by a Python program, instead of the command line, into the expected data type
+	# the value can be a string, as in the command line, or of the expected data type (ex: 8 for --writers), and the options
+	# with several values (ex: --root-markers, --location) take a list with them, whose items are never split
+	# raises ValueError if the value isn't valid
+	def convertValue(self, name, value) :
+		converter = self.valid_options[name][1]
+		if (converter == "convertSwitch") :
+			# a switch can only be turned on
+			if (value is not True) :
+				raise ValueError(value)
+
+			return(True)
+
+		if (converter == "convertList" or name in self.repeatable_options) :
+			items = [value] if (isinstance(value, str)) else list(value)
+			if ((converter == "convertList" and len(items) == 0) or not all(isinstance(item, str) for item in items)) :
+				raise ValueError(value)
+
+			# each item is converted on its own, and the items of a list can't be empty
+			item_converter = "convertNonEmpty" if (converter == "convertList") else converter
+			return(tuple(getattr(self, item_converter)(item) for item in items))
+
+		if (isinstance(value, bool) or not isinstance(value, (str, int))) :
+			raise ValueError(value)
+
+		return(str(value) if (converter == None) else getattr(self, converter)(str(value)))
+
+	# converts an option's comma separated value into a tuple with the non empty items
+	# raises ValueError if there are no items
+	def convertList(self, value) :
+		value = tuple(item.strip() for item in value.split(",") if (len(item.strip()) > 0))
+		if (len(value) == 0) :
+			raise ValueError(value)
+
+		return(value)
+
+	# converts an option's value into one of the ways a file can be created from another file
+	# raises ValueError if the value isn't one of them
+	def convertLinkMode(self, value) :
+		if (value not in ("copy", "hardlink", "reflink")) :
+			raise ValueError(value)
+
+		return(value)
+
+	# converts an option's value into one of the ways the written files are synced to the disk
+	# raises ValueError if the value isn't one of them
+	def convertDurability(self, value) :
+		if (value not in ("none", "file", "batch")) :
+			raise ValueError(value)
+
+		return(value)
+
+	# converts an option's value into the path of an archive in one of the supported formats, or "-" for stdout
+	# raises ValueError if the archive's format isn't supported
+	def convertArchivePath(self, value) :
+		from classes import Archive
+		if (value != "-" and Archive.Archive.getFormat(value) == None) :
+			raise ValueError(value)
+
+		return(value)
+
+	# converts an option's value into a string, which can't be empty
+	# raises ValueError if the string is empty
+	def convertNonEmpty(self, value) :
+		if (len(value) == 0) :
+			raise ValueError(value)
+
+		return(value)
+
+	# converts an option's value into an integer larger than zero
+	# raises ValueError if that isn't possible
+	def convertPositiveInt(self, value) :
+		value = int(value)
+		if (value < 1) :
+			raise ValueError(value)
+
+		return(value)
+
 	# processes the command line arguments required to create a new project
 	def processProject(self) :
 		# expected arguments:
-		# 2nd arg = the location where the action should be executed
+		# 2nd arg = the location where the action should be executed, or the path to a file with one location per line,
+		#           prefixed with an @ (ex: @locations.txt)
+		# NOTE: more locations can be given with the option --location, once for each location
 		# 3rd arg = the name of the project to be created
 		# 4th arg = the type of project (ex: website, ruby, python)
 
 		# check if all the required arguments are set
 		# NOTE: there is always an implicit 0th argument with the path to the file being called
-		if (len(sys.argv) < 5) :
+		if (len(self.argv) < 5) :
 			# they aren't, so bail out
-			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help " + self.action + "\".\n")
+			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
 			return(False)
 
-		# make sure the 2nd arg is using backslashes and ends with one
-		sys.argv[2] = sys.argv[2].replace("/", "\\")
-		if (not sys.argv[2].endswith("\\")) :
-			sys.argv[2] += "\\"
+		# paths where the project's directory is to be created
+		locations = self.expandLocations(self.argv[2], self.options["location"])
+		if (locations == None) :
+			# the locations aren't valid, so bail out
+			print("=> ERROR: The locations \"" + self.argv[2] + "\" aren't valid.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
+			return(False)
 
 		# store the necessary arguments
+		self.storeProjectArgs(locations, self.argv[3], self.argv[4])
+
+		# all OK
+		return(True)
+
+	# stores the arguments of the project and sync actions
+	# locations is the list of locations, as returned by expandLocations() or normalizeLocations()
+	def storeProjectArgs(self, locations, project_name, project_type) :
+		# paths where the project's directory is to be created
+		self.args["locations"] = locations
 		# path where the action is to be executed
-		self.args["action_path"] = sys.argv[2] + sys.argv[3] + "\\"
+		self.args["action_path"] = locations[0] + project_name + "\\"
+		# path where the project's directory is to be created
+		self.args["location"] = locations[0]
 		# name of project to be created
-		self.args["project_name"] = sys.argv[3]
+		self.args["project_name"] = project_name
 		# type of project to be created
-		self.args["project_type"] = sys.argv[4]
+		self.args["project_type"] = project_type
+
+	# processes the command line arguments required to update an existing project
+	def processSync(self) :
+		# expected arguments:
+		# the same as the project action, with a single location
+		if (not self.processProject()) :
+			return(False)
+
+		if (len(self.args["locations"]) > 1) :
+			print("=> ERROR: The command " + self.action + " only accepts one location.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
+			return(False)
 
-		# all OK
 		return(True)
 
 	# processes the command line arguments required to create a new file
 	def processFile(self) :
 		# expected arguments:
 		# 2nd arg = the location where the action should be executed
-		# 3rd arg = the name of the file to be created
+		# 3rd arg = the name of the file to be created, a comma separated list of names, which can have ranges (ex: Model{1..200}),
+		#           or the path to a file with one name per line, prefixed with an @ (ex: @names.txt)
 		# 4th arg = the type of file (ex: php, ruby, python, json)
 		# 5th arg = [optional] extra configuration flags (ex: -f)
 
 		# check if all the required arguments are set
 		# NOTE: there is always an implicit 0th argument with the path to the file being called
-		if (len(sys.argv) < 5) :
+		if (len(self.argv) < 5) :
 			# they aren't, so bail out
-			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help " + self.action + "\".\n")
+			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
 			return(False)
 
 		# make sure the 2nd arg is using backslashes and ends with one
-		sys.argv[2] = sys.argv[2].replace("/", "\\")
-		if (not sys.argv[2].endswith("\\")) :
-			sys.argv[2] += "\\"
+		self.argv[2] = self.normalizePath(self.argv[2])
+
+		# names of the files to be created
+		file_names = self.expandNames(self.argv[3])
+		if (file_names == None) :
+			# the names aren't valid, so bail out
+			print("=> ERROR: The file names \"" + self.argv[3] + "\" aren't valid.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
+			return(False)
 
-		# store the necessary arguments
-		# path where the action is to be executed
-		self.args["action_path"] = sys.argv[2]
-		# name of file to be created
-		self.args["file_name"] = sys.argv[3]
-		# type of file to be created
-		self.args["file_type"] = sys.argv[4]
 		# extra configuration flags
-		if (len(sys.argv) > 5 and sys.argv[5].startswith("-") and len(sys.argv[5]) > 1) :
+		if (len(self.argv) > 5 and self.argv[5].startswith("-") and len(self.argv[5]) > 1) :
 			# there are some valid config flags
-			self.args["config_flags"] = list(sys.argv[5][1:])
+			config_flags = list(self.argv[5][1:])
 		else :
 			# there aren't any valid config flags
-			self.args["config_flags"] = []
+			config_flags = []
+
+		# store the necessary arguments
+		self.storeFileArgs(self.argv[2], file_names, self.argv[4], config_flags)
 
 		# all OK
 		return(True)
 
+	# stores the arguments of the file action
+	# file_names is the list of names, as returned by expandNames(), and config_flags the list of flags, without the -
+	def storeFileArgs(self, file_path, file_names, file_type, config_flags) :
+		# path where the action is to be executed
+		self.args["action_path"] = file_path
+		# names of the files to be created
+		self.args["file_names"] = file_names
+		# type of file to be created
+		self.args["file_type"] = file_type
+		# extra configuration flags
+		self.args["config_flags"] = config_flags
+
+	# expands the argument with the locations where a project is to be created into the list of locations,
+	# followed by the extra locations given with the option --location
+	# each location uses backslashes and ends with one
+	# NOTE: a location is never split, so it can have any character the system allows (ex: ; or :)
+	# returns the list, without repeated locations, or None if the argument isn't valid
+	def expandLocations(self, argument, extra_locations = ()) :
+		if (argument.startswith("@")) :
+			# the locations are in a file, one per line
+			try :
+				file_object = open(argument[1:], "r", encoding = "utf-8")
+				items = [line.strip() for line in file_object]
+				file_object.close()
+			except (OSError, UnicodeDecodeError) as e :
+				return(None)
+		else :
+			items = [argument]
+
+		return(self.normalizeLocations(items + list(extra_locations)))
+
+	# makes each location in the list use backslashes and end with one, as they're given, without splitting or expanding them
+	# returns the list, without empty or repeated locations, or None if there are no locations
+	def normalizeLocations(self, items) :
+		locations = []
+		for item in items :
+			# ignore empty locations
+			if (item == "") :
+				continue
+
+			# make sure the location is using backslashes and ends with one
+			item = self.normalizePath(item)
+			if (item not in locations) :
+				locations.append(item)
+
+		if (len(locations) == 0) :
+			return(None)
+
+		return(locations)
+
+	# returns the path using backslashes and ending with one
+	def normalizePath(self, path) :
+		path = path.replace("/", "\\")
+		if (not path.endswith("\\")) :
+			path += "\\"
+
+		return(path)
+
+	# expands the argument with the names of the files to be created into the list of names
+	# returns the list, without repeated names, or None if the argument isn't valid
+	def expandNames(self, argument) :
+		if (argument.startswith("@")) :
+			# the names are in a file, one per line
+			try :
+				file_object = open(argument[1:], "r", encoding = "utf-8")
+				items = [line.strip() for line in file_object]
+				file_object.close()
+			except (OSError, UnicodeDecodeError) as e :
+				return(None)
+		else :
+			# the names are separated by commas
+			items = [item.strip() for item in argument.split(",")]
+
+		names = []
+		for item in items :
+			# ignore empty names
+			if (item == "") :
+				continue
+
+			# check if the name has a range
+			aux_pos = item.find("{")
+			if (aux_pos == -1) :
+				names.append(item)
+				continue
+
+			end_pos = item.find("}", aux_pos)
+			bounds = item[aux_pos + 1:end_pos].split("..") if (end_pos != -1) else []
+			if (len(bounds) != 2 or not bounds[0].isdigit() or not bounds[1].isdigit() or "{" in item[end_pos:]) :
+				# the range isn't valid
+				return(None)
+
+			# a range where the first number has leading zeros pads all numbers to the same width (ex: {01..10})
+			width = len(bounds[0]) if (bounds[0].startswith("0")) else 1
+			first = int(bounds[0])
+			last = int(bounds[1])
+			step = 1 if (first <= last) else -1
+			for number in range(first, last + step, step) :
+				names.append(item[:aux_pos] + str(number).zfill(width) + item[end_pos + 1:])
+
+		# remove the repeated names, keeping the order
+		names = list(dict.fromkeys(names))
+		if (len(names) == 0) :
+			return(None)
+
+		return(names)
+
 	# processes the command line arguments required to show the help information
 	def processHelp(self) :
 		# expected arguments:
@@ -130,10 +455,62 @@ class CLI :
 
 		# store the necessary arguments
 		# desired topic, if 1 was given, or None otherwise
-		if (len(sys.argv) > 2) :
-			self.args["topic"] = sys.argv[2]
+		if (len(self.argv) > 2) :
+			self.args["topic"] = self.argv[2]
 		else :
 			self.args["topic"] = None
 
 		# all OK
 		return(True)
+
+	# processes the command line arguments required to execute a batch of actions
+	def processBatch(self) :
+		# expected arguments:
+		# 2nd arg = the path to the manifest file with the actions, or "-" to read it from stdin
+
+		# check if all the required arguments are set
+		# NOTE: there is always an implicit 0th argument with the path to the file being called
+		if (len(self.argv) < 3) :
+			# they aren't, so bail out
+			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
+			return(False)
+
+		# store the necessary arguments
+		# path to the manifest file
+		self.args["manifest_path"] = self.argv[2]
+
+		# all OK
+		return(True)
+
+	# processes the command line arguments required to undo an action that didn't finish
+	def processRollback(self) :
+		# expected arguments:
+		# 2nd arg = the path to the journal file written by the action
+
+		# check if all the required arguments are set
+		# NOTE: there is always an implicit 0th argument with the path to the file being called
+		if (len(self.argv) < 3) :
+			# they aren't, so bail out
+			print("=> ERROR: The command syntax is invalid.\nFor further information type \"help " + self.action + "\".\n", file = self.output)
+			return(False)
+
+		# store the necessary arguments
+		# path to the journal file
+		self.args["journal_path"] = self.argv[2]
+
+		# all OK
+		return(True)
+
+	# processes the command line arguments required to undo an action that didn't finish and execute it again
+	def processResume(self) :
+		# expected arguments:
+		# the same as the rollback action
+		return(self.processRollback())
+
+	# processes the command line arguments required to start the daemon
+	def processDaemon(self) :
+		# expected arguments:
+		# none, the path to the daemon file can be given with the option --daemon-file
+
+		# all OK
+		return(True)
@@ -0,0 +1,107 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os
+from classes import CLI, Pack
+
+class Completer :
+	"""Answers the shell's requests to complete the words of this program's command line.
+	The types and help topics are read from the index of the compiled JSON files, without decoding them,
+	so each request only takes a few milliseconds, even with thousands of types."""
+
+	# the JSON file with the types of each action and the kinds of the nodes offered as its type argument,
+	# in the 1st tier and in the other tiers
+	# NOTE: the project types and help topics are only in the 1st tier, since the nodes inside them are their content
+	# NOTE: the Application class isn't imported, since that takes longer than the rest of the request
+	type_kinds = {"project" : ("project", ("project",), ()), "sync" : ("project", ("project",), ()), "file" : ("file", ("file", "group"), ("file", "group")), "help" : ("help", ("topic",), ())}
+
+	# the position of the type argument of each action, with the action in position 0
+	type_positions = {"project" : 3, "sync" : 3, "file" : 3, "help" : 1}
+
+	# the values offered for the flags argument of the file action
+	file_flags = ("-f", "-o", "-fo")
+
+	def __init__(self, json_path) :
+		# instance variables
+		# path to the directory with the JSON files
+		# NOTE: built with the system's separator, so that the JSON files are found on any system
+		self.json_path = json_path.replace("/", os.sep)
+		# the compiled version of the JSON files, only opened when needed
+		self.pack = None
+
+		# make sure json_path ends with a separator
+		if (not self.json_path.endswith(os.sep)) :
+			self.json_path += os.sep
+
+	# returns a list with the possible values for the last word of the command line
+	# words are the words of the command line, without the program, where the last one is the word being completed
+	# NOTE: an empty list means the word should be completed with the file names, by the shell
+	def complete(self, words) :
+		# the word being completed
+		current = words[-1] if (len(words) > 0) else ""
+
+		# the options can be given in any position
+		if (current.startswith("--")) :
+			return(self.completeOption(current))
+
+		# the arguments that aren't options
+		args = [word for word in words[:-1] if (not word.startswith("--"))]
+
+		# the 1st argument is the action
+		if (len(args) == 0) :
+			return([action for action in CLI.CLI.valid_actions if (action.startswith(current.lower()))])
+
+		action = args[0].lower()
+		if (len(args) == self.type_positions.get(action, None)) :
+			return(self.completeType(action, current))
+
+		# the argument after the file action's type has its flags
+		if (action == "file" and len(args) == 4 and current.startswith("-")) :
+			return([flags for flags in self.file_flags if (flags.startswith(current))])
+
+		return([])
+
+	# returns a list with the options that start with the word being completed
+	# the options that need a value are returned with a "="
+	def completeOption(self, current) :
+		options = []
+		for name in CLI.CLI.valid_options :
+			option = "--" + name + ("" if (CLI.CLI.valid_options[name][1] == "convertSwitch") else "=")
+			if (option.startswith(current)) :
+				options.append(option)
+
+		return(options)
+
+	# returns a list with the types of an action that start with the word being completed
+	# the types are completed one tier at a time and the groups of types are returned with a ":"
+	def completeType(self, action, current) :
+		if (self.pack == None) :
+			self.pack = Pack.Pack.openData(self.json_path)
+
+		# the tiers before the one being completed
+		base = current[:current.rfind(":") + 1]
+
+		json_name, first_kinds, other_kinds = self.type_kinds[action]
+		kinds = first_kinds if (len(base) == 0) else other_kinds
+		if (len(kinds) == 0) :
+			return([])
+
+		types = []
+		for colon_path, kind in self.pack.getTypes(json_name, current, kinds) :
+			# ignore the types in the tiers after the one being completed
+			if (":" in colon_path[len(base):]) :
+				continue
+
+			types.append(colon_path + (":" if (kind == "group") else ""))
+
+		return(types)
@@ -0,0 +1,45 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+class ComputedKeywords(dict) :
+	"""Keywords whose value is computed by a function the 1st time it's requested, and then kept for the rest of the run.
+	Used as the last layer of the keywords' scopes, so that only the keywords used by the files are computed."""
+
+	def __init__(self, functions) :
+		super().__init__()
+
+		# instance variables
+		# the function that computes each keyword's value, indexed by the keyword
+		self.functions = functions
+
+	# computes the value of a keyword that wasn't requested yet and keeps it
+	# raises KeyError if the keyword can't be computed
+	def __missing__(self, keyword) :
+		if (keyword not in self.functions) :
+			raise KeyError(keyword)
+
+		value = self.functions[keyword]()
+		self[keyword] = value
+
+		return(value)
+
+	# returns True if the keyword was already computed or can be computed, False otherwise
+	def __contains__(self, keyword) :
+		return(dict.__contains__(self, keyword) or keyword in self.functions)
+
+	# returns the value of a keyword, computing it if needed, or default if the keyword can't be computed
+	def get(self, keyword, default = None) :
+		if (keyword not in self) :
+			return(default)
+
+		return(self[keyword])
@@ -0,0 +1,240 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, sys, io, json, socket, tempfile
+
+class Daemon :
+	"""Keeps the application loaded and executes the actions requested by clients through a TCP socket on the
+	loopback interface, which every system supports.
+	The daemon's port and a random key are written to the daemon file, which only the user that started it can read,
+	and each request must have that key, so that other users can't execute actions through the daemon."""
+
+	# the time, in seconds, a client has to send its request after connecting
+	request_timeout = 10
+
+	def __init__(self, app_obj, daemon_path) :
+		# instance variables
+		# the Application object that will execute the actions
+		# NOTE: its parsed JSON files and compiled templates are kept between requests
+		self.app_obj = app_obj
+		# path to the file where the daemon's port and key are written
+		self.daemon_path = daemon_path
+		# the key the requests must have, created when the daemon starts
+		self.key = None
+
+	# returns the default path for the daemon file
+	# NOTE: client.py has a copy of this logic, so it doesn't need to import this package
+	@staticmethod
+	def defaultDaemonPath() :
+		daemon_path = os.environ.get("PROJMAN_DAEMON_FILE", "")
+		if (len(daemon_path) == 0) :
+			# NOTE: each user has its own daemon
+			user_id = str(os.getuid()) if (hasattr(os, "getuid")) else ""
+			daemon_path = os.path.join(tempfile.gettempdir(), "projman-" + user_id + ".daemon")
+
+		return(daemon_path)
+
+	# reads the daemon file and returns a tuple with the daemon's port and key
+	# returns None if the file doesn't exist, isn't valid or belongs to another user
+	# NOTE: client.py has a copy of this logic, so it doesn't need to import this package
+	@staticmethod
+	def readDaemonFile(daemon_path) :
+		try :
+			file_object = open(daemon_path, "r", encoding = "utf-8")
+			try :
+				# NOTE: a file created by another user could point to a program of their own
+				if (hasattr(os, "getuid") and os.fstat(file_object.fileno()).st_uid != os.getuid()) :
+					return(None)
+
+				address = json.loads(file_object.read())
+			finally :
+				file_object.close()
+
+			return((int(address["port"]), str(address["key"])))
+		except (OSError, ValueError, KeyError, TypeError) as e :
+			return(None)
+
+	# writes the daemon's port and key to the daemon file, which only this user can read
+	# raises OSError if the file couldn't be written
+	def writeDaemonFile(self, port) :
+		# NOTE: the file is written under another name and then renamed, so clients never read it half written
+		temp_path = self.daemon_path + "." + os.urandom(4).hex() + ".tmp"
+		file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+		try :
+			with os.fdopen(file_descriptor, "w", encoding = "utf-8") as file_object :
+				file_object.write(json.dumps({"port" : port, "key" : self.key}))
+
+			os.replace(temp_path, self.daemon_path)
+		except OSError as e :
+			try :
+				os.remove(temp_path)
+			except OSError as e :
+				pass
+			raise
+
+	# starts listening for requests and handles them, one at a time, until interrupted
+	# returns True if the daemon stopped normally, False if it couldn't be started
+	def run(self) :
+		# check if there is a daemon running already
+		address = self.readDaemonFile(self.daemon_path)
+		if (address != None) :
+			try :
+				client_socket = socket.create_connection(("127.0.0.1", address[0]), timeout = 1)
+				client_socket.close()
+
+				# there is, so bail out
+				print("=> ERROR: There is already a daemon running, listening on port " + str(address[0]) + ".")
+				return(False)
+			except OSError as e :
+				# the daemon file was left behind by a daemon that is no longer running, so it's replaced
+				pass
+
+		# start listening on a port chosen by the system
+		server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		try :
+			server_socket.bind(("127.0.0.1", 0))
+			server_socket.listen(16)
+		except OSError as e :
+			server_socket.close()
+			print("=> ERROR: The daemon's socket couldn't be created.")
+			return(False)
+
+		# tell the clients where the daemon is listening
+		self.key = os.urandom(16).hex()
+		try :
+			self.writeDaemonFile(server_socket.getsockname()[1])
+		except OSError as e :
+			server_socket.close()
+			print("=> ERROR: The daemon file \"" + self.daemon_path + "\" couldn't be created.")
+			return(False)
+
+		print("=> Success: Daemon listening on port " + str(server_socket.getsockname()[1]) + ". Press Ctrl+C to stop it.")
+		sys.stdout.flush()
+
+		# NOTE: waiting for a connection is interrupted every second, since on Windows Ctrl+C doesn't interrupt accept()
+		server_socket.settimeout(1)
+		try :
+			while (True) :
+				try :
+					connection, address = server_socket.accept()
+				except socket.timeout as e :
+					continue
+
+				with connection :
+					connection.settimeout(self.request_timeout)
+					self.handleConnection(connection)
+		except KeyboardInterrupt as e :
+			print("=> Daemon stopped.")
+		finally :
+			server_socket.close()
+
+			# remove the daemon file, unless another daemon replaced it in the meantime
+			address = self.readDaemonFile(self.daemon_path)
+			if (address != None and address[1] == self.key) :
+				try :
+					os.remove(self.daemon_path)
+				except OSError as e :
+					pass
+
+		return(True)
+
+	# returns True if a decoded request has the daemon's key and values of the expected types, False otherwise
+	def isValidRequest(self, request) :
+		import hmac
+
+		if (not isinstance(request, dict) or not isinstance(request.get("key", None), str)) :
+			return(False)
+		if (not hmac.compare_digest(request["key"], self.key)) :
+			return(False)
+
+		# the arguments must be a list of strings, as they would be given in the command line
+		if (not isinstance(request.get("args", None), list) or not all(isinstance(arg, str) for arg in request["args"])) :
+			return(False)
+
+		for name in ("cwd", "stdin") :
+			if (name in request and not isinstance(request[name], str)) :
+				return(False)
+
+		return(True)
+
+	# reads a request from the connection, executes it and sends back the reply
+	# the request is a JSON object, in a single line, with the keys:
+	# "key" = the daemon's key, read from the daemon file
+	# "args" = list with the arguments as they would be given in the command line
+	# "cwd" = [optional] the client's working directory
+	# "stdin" = [optional] the content of the client's stdin
+	# "metrics" = [optional] true to receive the action's metrics
+	# the reply is a JSON object, in a single line, with the keys "success" and "output", and "metrics" if requested
+	def handleConnection(self, connection) :
+		# read the request
+		request_bytes = b""
+		try :
+			while (not request_bytes.endswith(b"\n")) :
+				chunk = connection.recv(65536)
+				if (len(chunk) == 0) :
+					break
+				request_bytes += chunk
+		except OSError as e :
+			# the client didn't send the request in time or is gone
+			return
+
+		try :
+			request = json.loads(request_bytes.decode("utf-8"))
+		except ValueError as e :
+			request = None
+
+		if (not self.isValidRequest(request)) :
+			reply = {"success" : False, "output" : "=> ERROR: The request sent to the daemon isn't valid.\n"}
+		else :
+			reply = self.executeRequest(request)
+
+		# send the reply
+		try :
+			connection.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+		except OSError as e :
+			# the client is gone, so there is no one to reply to
+			pass
+
+	# executes the action of a valid request, in the client's working directory and with the client's stdin
+	# returns the reply to be sent to the client
+	def executeRequest(self, request) :
+		cwd = os.getcwd()
+		try :
+			if ("cwd" in request) :
+				os.chdir(request["cwd"])
+		except OSError as e :
+			return({"success" : False, "output" : "=> ERROR: The directory \"" + request["cwd"] + "\" couldn't be accessed.\n"})
+
+		stdin = sys.stdin
+		metrics = []
+		try :
+			sys.stdin = io.StringIO(request.get("stdin", ""))
+
+			# collect the action's metrics, if the client asked for them
+			if (request.get("metrics", False)) :
+				self.app_obj.metrics_hook = metrics.append
+
+			success, output = self.app_obj.executeCaptured(request["args"])
+		except Exception as e :
+			# report the error to the client and keep the daemon running
+			success, output = False, "=> ERROR: " + type(e).__name__ + ": " + str(e) + "\n"
+		finally :
+			os.chdir(cwd)
+			sys.stdin = stdin
+			self.app_obj.metrics_hook = None
+
+		reply = {"success" : success, "output" : output}
+		if (len(metrics) > 0) :
+			reply["metrics"] = metrics[-1].toDict()
+
+		return(reply)
@@ -0,0 +1,146 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, time
+
+class Durability :
+	"""Makes the directories and files written by an action durable, so that they survive a crash or a power failure.
+	In the "file" mode each file and its directory are synced to the disk as soon as they're written, while in the
+	"batch" mode everything is synced once, at the end of the action. The time spent syncing is measured."""
+
+	def __init__(self, mode, metrics = None) :
+		# instance variables
+		# the durability mode, which is "file" or "batch"
+		self.mode = mode
+		# the metrics where the time spent syncing is recorded, or None if it isn't being measured
+		self.metrics = metrics
+		# the paths of the files written in the "batch" mode, to be synced one at a time, as the keys of a dictionary
+		# NOTE: only used on systems that can't sync all the files at once (ex: Windows)
+		self.pending_paths = {}
+		# the number of files and directories synced
+		self.file_count = 0
+		self.directory_count = 0
+		# the wall time spent syncing, in seconds
+		self.seconds = 0.0
+		# controls access to the counters, when the files are synced by several threads
+		self.lock = None
+
+	# makes syncing files safe when they're synced by several threads
+	def enableLocking(self) :
+		if (self.lock == None) :
+			import threading
+			self.lock = threading.Lock()
+
+	# syncs the content of a file that is open for writing, in the "file" mode
+	# in the "batch" mode the file is only remembered, if the system can't sync all the files at once
+	# raises OSError if the file couldn't be synced
+	def syncFile(self, file_object) :
+		if (self.mode == "batch") :
+			if (not hasattr(os, "sync")) :
+				self.addPendingPath(file_object.name)
+			return
+
+		started = self.start()
+		file_object.flush()
+		os.fsync(file_object.fileno())
+		self.stop(started, 1, 0)
+
+	# syncs a directory, so that the entries created, renamed or removed inside it are durable, in the "file" mode
+	# NOTE: directories can't be synced on Windows, where their entries are made durable by the file system itself
+	# raises OSError if the directory couldn't be synced
+	def syncDirectory(self, path) :
+		if (self.mode != "file" or os.name == "nt") :
+			return
+
+		started = self.start()
+		fd = os.open(path, os.O_RDONLY)
+		try :
+			os.fsync(fd)
+		finally :
+			os.close(fd)
+		self.stop(started, 0, 1)
+
+	# syncs the directory with a file or directory, in the "file" mode
+	# raises OSError if the directory couldn't be synced
+	def syncParent(self, path) :
+		if (self.mode == "file") :
+			self.syncDirectory(os.path.dirname(path.rstrip("\\")) or ".")
+
+	# syncs everything written by the action so far, in the "batch" mode
+	# raises OSError if the files couldn't be synced
+	def finish(self) :
+		if (self.mode != "batch") :
+			return
+
+		started = self.start()
+		if (hasattr(os, "sync")) :
+			# a single call syncs all the file systems
+			os.sync()
+		else :
+			for path in self.pending_paths :
+				try :
+					fd = os.open(path, os.O_RDWR)
+				except FileNotFoundError as e :
+					# the file was removed in the meantime (ex: by a rollback)
+					continue
+
+				try :
+					os.fsync(fd)
+				finally :
+					os.close(fd)
+
+		self.pending_paths = {}
+		self.stop(started, 0, 0)
+
+	# returns the current clocks, to be given to stop() once the sync is over
+	def start(self) :
+		if (self.metrics != None) :
+			return(self.metrics.start())
+
+		return((time.perf_counter(),))
+
+	# adds the time spent syncing since start() was called, and the number of files and directories synced, to the totals
+	def stop(self, started, file_count, directory_count) :
+		if (self.metrics != None) :
+			seconds = self.metrics.stop("sync", started)
+		else :
+			seconds = time.perf_counter() - started[0]
+
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			self.seconds += seconds
+			self.file_count += file_count
+			self.directory_count += directory_count
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# remembers the path of a file to be synced at the end of the action
+	def addPendingPath(self, path) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			self.pending_paths[path] = None
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# returns the feedback message with the time spent syncing
+	def report(self) :
+		if (self.mode == "batch") :
+			return("=> Durability: Everything synced to the disk at the end, in " + ("%.2f" % (self.seconds * 1000)) + " ms.")
+
+		return("=> Durability: " + str(self.file_count) + " file(s) and " + str(self.directory_count) + " directories synced to the disk, in " + ("%.2f" % (self.seconds * 1000)) + " ms.")
@@ -0,0 +1,229 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os
+
+class Journal :
+	"""Records the directories and files created by an action, in order, so that exactly those can be removed if it fails.
+	The entries can also be written to a file as they're recorded, to undo or resume the action after a crash."""
+
+	def __init__(self, journal_path = None, command = None, cwd = None, durability = None, args = None, options = None) :
+		# instance variables
+		# the entries recorded, in the order they were created
+		# each entry is a list with its type ("dir" or "file") and its path
+		self.entries = []
+		# path to the file where the entries are written, or None if they're only kept in memory
+		self.journal_path = journal_path
+		# the command line arguments, without the path to the program, of the action being recorded
+		self.command = command
+		# the arguments and options of the action, as they were processed, or None if only its command line is known
+		# NOTE: they're used to execute the action again exactly as it was, even if it wasn't given as a command line (ex: by the Library class)
+		self.args = args
+		self.options = options
+		# the directory the action was executed from
+		self.cwd = cwd
+		# the journal file, while it's being written
+		self.file_object = None
+		# syncs the journal file to the disk as it's written, or None if it isn't synced
+		self.durability = durability
+		# controls access to the entries, when they're recorded by several threads
+		self.lock = None
+
+	# reads a journal file written by an action that didn't finish
+	# returns a Journal object with its entries or None if the file couldn't be read
+	@classmethod
+	def load(cls, journal_path) :
+		import json
+
+		try :
+			file_object = open(journal_path, "r", encoding = "utf-8")
+			lines = file_object.read().splitlines()
+			file_object.close()
+		except OSError as e :
+			return(None)
+
+		# the 1st line has the action that was being recorded
+		try :
+			header = json.loads(lines[0])
+			journal_obj = cls(journal_path, list(header["command"]), header.get("cwd", None), None, header.get("args", None), header.get("options", None))
+		except (IndexError, ValueError, TypeError, KeyError) as e :
+			return(None)
+
+		# each of the other lines has an entry
+		for line in lines[1:] :
+			try :
+				entry = json.loads(line)
+			except ValueError as e :
+				# NOTE: if the program stopped while writing an entry, the last line can be incomplete
+				break
+
+			if (isinstance(entry, list) and len(entry) == 2 and entry[0] in ("dir", "file")) :
+				journal_obj.entries.append(entry)
+
+		return(journal_obj)
+
+	# creates the journal file and writes the action being recorded to it
+	# returns True if successful or if the entries are only kept in memory, False otherwise
+	def open(self) :
+		if (self.journal_path == None) :
+			return(True)
+
+		import json
+
+		try :
+			self.file_object = open(self.journal_path, "w", encoding = "utf-8")
+			self.file_object.write(self.header())
+			self.file_object.flush()
+
+			# make the journal file durable, if requested
+			if (self.durability != None) :
+				self.durability.syncFile(self.file_object)
+				self.durability.syncParent(self.journal_path)
+		except OSError as e :
+			self.file_object = None
+			return(False)
+
+		return(True)
+
+	# returns the 1st line of the journal file, with the action being recorded
+	def header(self) :
+		import json
+
+		return(json.dumps({"command" : self.command, "cwd" : self.cwd, "args" : self.args, "options" : self.options}) + "\n")
+
+	# makes recording entries safe when they're recorded by several threads
+	def enableLocking(self) :
+		if (self.lock == None) :
+			import threading
+			self.lock = threading.Lock()
+
+	# records a directory or a file that was created
+	# raises OSError if the entry couldn't be written to the journal file
+	def record(self, entry_type, path) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			self.entries.append([entry_type, path])
+
+			# write the entry right away, so it isn't lost if the program stops
+			if (self.file_object != None) :
+				import json
+				self.file_object.write(json.dumps([entry_type, path]) + "\n")
+				self.file_object.flush()
+
+				# make the entry durable, if requested
+				if (self.durability != None) :
+					self.durability.syncFile(self.file_object)
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# changes the entries inside a directory that was moved (ex: a project's staging directory) to its new path,
+	# including the directory itself, and rewrites the journal file with them
+	# old_path and new_path end with a "\\"
+	# raises OSError if the journal file couldn't be rewritten
+	# NOTE: the new journal file replaces the old one in one step, so one of them is always complete
+	# NOTE: the entries are changed even if the journal file couldn't be rewritten, so that rollback() still finds them
+	def rebase(self, old_path, new_path) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			for entry in self.entries :
+				if (entry[1] == old_path.rstrip("\\")) :
+					entry[1] = new_path.rstrip("\\")
+				elif (entry[1].startswith(old_path)) :
+					entry[1] = new_path + entry[1][len(old_path):]
+
+			if (self.file_object != None) :
+				import json
+
+				self.file_object.close()
+				self.file_object = None
+
+				# write the new journal file next to the old one and then replace it
+				temp_path = self.journal_path + ".tmp"
+				file_object = open(temp_path, "w", encoding = "utf-8")
+				try :
+					file_object.write(self.header())
+					for entry in self.entries :
+						file_object.write(json.dumps(entry) + "\n")
+					file_object.flush()
+
+					if (self.durability != None) :
+						self.durability.syncFile(file_object)
+				finally :
+					file_object.close()
+				os.replace(temp_path, self.journal_path)
+
+				if (self.durability != None) :
+					self.durability.syncParent(self.journal_path)
+
+				# the entries recorded from now on are added to the new journal file
+				self.file_object = open(self.journal_path, "a", encoding = "utf-8")
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# forgets all the entries, since the action was successful and nothing needs to be undone
+	def commit(self) :
+		self.entries = []
+
+	# removes the directories and files recorded, in the reverse order they were created
+	# entries that no longer exist are ignored and the ones that couldn't be removed are kept
+	# returns True if all the entries were removed, False otherwise
+	def rollback(self) :
+		remaining = []
+
+		for entry in reversed(self.entries) :
+			try :
+				if (entry[0] == "file") :
+					os.remove(entry[1])
+				else :
+					# NOTE: directories with anything not created by the action aren't removed
+					os.rmdir(entry[1])
+			except FileNotFoundError as e :
+				pass
+			except OSError as e :
+				remaining.append(entry)
+
+		remaining.reverse()
+		self.entries = remaining
+
+		return(len(remaining) == 0)
+
+	# closes the journal file, which is deleted if there is nothing left to undo
+	# otherwise it's rewritten with the remaining entries, so that they can be undone later
+	def close(self) :
+		if (self.journal_path == None) :
+			return
+
+		if (self.file_object != None) :
+			self.file_object.close()
+			self.file_object = None
+
+		try :
+			if (len(self.entries) == 0) :
+				os.remove(self.journal_path)
+			elif (self.open()) :
+				import json
+				for entry in self.entries :
+					self.file_object.write(json.dumps(entry) + "\n")
+
+				if (self.durability != None) :
+					self.durability.syncFile(self.file_object)
+				self.file_object.close()
+				self.file_object = None
+		except OSError as e :
+			pass
@@ -0,0 +1,98 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+class KeywordScope :
+	"""A layer of keywords on top of a parent scope (ex: a file's keywords on top of its directory's keywords).
+	Creating a layer doesn't copy the parent's keywords: a keyword is searched in each layer, in order, when it's
+	requested, so the cost of a file's scope only depends on the keywords the file uses."""
+
+	# keywords is the dictionary with this layer's keywords
+	# parent is the scope searched for the keywords not in this layer, either a KeywordScope, a dictionary
+	# (ex: ComputedKeywords) or None
+	def __init__(self, keywords, parent = None) :
+		# instance variables
+		# this layer's keywords
+		self.keywords = keywords
+		# the scope searched for the keywords not in this layer
+		self.parent = parent
+		# the dictionaries of all the layers, searched in order, from this one to the last parent
+		# NOTE: built once, since the layers of a scope never change
+		if (isinstance(parent, KeywordScope)) :
+			self.layers = [keywords] + parent.layers
+		else :
+			self.layers = [keywords] if (parent == None) else [keywords, parent]
+
+	# returns the value of a keyword, searching all the layers
+	# raises KeyError if the keyword isn't in any of the layers
+	def __getitem__(self, keyword) :
+		for layer in self.layers :
+			if (keyword in layer) :
+				return(layer[keyword])
+
+		raise KeyError(keyword)
+
+	# sets the value of a keyword in this layer, without changing the parent scope
+	def __setitem__(self, keyword, value) :
+		self.keywords[keyword] = value
+
+	# returns True if the keyword is in any of the layers
+	def __contains__(self, keyword) :
+		for layer in self.layers :
+			if (keyword in layer) :
+				return(True)
+
+		return(False)
+
+	# returns the value of a keyword, searching all the layers, or default if it isn't in any of them
+	# NOTE: this is how the templates read the keywords, so a scope can be rendered as it is
+	def get(self, keyword, default = None) :
+		for layer in self.layers :
+			if (keyword in layer) :
+				return(layer[keyword])
+
+		return(default)
+
+	# returns a dictionary with the values of the keywords, and of the keywords used by those values,
+	# so that a template using these keywords can be rendered with a plain dictionary
+	# NOTE: keywords not in any of the layers are left out
+	def resolve(self, keywords) :
+		layers = self.layers
+
+		resolved = {}
+		nested = []
+		for keyword in keywords :
+			for layer in layers :
+				if (keyword in layer) :
+					value = layer[keyword]
+					resolved[keyword] = value
+					if (isinstance(value, str) and "|!" in value) :
+						nested.append(value)
+					break
+
+		# add the keywords used by the values with placeholders of their own, and by their values, and so on
+		while (len(nested) > 0) :
+			from classes import Template
+
+			for keyword in Template.Template.compile(nested.pop()).getKeywords() :
+				if (keyword in resolved) :
+					continue
+
+				for layer in layers :
+					if (keyword in layer) :
+						value = layer[keyword]
+						resolved[keyword] = value
+						if (isinstance(value, str) and "|!" in value) :
+							nested.append(value)
+						break
+
+		return(resolved)
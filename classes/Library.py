@@ -0,0 +1,171 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os
+from classes import ActionError, Application, CLI, Pack, Result
+
+class Library :
+	"""Executes the program's actions from other Python programs, in the same process.
+	The arguments are given to each method, instead of being read from the command line, and are used as they are, without
+	being split or expanded (ex: a name with a comma creates a single file). Each method returns a Result
+	with what the action created and the feedback messages it would have printed, or raises an ActionError if it failed.
+	The compiled JSON files are opened once and used by all the actions, so that each action only costs its rendering and writing.
+	NOTE: each object executes one action at a time"""
+
+	def __init__(self, json_path = None, pack = None) :
+		# by default, the JSON files are the ones used by the command line
+		if (json_path == None) :
+			json_path = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "data")
+
+		# instance variables
+		# executes the actions, without reading the command line
+		self.app_obj = Application.Application(json_path, False, pack)
+
+		# open the compiled version of the JSON files, building it if needed, unless it was provided
+		if (self.app_obj.pack == None) :
+			self.app_obj.pack = Pack.Pack.openData(self.app_obj.json_path)
+
+		# the compiled version of the JSON files, which can be given to other Library objects
+		self.pack = self.app_obj.pack
+
+	# creates a new project, with the provided name and project type (ex: "website:php"), in a location or a list of locations
+	# options are the command line options, with _ instead of - (ex: dedup = "hardlink", durability = "batch")
+	# returns a Result with the paths of the projects' directories created
+	# raises ArgumentError, TypeNotFoundError or ActionError
+	def createProject(self, location, name, project_type, **options) :
+		locations = [location] if (isinstance(location, str)) else list(location)
+		for item in locations :
+			self.checkArgument("location", item)
+
+		if (len(locations) == 0) :
+			raise ActionError.ArgumentError("At least one location must be given.")
+
+		self.checkArgument("name", name)
+		self.checkType("project", project_type)
+
+		# the 1st location is the action's argument and the others are the option --location
+		extra_locations = options.get("location", None) or []
+		options["location"] = locations[1:] + ([extra_locations] if (isinstance(extra_locations, str)) else list(extra_locations))
+		cli_obj = self.buildCLI("project", [locations[0], name, project_type], options)
+		cli_obj.storeProjectArgs(cli_obj.normalizeLocations(locations[:1] + list(cli_obj.options["location"])), name, project_type)
+
+		return(self.execute(cli_obj))
+
+	# creates new files, with the provided name or list of names and file type (ex: "python:class"), in a location
+	# each name is used as it is, without being split or expanded (ex: "Model{1..200}" creates a single file)
+	# flags are the file action's flags, without the - (ex: "fo")
+	# options are the command line options, with _ instead of - (ex: durability = "file")
+	# returns a Result with the paths of the files created
+	# raises ArgumentError, TypeNotFoundError or ActionError
+	def createFile(self, location, names, file_type, flags = "", **options) :
+		names = [names] if (isinstance(names, str)) else list(names)
+		self.checkArgument("location", location)
+		for name in names :
+			self.checkArgument("name", name)
+
+		if (len(names) == 0) :
+			raise ActionError.ArgumentError("At least one name must be given.")
+
+		self.checkType("file", file_type)
+
+		args = [location, ",".join(names), file_type]
+		if (len(flags) > 0) :
+			args.append("-" + flags)
+
+		cli_obj = self.buildCLI("file", args, options)
+
+		# remove the repeated names, keeping the order, as the command line does
+		cli_obj.storeFileArgs(cli_obj.normalizePath(location), list(dict.fromkeys(names)), file_type, list(flags))
+
+		return(self.execute(cli_obj))
+
+	# returns a list with the project types ("project") or file types ("file") defined in the JSON files,
+	# as they're given to the other methods (ex: "python:class"), in the order they're listed by the help action
+	# raises ArgumentError if kind isn't valid
+	def listTypes(self, kind = "project") :
+		if (kind not in ("project", "file")) :
+			raise ActionError.ArgumentError("The kind of types \"" + kind + "\" isn't valid.")
+
+		self.pack.refresh()
+
+		# the project types are the 1st tier of the JSON file, while the file types are all its file templates
+		if (kind == "project") :
+			return(list(self.pack.getKeys(kind) or []))
+
+		return([colon_path for colon_path, node_kind in self.pack.getTypes(kind, kinds = (kind,), sort = False)])
+
+	# makes sure an argument is a string that isn't empty
+	# raises ArgumentError if it isn't
+	def checkArgument(self, kind, value) :
+		if (not isinstance(value, str) or len(value) == 0) :
+			raise ActionError.ArgumentError("The " + kind + " " + repr(value) + " isn't valid.")
+
+	# makes sure a project or file type is defined in its JSON file
+	# raises TypeNotFoundError if it isn't
+	def checkType(self, kind, type_name) :
+		self.pack.refresh()
+
+		keys = [key.lower() for key in type_name.split(":")]
+		if (self.pack.getKind(kind, keys) != kind) :
+			raise ActionError.TypeNotFoundError("The " + kind + " type \"" + type_name + "\" isn't defined in \"" + kind + ".json\".")
+
+	# builds the CLI object of an action, with its options converted to the expected data type
+	# args are the action's arguments, as they would be given in the command line, which only describe the action (ex: in its metrics)
+	# raises ArgumentError if an option isn't valid
+	def buildCLI(self, action, args, options) :
+		cli_obj = CLI.CLI.fromArgs(action, None, None, [action] + args)
+		for name in options :
+			option = name.replace("_", "-")
+			if (option not in cli_obj.valid_options) :
+				raise ActionError.ArgumentError("The option \"" + name + "\" isn't valid.")
+
+			value = options[name]
+			if (value == None or value is False) :
+				# the option's default value is used
+				continue
+
+			try :
+				cli_obj.options[option] = cli_obj.convertValue(option, value)
+			except ValueError as e :
+				raise ActionError.ArgumentError("The value " + repr(value) + " isn't valid for the option \"" + name + "\".") from None
+
+			# describe the option as it would be given in the command line
+			value = cli_obj.options[option]
+			if (value is True) :
+				cli_obj.option_args.append("--" + option)
+			elif (option in cli_obj.repeatable_options) :
+				cli_obj.option_args.extend("--" + option + "=" + str(item) for item in value)
+			elif (isinstance(value, tuple)) :
+				cli_obj.option_args.append("--" + option + "=" + ",".join(value))
+			else :
+				cli_obj.option_args.append("--" + option + "=" + str(value))
+
+		return(cli_obj)
+
+	# executes an action, given its CLI object, and returns its Result
+	# raises ActionError if the action failed, with all its error messages and with the unexpected exception that
+	# made it fail, if any, as its cause
+	def execute(self, cli_obj) :
+		# execute the action, keeping its metrics, with the number of files and bytes written
+		metrics = []
+		self.app_obj.metrics_hook = metrics.append
+		try :
+			success, output = self.app_obj.executeCaptured(cli_obj.argv[1:], cli_obj)
+		finally :
+			self.app_obj.metrics_hook = None
+
+		result = Result.Result(cli_obj.action, success, self.app_obj.created_paths, output, metrics[-1] if (len(metrics) > 0) else None, self.app_obj.errors)
+		if (not success) :
+			raise ActionError.ActionError("\n".join(result.errors) or "The action failed.", result) from self.app_obj.exception
+
+		return(result)
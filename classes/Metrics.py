@@ -0,0 +1,143 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import time
+
+class Metrics :
+	"""Records the wall and CPU time spent in each phase of an action, counts what it processed
+	and keeps the latency of each file rendered and written."""
+
+	# the counters reported, in order
+	counter_names = ("files", "directories", "bytes", "placeholders", "copyright_blocks", "cache_hits", "cache_misses")
+
+	# the percentiles reported for each latency
+	percentiles = (50, 90, 99)
+
+	def __init__(self, command = None) :
+		# instance variables
+		# the command line arguments, without the path to the program, of the action being measured
+		self.command = command
+		# stores the time spent in each phase, indexed by name, as a list [calls, wall time, CPU time] in seconds
+		# NOTE: phases can be nested (ex: replaceKeyWords is also called by buildCopyrightString)
+		self.phases = {}
+		# stores each counter, indexed by name
+		self.counters = dict.fromkeys(self.counter_names, 0)
+		# stores the individual latencies, in seconds, indexed by name (ex: "render", "write")
+		self.latencies = {}
+		# the metrics of the actions executed by this one (ex: the actions in a batch)
+		self.children = []
+		# controls access to the metrics, when they're recorded by several threads
+		self.lock = None
+
+	# makes recording metrics safe when they're recorded by several threads
+	def enableLocking(self) :
+		if (self.lock == None) :
+			import threading
+			self.lock = threading.Lock()
+
+	# returns the current clocks, to be given to stop() once the phase is over
+	def start(self) :
+		return((time.perf_counter(), time.thread_time(), time.process_time()))
+
+	# records the time spent in a phase since start() was called
+	# the CPU time is the calling thread's, unless whole_process is True
+	# returns the wall time spent
+	def stop(self, phase, started, whole_process = False) :
+		wall_time = time.perf_counter() - started[0]
+		if (whole_process) :
+			cpu_time = time.process_time() - started[2]
+		else :
+			cpu_time = time.thread_time() - started[1]
+
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			totals = self.phases.setdefault(phase, [0, 0.0, 0.0])
+			totals[0] += 1
+			totals[1] += wall_time
+			totals[2] += cpu_time
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+		return(wall_time)
+
+	# adds to a counter
+	def count(self, name, value = 1) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			self.counters[name] = self.counters.get(name, 0) + value
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# stores one latency, in seconds
+	def addLatency(self, name, seconds) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			self.latencies.setdefault(name, []).append(seconds)
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# returns the number, mean, percentiles and maximum of a latency, in seconds
+	def summarizeLatency(self, name) :
+		values = sorted(self.latencies.get(name, []))
+		if (len(values) == 0) :
+			return({"count" : 0})
+
+		summary = {"count" : len(values), "mean" : sum(values) / len(values)}
+		for percentile in self.percentiles :
+			# NOTE: nearest-rank percentile
+			summary["p" + str(percentile)] = values[max(0, -(-percentile * len(values) // 100) - 1)]
+		summary["max"] = values[-1]
+
+		return(summary)
+
+	# returns all the metrics as a dictionary, ready to be converted to JSON
+	def toDict(self) :
+		result = {
+			"command" : self.command,
+			"phases" : {name : {"calls" : totals[0], "wall" : totals[1], "cpu" : totals[2]} for name, totals in self.phases.items()},
+			"counters" : dict(self.counters),
+			"latencies" : {name : self.summarizeLatency(name) for name in sorted(self.latencies)}
+		}
+
+		if (len(self.children) > 0) :
+			result["actions"] = [child.toDict() for child in self.children]
+
+		return(result)
+
+	# returns all the metrics as a human readable table
+	def toTable(self) :
+		lines = ["=> Timings:"]
+
+		# the time spent in each phase
+		lines.append("\t%-22s %8s %12s %12s" % ("phase", "calls", "wall (ms)", "cpu (ms)"))
+		for name, totals in self.phases.items() :
+			lines.append("\t%-22s %8d %12.2f %12.2f" % (name, totals[0], totals[1] * 1000, totals[2] * 1000))
+
+		# the counters
+		lines.append("\t" + ", ".join(name.replace("_", " ") + ": " + str(self.counters[name]) for name in self.counters))
+
+		# the latencies of each file
+		for name in sorted(self.latencies) :
+			summary = self.summarizeLatency(name)
+			lines.append("\t" + name + " latency (ms): " + ", ".join(key + " " + ("%.3f" % (summary[key] * 1000)) for key in summary if (key != "count")) + " (" + str(summary["count"]) + " files)")
+
+		return("\n".join(lines))
@@ -0,0 +1,427 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, sys, struct, marshal, mmap
+
+class Pack :
+	"""Compiled version of the JSON files in the data directory, read through a memory-mapped file.
+
+	The file starts with a header, followed by one entry for each JSON file with its name, size, modification time,
+	hash and the position of its indexes. The node index maps the colon-path of every node in that JSON file
+	(ex: "php:class") to the position of that node's record.
+	Each record stores a node without its children, which are referenced by their position, so that only the requested
+	subtree needs to be decoded. The records for strings also store the string already split into its segments.
+	The type index has the kind of every node (ex: "file" for a file template) and the colon-paths sorted, so that
+	types can be validated and listed, or searched by prefix, without decoding any node or the node index."""
+
+	# the header's format: magic number, version of this format, python version and number of JSON files
+	header_struct = struct.Struct("<4sH8sI")
+	# the format of each JSON file's entry: name, modification time, size, hash, node index position and size
+	# and type index position and size
+	entry_struct = struct.Struct("<32sqq20sQQQQ")
+	# the magic number and version of this format
+	magic = b"PMPK"
+	version = 3
+	# the python version, since the records are encoded with marshal
+	python_tag = ("%d.%d" % sys.version_info[:2]).encode("ascii")
+
+	# the names of the program's JSON files, without the extension
+	json_names = ("file", "help", "keywords", "project")
+
+	# the kinds of the nodes in each of the program's JSON files, used to validate and list the types, as a tuple with
+	# the kind of the objects without objects inside them, the kind of the other objects and the kind of the strings
+	# any object in project.json can be created as a project, while only the objects in file.json without objects
+	# inside them are file templates and only the strings in help.json are help texts
+	json_kinds = {"project" : ("project", "project", None), "file" : ("file", "group", None), "help" : ("topic", "topic", "help")}
+
+	def __init__(self, json_path, names, pack_path, node_kinds = None) :
+		# instance variables
+		# path to the directory with the JSON files (ending with a separator)
+		self.json_path = json_path
+		# the names of the JSON files to be compiled, without the extension
+		self.names = names
+		# the kinds given to the nodes of each JSON file, indexed by its name, as a tuple with the kind of
+		# the objects without objects inside them, the kind of the other objects and the kind of the strings
+		# NOTE: nodes of other types, or from JSON files that aren't listed, don't have a kind
+		self.node_kinds = node_kinds or {}
+		# path to the compiled file
+		self.pack_path = pack_path
+		# the content of the compiled file, either memory-mapped or in memory if it couldn't be written
+		self.data = None
+		# stores each JSON file's entry in the header, indexed by name, as a list
+		# [modification time, size, hash, node index position, node index size, type index position, type index size]
+		self.entries = {}
+		# stores each JSON file's decoded node index, indexed by name
+		# NOTE: an index is only decoded when a node from that JSON file is requested
+		self.indexes = {}
+		# stores each JSON file's decoded type index, indexed by name, as a tuple with the kind of each node,
+		# indexed by its colon-path, and the sorted colon-paths
+		# NOTE: an index is only decoded when a type from that JSON file is requested
+		self.type_indexes = {}
+		# function called with (string, segments, overlapping) for each string decoded
+		# used to reuse the string's segments, instead of compiling the string again
+		self.template_loader = None
+
+		# open the compiled file, building it if needed
+		self.refresh()
+
+	# returns the compiled version of the program's JSON files, in the provided data directory, building it if needed
+	# json_path must end with a separator
+	@classmethod
+	def openData(cls, json_path) :
+		return(cls(json_path, cls.json_names, json_path + "templates.pack", cls.json_kinds))
+
+	# makes sure the compiled file is up to date with the JSON files, rebuilding it if needed
+	# NOTE: only the files' modification time and size are checked, unless they changed, in which case the hash is checked
+	def refresh(self) :
+		# open the compiled file, if it isn't open yet
+		if (self.data == None) :
+			self.open()
+
+		# check each JSON file
+		stale = False
+		touched = []
+		for name in self.names :
+			stats = self.statJSON(name)
+			entry = self.entries.get(name, None)
+
+			if (stats == None or entry == None) :
+				# the JSON file was created or deleted since the compiled file was built
+				if (stats != None or entry != None) :
+					stale = True
+				continue
+
+			if (stats[0] == entry[0] and stats[1] == entry[1]) :
+				# the JSON file wasn't modified
+				continue
+
+			# the JSON file's modification time changed, so check if its content also changed
+			if (self.hashJSON(name) != entry[2]) :
+				stale = True
+			else :
+				touched.append((name, stats))
+
+		if (stale) :
+			self.build()
+		elif (len(touched) > 0) :
+			# only the modification times changed, so update them in the compiled file's header
+			self.updateEntries(touched)
+
+	# returns a tuple with the modification time and size of a JSON file, or None if it doesn't exist
+	def statJSON(self, name) :
+		try :
+			stats = os.stat(self.json_path + name + ".json")
+		except OSError as e :
+			return(None)
+
+		return((stats.st_mtime_ns, stats.st_size))
+
+	# returns the SHA-1 hash of a JSON file's content
+	def hashJSON(self, name) :
+		import hashlib
+
+		file_object = open(self.json_path + name + ".json", "rb")
+		file_hash = hashlib.sha1(file_object.read()).digest()
+		file_object.close()
+
+		return(file_hash)
+
+	# memory-maps the compiled file and reads its header
+	# if the file doesn't exist or isn't valid, no entries are read, so it will be rebuilt
+	def open(self) :
+		self.close()
+
+		try :
+			file_object = open(self.pack_path, "rb")
+			try :
+				self.data = mmap.mmap(file_object.fileno(), 0, access = mmap.ACCESS_READ)
+			finally :
+				file_object.close()
+		except (OSError, ValueError) as e :
+			# the file doesn't exist or is empty
+			self.data = b""
+			return
+
+		self.readHeader()
+
+	# reads the entries in the header of the compiled file
+	def readHeader(self) :
+		self.entries = {}
+		self.indexes = {}
+		self.type_indexes = {}
+
+		# make sure the compiled file is valid for this format and python version
+		if (len(self.data) < self.header_struct.size) :
+			return
+
+		magic, version, python_tag, count = self.header_struct.unpack_from(self.data, 0)
+		if (magic != self.magic or version != self.version or python_tag.rstrip(b"\0") != self.python_tag) :
+			return
+
+		# read each JSON file's entry
+		for i in range(count) :
+			entry = list(self.entry_struct.unpack_from(self.data, self.header_struct.size + i * self.entry_struct.size))
+			self.entries[entry[0].rstrip(b"\0").decode("utf-8")] = entry[1:]
+
+	# closes the compiled file
+	def close(self) :
+		if (isinstance(self.data, mmap.mmap)) :
+			self.data.close()
+
+		self.data = None
+
+	# builds the compiled file from the JSON files and opens it
+	def build(self) :
+		import hashlib, json
+		from classes import Template
+
+		# the records, starting right after the header
+		records = bytearray()
+		records_start = self.header_struct.size + len(self.names) * self.entry_struct.size
+
+		# builds the record for a node and its children, with the children's records first
+		# each node's position is added to index and its kind to kinds, by its colon-path
+		# NOTE: colon_path is None for nodes that can't be found by colon-path, since a key in their path has a colon
+		# returns a tuple with the node's record position and size
+		def addNode(node, colon_path, index, kinds, node_kinds) :
+			kind = None
+			if (isinstance(node, dict)) :
+				# the record has the name and position of each child
+				children = []
+				for key in node :
+					if (colon_path == None or ":" in key) :
+						child_path = None
+					elif (colon_path == "") :
+						child_path = key
+					else :
+						child_path = colon_path + ":" + key
+
+					children.append((key,) + addNode(node[key], child_path, index, kinds, node_kinds))
+				record = marshal.dumps(("d", children))
+
+				if (node_kinds != None) :
+					kind = node_kinds[1] if (any(isinstance(node[key], dict) for key in node)) else node_kinds[0]
+			elif (isinstance(node, str)) :
+				# the record has the string already split into its segments
+				template = Template.Template(node)
+				record = marshal.dumps(("s", node, template.segments, template.overlapping))
+
+				if (node_kinds != None) :
+					kind = node_kinds[2]
+			else :
+				record = marshal.dumps(("v", node))
+
+			position = (records_start + len(records), len(record))
+			records.extend(record)
+
+			if (colon_path != None) :
+				index[colon_path] = position
+
+				# NOTE: the top node is the JSON file itself, so it doesn't have a kind
+				if (kind != None and colon_path != "") :
+					kinds[colon_path] = kind
+
+			return(position)
+
+		# add each JSON file
+		entries = []
+		for name in self.names :
+			stats = self.statJSON(name)
+			if (stats == None) :
+				continue
+
+			# read and decode the JSON file
+			file_object = open(self.json_path + name + ".json", "rb")
+			json_bytes = file_object.read()
+			file_object.close()
+
+			index = {}
+			kinds = {}
+			addNode(json.loads(json_bytes.decode("utf-8")), "", index, kinds, self.node_kinds.get(name, None))
+
+			# add the indexes after the records
+			index_record = marshal.dumps(index)
+			type_record = marshal.dumps((kinds, sorted(kinds)))
+			entries.append((name.encode("utf-8"), stats[0], stats[1], hashlib.sha1(json_bytes).digest(), records_start + len(records), len(index_record), records_start + len(records) + len(index_record), len(type_record)))
+			records.extend(index_record)
+			records.extend(type_record)
+
+		# build the header
+		header = bytearray(self.header_struct.pack(self.magic, self.version, self.python_tag, len(entries)))
+		for entry in entries :
+			header.extend(self.entry_struct.pack(*entry))
+		# pad the header, in case some JSON files don't exist
+		header.extend(b"\0" * (records_start - len(header)))
+
+		pack_bytes = bytes(header + records)
+
+		# write the compiled file and replace the old one in a single step
+		self.close()
+		try :
+			temp_path = self.pack_path + "." + str(os.getpid()) + ".tmp"
+			file_object = open(temp_path, "wb")
+			file_object.write(pack_bytes)
+			file_object.close()
+			os.replace(temp_path, self.pack_path)
+		except OSError as e :
+			# the compiled file couldn't be written, so use it from memory
+			try :
+				os.remove(temp_path)
+			except OSError as e :
+				pass
+
+			self.data = pack_bytes
+			self.readHeader()
+			return
+
+		self.open()
+
+	# updates the modification time and size of some JSON files in the compiled file's header
+	# touched is a list of tuples (name, (modification time, size))
+	def updateEntries(self, touched) :
+		for name, stats in touched :
+			self.entries[name][0:2] = stats
+
+		# the header can only be updated if the compiled file was written
+		if (not isinstance(self.data, mmap.mmap)) :
+			return
+
+		self.close()
+		try :
+			file_object = open(self.pack_path, "r+b")
+			for i, name in enumerate(self.entries) :
+				entry = self.entries[name]
+				file_object.seek(self.header_struct.size + i * self.entry_struct.size)
+				file_object.write(self.entry_struct.pack(name.encode("utf-8"), *entry))
+			file_object.close()
+		except OSError as e :
+			pass
+
+		self.open()
+
+	# returns True if the JSON file with the provided name exists, False otherwise
+	def hasJSON(self, name) :
+		return(name in self.entries)
+
+	# returns the decoded node index of a JSON file
+	def getIndex(self, name) :
+		if (name not in self.indexes) :
+			entry = self.entries[name]
+			self.indexes[name] = marshal.loads(self.data[entry[3]:entry[3] + entry[4]])
+
+		return(self.indexes[name])
+
+	# returns the decoded type index of a JSON file
+	def getTypeIndex(self, name) :
+		if (name not in self.type_indexes) :
+			entry = self.entries[name]
+			self.type_indexes[name] = marshal.loads(self.data[entry[5]:entry[5] + entry[6]])
+
+		return(self.type_indexes[name])
+
+	# returns the decoded node of a JSON file, given the list of keys to reach it
+	# returns None if the JSON file or the node don't exist
+	def getNode(self, name, keys = ()) :
+		position = self.findNode(name, keys)
+		if (position == None) :
+			return(None)
+
+		return(self.decodeNode(position))
+
+	# returns the keys of a node of a JSON file, given the list of keys to reach it, without decoding its children
+	# returns None if the JSON file or the node don't exist, or if the node isn't an object
+	def getKeys(self, name, keys = ()) :
+		position = self.findNode(name, keys)
+		if (position == None) :
+			return(None)
+
+		record = self.readRecord(position)
+		if (record[0] != "d") :
+			return(None)
+
+		return([child[0] for child in record[1]])
+
+	# returns the kind of a node of a JSON file, given the list of keys to reach it
+	# returns None if the JSON file or the node don't exist, or if the node doesn't have a kind
+	def getKind(self, name, keys) :
+		if (name not in self.entries) :
+			return(None)
+
+		return(self.getTypeIndex(name)[0].get(":".join(keys), None))
+
+	# returns a list of tuples (colon-path, kind) with the nodes of a JSON file whose colon-path starts with prefix
+	# if kinds is provided, only the nodes of those kinds are returned
+	# the nodes are sorted by colon-path if sort is True, or else in the order they're in the JSON file, with children first
+	def getTypes(self, name, prefix = "", kinds = None, sort = True) :
+		if (name not in self.entries) :
+			return([])
+
+		type_index = self.getTypeIndex(name)
+		if (sort) :
+			# find the range of sorted colon-paths starting with prefix
+			import bisect
+			start = bisect.bisect_left(type_index[1], prefix)
+			end = bisect.bisect_left(type_index[1], prefix + "\U0010ffff")
+			paths = type_index[1][start:end]
+		else :
+			paths = [path for path in type_index[0] if (path.startswith(prefix))]
+
+		return([(path, type_index[0][path]) for path in paths if (kinds == None or type_index[0][path] in kinds)])
+
+	# returns a tuple with the position and size of a node's record, given the list of keys to reach it
+	# returns None if the JSON file or the node don't exist
+	def findNode(self, name, keys) :
+		if (name not in self.entries) :
+			return(None)
+
+		# look for the node in the index
+		index = self.getIndex(name)
+		position = index.get(":".join(keys), None)
+		if (position != None) :
+			return(position)
+
+		# the node isn't in the index, so walk from the top node
+		position = index[""]
+		for key in keys :
+			record = self.readRecord(position)
+			if (record[0] != "d") :
+				return(None)
+
+			position = None
+			for child in record[1] :
+				if (child[0] == key) :
+					position = child[1:]
+					break
+
+			if (position == None) :
+				return(None)
+
+		return(position)
+
+	# returns the decoded record at the provided position
+	def readRecord(self, position) :
+		return(marshal.loads(self.data[position[0]:position[0] + position[1]]))
+
+	# returns the decoded node, and all its children, whose record is at the provided position
+	def decodeNode(self, position) :
+		record = self.readRecord(position)
+
+		if (record[0] == "d") :
+			return({child[0] : self.decodeNode(child[1:]) for child in record[1]})
+
+		if (record[0] == "s") :
+			if (self.template_loader != None) :
+				self.template_loader(record[1], record[2], record[3])
+			return(record[1])
+
+		return(record[1])
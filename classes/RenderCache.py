@@ -0,0 +1,178 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, time
+
+class RenderCache :
+	"""Keeps the rendered content of files in a database, in the user's cache directory, so that scaffolds repeated
+	with the same input don't render their files again.
+	Each entry is indexed by a hash of what determines its content, such as the template's source and the values of
+	the keywords it uses, and the least recently used entries are removed once the cache grows larger than max_size.
+	NOTE: the cache is only an optimization, so if it can't be used for any reason the files are rendered as usual"""
+
+	# the maximum size, in bytes, of the content kept in the cache
+	max_size = 67108864
+
+	# changes whenever the content rendered from the same input changes, so that the entries of older versions aren't used
+	format_version = 1
+
+	def __init__(self, cache_path = None) :
+		# instance variables
+		# path to the cache's database
+		self.cache_path = self.defaultCachePath() if (cache_path == None) else cache_path
+		# the connection to the database, opened the 1st time it's needed, or None
+		self.connection = None
+		# True if the database couldn't be opened or used, in which case the cache isn't used anymore
+		self.failed = False
+		# the content of the entries added, to be written by flush(), indexed by their key
+		self.pending = {}
+		# the keys of the entries found, whose last use is updated by flush()
+		self.used = set()
+		# the metrics where the entries found and not found are counted, or None if they aren't being measured
+		self.metrics = None
+
+	# returns the default path for the cache's database, in the user's cache directory
+	# NOTE: can be changed with the PROJMAN_CACHE environment variable
+	@staticmethod
+	def defaultCachePath() :
+		cache_path = os.environ.get("PROJMAN_CACHE", "")
+		if (len(cache_path) == 0) :
+			if (os.name == "nt") :
+				base_path = os.environ.get("LOCALAPPDATA", "") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+			else :
+				base_path = os.environ.get("XDG_CACHE_HOME", "") or os.path.join(os.path.expanduser("~"), ".cache")
+			cache_path = os.path.join(base_path, "projman", "renders.db")
+
+		return(cache_path)
+
+	# returns the key of an entry, given a tuple with everything that determines its content
+	# returns None if the tuple can't be hashed (ex: it has values of unsupported types)
+	def buildKey(self, parts) :
+		import hashlib, marshal
+
+		try :
+			return(hashlib.sha256(marshal.dumps((self.format_version,) + parts)).digest())
+		except ValueError as e :
+			return(None)
+
+	# opens the database, creating it if needed
+	# returns True if successful, False otherwise
+	def open(self) :
+		if (self.connection != None) :
+			return(True)
+		if (self.failed) :
+			return(False)
+
+		# NOTE: some Python builds don't include sqlite3
+		try :
+			import sqlite3
+		except ImportError as e :
+			self.failed = True
+			return(False)
+
+		try :
+			if (len(os.path.dirname(self.cache_path)) > 0) :
+				os.makedirs(os.path.dirname(self.cache_path), exist_ok = True)
+
+			# NOTE: several processes can use the cache at the same time, so they wait a little for each other
+			self.connection = sqlite3.connect(self.cache_path, timeout = 1, check_same_thread = False)
+			self.connection.execute("PRAGMA journal_mode = WAL")
+			self.connection.execute("PRAGMA synchronous = NORMAL")
+			self.connection.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, content BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+			self.connection.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+		except (OSError, sqlite3.Error) as e :
+			self.disable()
+			return(False)
+
+		return(True)
+
+	# stops using the cache, after the database couldn't be opened or used
+	def disable(self) :
+		self.failed = True
+		self.pending = {}
+		self.used = set()
+
+		if (self.connection != None) :
+			try :
+				self.connection.close()
+			except Exception as e :
+				pass
+			self.connection = None
+
+	# returns the content of an entry, given its key, or None if it isn't in the cache
+	def get(self, key) :
+		if (key == None) :
+			return(None)
+
+		content = self.pending.get(key, None)
+		if (content == None and self.open()) :
+			import sqlite3
+
+			try :
+				row = self.connection.execute("SELECT content FROM entries WHERE key = ?", (key,)).fetchone()
+				if (row != None) :
+					content = bytes(row[0]).decode("utf-8", "surrogatepass")
+					self.used.add(key)
+			except (sqlite3.Error, UnicodeDecodeError) as e :
+				self.disable()
+
+		if (self.metrics != None) :
+			self.metrics.count("cache_hits" if (content != None) else "cache_misses")
+
+		return(content)
+
+	# adds an entry, given its key and content, which is written to the database by flush()
+	def put(self, key, content) :
+		if (key != None and not self.failed) :
+			self.pending[key] = content
+
+	# writes the entries added to the database and updates the last use of the entries found,
+	# removing the least recently used entries if the cache grew larger than max_size, all in a single transaction
+	def flush(self) :
+		if ((len(self.pending) == 0 and len(self.used) == 0) or not self.open()) :
+			return
+
+		import sqlite3
+
+		now = time.time()
+		try :
+			with self.connection :
+				self.connection.executemany("UPDATE entries SET used = ? WHERE key = ?", ((now, key) for key in self.used))
+
+				if (len(self.pending) > 0) :
+					entries = ((key, content.encode("utf-8", "surrogatepass")) for key, content in self.pending.items())
+					self.connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", ((key, data, len(data), now) for key, data in entries))
+					self.evict()
+		except sqlite3.Error as e :
+			self.disable()
+			return
+
+		self.pending = {}
+		self.used = set()
+
+	# removes the least recently used entries until the content kept is no larger than max_size
+	# NOTE: called by flush(), inside its transaction
+	def evict(self) :
+		total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+		if (total_size <= self.max_size) :
+			return
+
+		keys = []
+		for key, size in self.connection.execute("SELECT key, size FROM entries ORDER BY used") :
+			if (total_size <= self.max_size) :
+				break
+
+			keys.append((key,))
+			total_size -= size
+
+		self.connection.executemany("DELETE FROM entries WHERE key = ?", keys)
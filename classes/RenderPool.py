@@ -0,0 +1,60 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+class RenderPool :
+	"""Renders the content of files in a pool of processes, so that large structures use more than one core.
+	Each file is sent with the values of the keywords it uses, so the processes don't need any other keywords."""
+
+	# the number of chunks each process' share of the files is split into, so that the processes stay busy
+	# even if some files take longer to render than others
+	chunks_per_process = 4
+
+	def __init__(self, process_count) :
+		# instance variables
+		# the number of processes in the pool
+		self.process_count = process_count
+
+	# renders a chunk of files in one of the pool's processes
+	# each file is a tuple with its content and the values of the keywords it uses
+	# returns a list with the rendered content of the files, in the same order
+	@staticmethod
+	def renderChunk(files) :
+		from classes import Template
+
+		rendered = []
+		for file_content, replacements in files :
+			rendered.append(Template.Template.compile(file_content).render(replacements))
+
+		return(rendered)
+
+	# renders a list of files, each one a tuple with its content and the values of the keywords it uses
+	# returns a list with the rendered content of the files, in the same order, or None if the pool couldn't be used
+	def render(self, files) :
+		# NOTE: only imported when needed, since the files are usually rendered by the main process
+		import concurrent.futures, concurrent.futures.process
+
+		# split the files into chunks, keeping their order
+		chunk_size = max(1, -(-len(files) // (self.process_count * self.chunks_per_process)))
+		chunks = [files[pos:pos + chunk_size] for pos in range(0, len(files), chunk_size)]
+
+		try :
+			with concurrent.futures.ProcessPoolExecutor(self.process_count) as executor :
+				# NOTE: the results are returned in the same order as the chunks, regardless of which finishes first
+				rendered = []
+				for chunk in executor.map(RenderPool.renderChunk, chunks) :
+					rendered.extend(chunk)
+		except (OSError, concurrent.futures.process.BrokenProcessPool) as e :
+			# the processes couldn't be started or one of them died
+			return(None)
+
+		return(rendered)
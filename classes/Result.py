@@ -0,0 +1,54 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os
+
+class Result :
+	"""The outcome of an action executed by the Library class: what it created and the feedback messages it would have printed."""
+
+	def __init__(self, action, success, paths, output, metrics = None, errors = None) :
+		# instance variables
+		# the action that was executed (ex: "project")
+		self.action = action
+		# True if the action was successful, False otherwise
+		self.success = success
+		# the paths of the projects' directories, files and archives created, using the system's separator
+		self.paths = [path.rstrip("\\").replace("\\", os.sep) for path in paths]
+		# the feedback messages, one per line
+		self.messages = [line for line in output.splitlines() if (len(line) > 0)]
+		# the error messages, without their prefix, as they were reported by the action
+		self.errors = list(errors or [])
+		# the warning messages, without their prefix
+		self.warnings = [line[len("=> Warning: "):] for line in self.messages if (line.startswith("=> Warning: "))]
+		# the metrics of the action, or None if it wasn't measured
+		self.metrics = metrics
+
+		# the number of files and directories created and of bytes written
+		counters = metrics.counters if (metrics != None) else {}
+		self.files = counters.get("files", 0)
+		self.directories = counters.get("directories", 0)
+		self.bytes = counters.get("bytes", 0)
+
+	# returns a dictionary with the result, ready to be encoded as JSON
+	def toDict(self) :
+		return({
+			"action" : self.action,
+			"success" : self.success,
+			"paths" : self.paths,
+			"files" : self.files,
+			"directories" : self.directories,
+			"bytes" : self.bytes,
+			"errors" : self.errors,
+			"warnings" : self.warnings,
+			"messages" : self.messages
+		})
@@ -0,0 +1,382 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+class Template :
+	"""Compiled version of a string with |!keyword{multiplier}[case]!| placeholders."""
+
+	# the pattern to identify the placeholders
+	# NOTE: only compiled when a string is compiled, since templates read from the compiled data files don't need it
+	re_pattern = None
+
+	# the map between case tag in the placeholders and the String class function to use
+	str_func = {"lc" : "lower", "uc" : "upper", "t" : "title"}
+
+	# stores the compiled templates, indexed by their source string, from the least to the most recently used
+	cache = {}
+	# the total length, in characters, of the source strings of the templates in the cache
+	cache_length = 0
+	# the maximum total length of the source strings of the templates in the cache
+	# NOTE: the least recently used templates are removed first, so that a long running process (ex: the daemon)
+	#		doesn't keep the templates of every version of the JSON files it loaded
+	cache_limit = 33554432
+
+	# the approximate size, in characters, of the chunks yielded by iterRender()
+	chunk_size = 65536
+
+	def __init__(self, string) :
+		# instance variables
+		# the template's source string
+		self.string = string
+		# list with the template's segments, in order
+		# literal text is stored as a string and placeholders as a tuple (keyword, multiplier, case function)
+		self.segments = []
+		# True if any placeholder's keyword has a "|", in which case placeholders could overlap each other
+		self.overlapping = False
+		# the keywords used by the placeholders, built the 1st time they're needed
+		self.keywords = None
+		# True if the literal text has stray delimiters, built the 1st time it's needed
+		self.loose = None
+		# True if any literal text starts or ends with half of a delimiter, built the 1st time it's needed
+		self.edges = None
+
+		# split the string into literals and placeholders in a single pass
+		last_pos = 0
+		for re_match in self.getPattern().finditer(string) :
+			# store any literal text before this placeholder
+			if (re_match.start() > last_pos) :
+				self.segments.append(string[last_pos:re_match.start()])
+
+			self.segments.append(self.buildPlaceholder(re_match.groups()))
+			if ("|" in re_match.group(1)) :
+				self.overlapping = True
+
+			last_pos = re_match.end()
+
+		# store any literal text after the last placeholder
+		if (last_pos < len(string)) :
+			self.segments.append(string[last_pos:])
+
+	# returns the compiled template for the provided string
+	# NOTE: each distinct string is only compiled once
+	@classmethod
+	def compile(cls, string) :
+		# NOTE: a template found in the cache is moved to its end, as the most recently used
+		template = cls.cache.pop(string, None)
+		if (template == None) :
+			template = cls(string)
+			cls.cache_length += len(string)
+			cls.cache[string] = template
+			cls.trimCache()
+		else :
+			cls.cache[string] = template
+
+		return(template)
+
+	# adds a template to the cache, given its source string and the segments it was already split into
+	# NOTE: used to reuse templates compiled by a previous run of the program
+	@classmethod
+	def preload(cls, string, segments, overlapping) :
+		if (string not in cls.cache) :
+			template = cls.__new__(cls)
+			template.string = string
+			template.segments = segments
+			template.overlapping = overlapping
+			template.keywords = None
+			template.loose = None
+			template.edges = None
+			cls.cache_length += len(string)
+			cls.cache[string] = template
+			cls.trimCache()
+
+	# removes the least recently used templates from the cache, until their source strings fit in its limit
+	# NOTE: the most recently used template is always kept, whatever its length
+	@classmethod
+	def trimCache(cls) :
+		while (cls.cache_length > cls.cache_limit and len(cls.cache) > 1) :
+			string = next(iter(cls.cache))
+			del cls.cache[string]
+			cls.cache_length -= len(string)
+
+	# removes all the templates from the cache
+	@classmethod
+	def clearCache(cls) :
+		cls.cache.clear()
+		cls.cache_length = 0
+
+	# returns a tuple with the keywords used by the placeholders, in order and without repetitions
+	def getKeywords(self) :
+		if (self.keywords == None) :
+			self.keywords = tuple(dict.fromkeys(segment[0] for segment in self.segments if (not isinstance(segment, str))))
+
+		return(self.keywords)
+
+	# returns True if the final string only depends on the values of the keywords in getKeywords(), given those values,
+	# in the same order, or False if rendering could fall back to renderIteratively(), which replaces the placeholders
+	# formed by the replacement strings and the surrounding text, whose keywords aren't known in advance
+	# NOTE: only templates that are self contained can be rendered with the values of their keywords alone,
+	#       and their final string kept for other files with the same values
+	def isSelfContained(self, values) :
+		if (self.overlapping) :
+			return(False)
+
+		# check the literal text, once
+		if (self.loose == None) :
+			literals = [segment for segment in self.segments if (isinstance(segment, str))]
+			self.loose = any(("|!" in segment or "!|" in segment) for segment in literals)
+			self.edges = any((segment[0] in "|!" or segment[-1] in "|!") for segment in literals)
+
+		if (self.loose) :
+			return(False)
+
+		# a replacement string with a delimiter, or placeholders of its own, always leaves it over
+		# NOTE: the case enforcers never add or remove a "|" or a "!", so the replacement strings can be checked as they are
+		check_edges = self.edges
+		for value in values :
+			if (isinstance(value, str) and len(value) > 0) :
+				if ("|!" in value or "!|" in value) :
+					return(False)
+
+				if (value[0] in "|!" or value[-1] in "|!") :
+					check_edges = True
+
+		if (not check_edges) :
+			return(True)
+
+		# check where the literal text and the replacement strings meet, including between the copies of a string
+		positions = {keyword : position for position, keyword in enumerate(self.getKeywords())}
+		last_char = ""
+		for segment in self.segments :
+			if (isinstance(segment, str)) :
+				first_char = segment[0]
+				end_char = segment[-1]
+			else :
+				value = values[positions[segment[0]]]
+				if (not isinstance(value, str) or len(value) == 0 or segment[1] == 0) :
+					continue
+
+				if (segment[1] != None and segment[1] > 1 and (value[-1] + value[0]) in ("|!", "!|")) :
+					return(False)
+
+				first_char = value[0]
+				end_char = value[-1]
+
+			if ((last_char + first_char) in ("|!", "!|")) :
+				return(False)
+
+			last_char = end_char
+
+		return(True)
+
+	# returns the compiled pattern to identify the placeholders, compiling it the 1st time
+	@classmethod
+	def getPattern(cls) :
+		if (cls.re_pattern == None) :
+			import re
+			cls.re_pattern = re.compile(r"\|!([^{!\[\]]+)(\{\d+\})?(\[[^{!\[\]]+\])?!\|")
+
+		return(cls.re_pattern)
+
+	# converts the regex groups of a placeholder into a tuple (keyword, multiplier, case function)
+	def buildPlaceholder(self, match_groups) :
+		keyword, multiplier, case_enforcer = match_groups
+
+		# convert the multiplier, if one was provided, to an integer
+		if (multiplier != None) :
+			multiplier = int(multiplier[1:-1])
+
+		# convert the case enforcer, if one was provided, to the String class function to use
+		# NOTE: invalid case enforcers are ignored
+		if (case_enforcer != None) :
+			case_enforcer = self.str_func.get(case_enforcer[1:-1].lower(), None)
+
+		return((keyword, multiplier, case_enforcer))
+
+	# returns the replacement string for a placeholder, without replacing any placeholders inside it
+	# NOTE: keywords not present in replacements, or whose value isn't a string, are replaced by an empty string
+	def buildReplacement(self, placeholder, replacements) :
+		keyword, multiplier, case_enforcer = placeholder
+
+		# check if the keyword is present in replacements and is a string
+		new_string = replacements.get(keyword, None)
+		if (not isinstance(new_string, str)) :
+			# it isn't
+			return("")
+
+		# check if there is any other information provided
+		if (len(new_string) > 0) :
+			# apply the multiplier, if any
+			if (multiplier != None) :
+				new_string *= multiplier
+
+			# apply the case enforcer, if any
+			if (case_enforcer != None) :
+				new_string = getattr(new_string, case_enforcer)()
+
+		return(new_string)
+
+	# builds the final string, replacing each placeholder with its replacement string
+	# NOTE: replacement strings can have placeholders of their own, which are replaced recursively
+	def render(self, replacements, expanding = ()) :
+		# placeholders that could overlap each other must be replaced one at a time
+		if (self.overlapping) :
+			return(self.renderIteratively(replacements))
+
+		parts = []
+
+		# loop through the segments
+		for segment in self.segments :
+			# check if this segment is literal text
+			if (isinstance(segment, str)) :
+				parts.append(segment)
+				continue
+
+			# keywords currently being expanded are treated as missing, to avoid infinite recursion
+			if (segment[0] in expanding) :
+				continue
+
+			new_string = self.buildReplacement(segment, replacements)
+
+			# check if the replacement string has placeholders of its own
+			if ("|!" in new_string) :
+				new_string = self.compile(new_string).render(replacements, expanding + (segment[0],))
+
+			parts.append(new_string)
+
+		string = "".join(parts)
+
+		# make sure no delimiters were left over, since they could form new placeholders with the surrounding text
+		# if there were, fall back to replacing one placeholder at a time, so the result is the same
+		if (len(expanding) == 0 and ("|!" in string or "!|" in string)) :
+			string = self.renderIteratively(replacements)
+
+		# return the final string
+		return(string)
+
+	# returns the expected length of the final string, without building it
+	# NOTE: replacement strings with placeholders of their own are counted as they are
+	def estimateLength(self, replacements) :
+		length = 0
+
+		for segment in self.segments :
+			if (isinstance(segment, str)) :
+				length += len(segment)
+				continue
+
+			new_string = replacements.get(segment[0], None)
+			if (isinstance(new_string, str)) :
+				length += len(new_string) * (1 if (segment[1] == None) else segment[1])
+
+		return(length)
+
+	# yields the final string in chunks of about chunk_size characters, without ever building the whole string
+	# NOTE: the chunks joined together are always the same as the string returned by render()
+	def iterRender(self, replacements) :
+		pieces = self.buildPieces(replacements)
+		if (pieces == None) :
+			# the final string can't be built piece by piece, so build it in one go and split it
+			string = self.render(replacements)
+			for pos in range(0, len(string), self.chunk_size) :
+				yield(string[pos:pos + self.chunk_size])
+			return
+
+		chunk = []
+		chunk_length = 0
+
+		# loop through the pieces, repeating each one as needed
+		for piece, repeat in pieces :
+			# NOTE: large multipliers are repeated a chunk at a time
+			batch = max(1, self.chunk_size // len(piece))
+			while (repeat > 0) :
+				count = min(batch, repeat)
+				repeat -= count
+
+				chunk.append(piece * count if (count > 1) else piece)
+				chunk_length += len(piece) * count
+
+				if (chunk_length >= self.chunk_size) :
+					yield(chunk[0] if (len(chunk) == 1) else "".join(chunk))
+					chunk = []
+					chunk_length = 0
+
+		if (chunk_length > 0) :
+			yield("".join(chunk))
+
+	# splits the final string into a list of tuples (string, number of times it's repeated), in order
+	# returns None if the final string can't be built that way, because a replacement string has placeholders
+	# of its own, its case depends on the surrounding text or the result would have left over delimiters
+	def buildPieces(self, replacements) :
+		# placeholders that could overlap each other must be replaced one at a time
+		if (self.overlapping) :
+			return(None)
+
+		pieces = []
+		for segment in self.segments :
+			if (isinstance(segment, str)) :
+				pieces.append((segment, 1))
+				continue
+
+			keyword, multiplier, case_enforcer = segment
+			new_string = replacements.get(keyword, None)
+			if (not isinstance(new_string, str) or len(new_string) == 0) :
+				continue
+			if ("|!" in new_string) :
+				return(None)
+
+			# apply the case enforcer to a single copy of the string
+			# NOTE: lower() and title() change a sigma depending on the letters after it
+			if (case_enforcer != None) :
+				if (case_enforcer != "upper" and "\u03a3" in new_string) :
+					return(None)
+
+				if (case_enforcer == "title" and multiplier != None and multiplier > 1) :
+					# each copy after the 1st one depends on the last character of the one before it
+					pieces.append((new_string.title(), 1))
+					pieces.append(((new_string[-1] + new_string).title()[len(new_string[-1].title()):], multiplier - 1))
+					continue
+
+				new_string = getattr(new_string, case_enforcer)()
+
+			pieces.append((new_string, 1 if (multiplier == None) else multiplier))
+
+		# make sure no delimiters would be left over, inside a piece, between its copies or between pieces
+		last_char = ""
+		for piece, repeat in pieces :
+			if (len(piece) == 0 or repeat == 0) :
+				continue
+
+			if ("|!" in piece or "!|" in piece or (last_char + piece[0]) in ("|!", "!|") or (repeat > 1 and (piece[-1] + piece[0]) in ("|!", "!|"))) :
+				return(None)
+
+			last_char = piece[-1]
+
+		return([(piece, repeat) for piece, repeat in pieces if (len(piece) > 0 and repeat > 0)])
+
+	# searches the source string for the 1st placeholder and replaces all its occurrences, until none are left
+	# NOTE: only used for the rare templates where placeholders overlap with each other or with stray delimiters
+	def renderIteratively(self, replacements) :
+		string = self.string
+
+		# loop while there are keywords in the string
+		re_matches = self.getPattern().search(string)
+		while (re_matches != None) :
+			# build the replacement string
+			new_string = self.buildReplacement(self.buildPlaceholder(re_matches.groups()), replacements)
+
+			# replace the keyword with the new_string
+			string = string.replace(re_matches.group(0), new_string)
+
+			# check the pattern again
+			re_matches = self.re_pattern.search(string)
+
+		# return the final string
+		return(string)
@@ -0,0 +1,49 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import threading
+
+class ThreadOutput :
+	"""Takes the place of an output stream while several threads are running, keeping what each thread prints apart,
+	so that it can be printed in order once they're done. Anything printed by other threads goes to the stream, as usual."""
+
+	def __init__(self, stream) :
+		# instance variables
+		# the stream that was replaced
+		self.stream = stream
+		# stores the strings printed by each thread being captured, indexed by the thread's identifier
+		self.buffers = {}
+
+	# calls a function, capturing everything printed by the calling thread while it runs
+	# returns a tuple with the function's return value and the string printed
+	def run(self, function, *args) :
+		thread_id = threading.get_ident()
+		self.buffers[thread_id] = []
+		try :
+			result = function(*args)
+		finally :
+			output = "".join(self.buffers.pop(thread_id))
+
+		return((result, output))
+
+	# writes a string to the calling thread's buffer, or to the stream if the thread isn't being captured
+	def write(self, string) :
+		buffer = self.buffers.get(threading.get_ident(), None)
+		if (buffer == None) :
+			return(self.stream.write(string))
+
+		buffer.append(string)
+		return(len(string))
+
+	def flush(self) :
+		self.stream.flush()
@@ -0,0 +1,317 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os
+
+class Writer :
+	"""Writes files to disk with a pool of threads, fed by a bounded queue.
+	With zero threads, the files are written right away by the caller's thread."""
+
+	def __init__(self, thread_count, journal = None, metrics = None, durability = None) :
+		# instance variables
+		# the metrics where the time spent writing each file is recorded, or None if it isn't being measured
+		self.metrics = metrics
+		# the journal where each file is recorded once it's created, or None if the files aren't recorded
+		self.journal = journal
+		# syncs each file to the disk once it's written, or None if the files aren't synced
+		self.durability = durability
+		# the queue with the files waiting to be written
+		# NOTE: it's bounded so that rendering can't get too far ahead of the writing
+		self.queue = None
+		# stores the position, in the structure's plan, of the 1st file that couldn't be written
+		self.failed_index = None
+		# stores any unexpected exception raised while writing a file, to be re-raised by the caller's thread
+		self.exception = None
+		# controls access to the failure information
+		self.lock = None
+		# the writer threads
+		self.threads = []
+		# the number of bytes that didn't need to be written, because files were created as links to other files
+		self.linked_bytes = 0
+
+		# check if any threads are needed
+		if (thread_count == 0) :
+			return
+
+		# NOTE: only imported when needed, since small structures are written without threads
+		import threading, queue
+
+		self.queue = queue.Queue(thread_count * 4)
+		self.lock = threading.Lock()
+
+		# the files will be recorded by several threads
+		if (self.journal != None) :
+			self.journal.enableLocking()
+		if (self.metrics != None) :
+			self.metrics.enableLocking()
+		if (self.durability != None) :
+			self.durability.enableLocking()
+
+		# start the writer threads
+		for i in range(thread_count) :
+			thread = threading.Thread(target = self.writeFiles, daemon = True)
+			thread.start()
+			self.threads.append(thread)
+
+	# adds a file to the queue of files to be written, or writes it right away if there are no writer threads
+	# index is the file's position in the structure's plan
+	# file_content is either a string or an iterator with the chunks of the content, which are rendered as they're written
+	def put(self, index, file_path, file_content) :
+		if (self.queue == None) :
+			self.writeFile(index, file_path, file_content)
+		else :
+			self.queue.put((self.writeFile, (index, file_path, file_content)))
+
+	# adds a file to the queue of files to be copied from a source file, or copies it right away if there are no writer threads
+	# index is the file's position in the structure's plan
+	# link_mode is "copy", "hardlink" or "reflink"
+	def putCopy(self, index, file_path, source_path, link_mode) :
+		if (self.queue == None) :
+			self.copyFile(index, file_path, source_path, link_mode)
+		else :
+			self.queue.put((self.copyFile, (index, file_path, source_path, link_mode)))
+
+	# returns True if any file failed to be written so far, False otherwise
+	def failed(self) :
+		return(self.failed_index != None or self.exception != None)
+
+	# waits for all the queued files to be written and stops the writer threads
+	# returns the position, in the structure's plan, of the 1st file that couldn't be written or None if all were written
+	def close(self) :
+		# tell each thread to stop once the queue is empty
+		for thread in self.threads :
+			self.queue.put(None)
+
+		for thread in self.threads :
+			thread.join()
+
+		# re-raise any unexpected exception in the caller's thread
+		if (self.exception != None) :
+			raise self.exception
+
+		return(self.failed_index)
+
+	# loops through the queue writing the files, until told to stop
+	# NOTE: runs in each of the writer threads
+	def writeFiles(self) :
+		while (True) :
+			item = self.queue.get()
+			if (item == None) :
+				# there are no more files to be written
+				return
+
+			function, args = item
+
+			# once a file fails, the files still in the queue are discarded
+			if (self.failed()) :
+				continue
+
+			function(*args)
+
+	# creates a file with the provided content
+	# any failure is stored, to be reported by close()
+	def writeFile(self, index, file_path, file_content) :
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		# create and open the file in write mode
+		try :
+			file_object = self.openFile(file_path, "w", encoding = "utf-8")
+
+			# write the content, which is either a string or an iterator with the chunks of the content
+			if (isinstance(file_content, str)) :
+				file_object.write(file_content)
+			else :
+				for chunk in file_content :
+					file_object.write(chunk)
+
+			if (self.metrics != None) :
+				# NOTE: the position after writing the whole content is the file's size in bytes
+				self.metrics.count("bytes", file_object.tell())
+
+			# make the file durable, if requested
+			if (self.durability != None) :
+				self.durability.syncFile(file_object)
+			file_object.close()
+			if (self.durability != None) :
+				self.durability.syncParent(file_path)
+
+			if (self.metrics != None) :
+				self.metrics.addLatency("write", self.metrics.stop("write", started))
+				self.metrics.count("files")
+		except OSError as e :
+			# the file couldn't be created
+			self.storeFailure(index, None)
+		except Exception as e :
+			self.storeFailure(index, e)
+
+	# creates a file with the same content as the source file, without decoding or changing it
+	# with the "hardlink" link_mode, the file is a hard link to the source file, if possible
+	# with the "reflink" link_mode, the file shares the source file's data blocks, if the file system supports it
+	# otherwise the content is copied, inside the kernel when the system supports it
+	# any failure is stored, to be reported by close()
+	def copyFile(self, index, file_path, source_path, link_mode) :
+		if (self.metrics != None) :
+			started = self.metrics.start()
+
+		try :
+			source_object = open(source_path, "rb")
+
+			try :
+				# link to the source file, if requested
+				# NOTE: if it isn't possible (ex: the file already exists or is on another drive) the content is copied
+				linked = False
+				if (link_mode == "hardlink") :
+					try :
+						os.link(source_path, file_path)
+						linked = True
+					except OSError as e :
+						pass
+
+				if (linked) :
+					file_size = os.fstat(source_object.fileno()).st_size
+					self.countLinkedBytes(file_size)
+					if (self.journal != None) :
+						self.journal.record("file", file_path)
+				else :
+					file_object = self.openFile(file_path, "wb")
+
+					try :
+						if (link_mode == "reflink" and self.cloneContent(source_object, file_object)) :
+							file_size = os.fstat(source_object.fileno()).st_size
+							self.countLinkedBytes(file_size)
+							linked = True
+						else :
+							file_size = self.copyContent(source_object, file_object)
+
+						# make the file durable, if requested
+						if (self.durability != None) :
+							self.durability.syncFile(file_object)
+					finally :
+						file_object.close()
+
+				# make the file's entry in its directory durable, if requested
+				if (self.durability != None) :
+					self.durability.syncParent(file_path)
+			finally :
+				source_object.close()
+
+			if (self.metrics != None) :
+				# NOTE: linked files don't have any bytes written
+				self.metrics.count("bytes", 0 if (linked) else file_size)
+				self.metrics.addLatency("write", self.metrics.stop("write", started))
+				self.metrics.count("files")
+		except OSError as e :
+			# the file couldn't be created
+			self.storeFailure(index, None)
+		except Exception as e :
+			self.storeFailure(index, e)
+
+	# opens a file in write mode, creating it if it doesn't exist
+	# a new file is recorded in the journal as soon as it exists, so that it's removed if anything fails
+	# NOTE: an existing file (ex: overwritten with the -o flag) isn't recorded, so that a rollback doesn't remove the user's file
+	# raises OSError if the file couldn't be opened
+	def openFile(self, file_path, mode, encoding = None) :
+		try :
+			file_object = open(file_path, mode.replace("w", "x"), encoding = encoding)
+		except FileExistsError as e :
+			return(open(file_path, mode, encoding = encoding))
+
+		if (self.journal != None) :
+			self.journal.record("file", file_path)
+
+		return(file_object)
+
+	# makes a file share the data blocks of another file (a reflink), which only some file systems support
+	# returns True if successful, False otherwise
+	def cloneContent(self, source_object, file_object) :
+		try :
+			import fcntl
+		except ImportError as e :
+			# not supported on this system
+			return(False)
+
+		try :
+			# NOTE: 0x40049409 is the FICLONE request of Linux's ioctl()
+			fcntl.ioctl(file_object.fileno(), 0x40049409, source_object.fileno())
+		except OSError as e :
+			return(False)
+
+		return(True)
+
+	# copies the content of a file to another, inside the kernel when the system supports it
+	# returns the number of bytes copied
+	# raises OSError if the content couldn't be copied
+	def copyContent(self, source_object, file_object) :
+		source_fd = source_object.fileno()
+		file_fd = file_object.fileno()
+		file_size = os.fstat(source_fd).st_size
+
+		# try copy_file_range(), which can also share the data blocks, and then sendfile()
+		for function_name in ("copy_file_range", "sendfile") :
+			if (not hasattr(os, function_name)) :
+				continue
+
+			copied = 0
+			try :
+				while (copied < file_size) :
+					if (function_name == "copy_file_range") :
+						count = os.copy_file_range(source_fd, file_fd, file_size - copied, copied, copied)
+					else :
+						count = os.sendfile(file_fd, source_fd, copied, file_size - copied)
+
+					if (count == 0) :
+						# the source file got smaller in the meantime
+						break
+					copied += count
+
+				return(copied)
+			except OSError as e :
+				# if nothing was copied, the function isn't supported for these files, so try the next one
+				if (copied > 0) :
+					raise
+
+		# copy the content through a buffer
+		copied = 0
+		while (True) :
+			chunk = source_object.read(1048576)
+			if (len(chunk) == 0) :
+				return(copied)
+			file_object.write(chunk)
+			copied += len(chunk)
+
+	# adds to the number of bytes that didn't need to be written
+	def countLinkedBytes(self, byte_count) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			self.linked_bytes += byte_count
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
+
+	# stores the position of a file that couldn't be written, if it's the 1st one in the structure's plan
+	# or the unexpected exception raised while writing it
+	def storeFailure(self, index, exception) :
+		if (self.lock != None) :
+			self.lock.acquire()
+
+		try :
+			if (exception != None) :
+				self.exception = exception
+			elif (self.failed_index == None or index < self.failed_index) :
+				self.failed_index = index
+		finally :
+			if (self.lock != None) :
+				self.lock.release()
@@ -0,0 +1,91 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+# thin client that forwards the command line arguments to the daemon (started with "main.py daemon")
+# and prints its reply
+# if the daemon isn't running, the action is executed by main.py in this process
+# NOTE: this file doesn't import the classes package, so it starts as fast as possible
+
+import os, sys, io, json, socket, tempfile, runpy
+
+# NOTE: the processes that render files in parallel, when the daemon isn't running, import this file too,
+#       so they must not forward the arguments again
+if (__name__ == "__main__") :
+	# the arguments to be forwarded, without the path to this file
+	args = sys.argv[1:]
+
+	# find the daemon file, with the daemon's port and key
+	# NOTE: must match classes.Daemon.Daemon.defaultDaemonPath() and classes.Daemon.Daemon.readDaemonFile()
+	daemon_path = os.environ.get("PROJMAN_DAEMON_FILE", "")
+	if (len(daemon_path) == 0) :
+		user_id = str(os.getuid()) if (hasattr(os, "getuid")) else ""
+		daemon_path = os.path.join(tempfile.gettempdir(), "projman-" + user_id + ".daemon")
+
+	address = None
+	try :
+		file_object = open(daemon_path, "r", encoding = "utf-8")
+		try :
+			# NOTE: a file created by another user could point to a program of their own
+			if (not hasattr(os, "getuid") or os.fstat(file_object.fileno()).st_uid == os.getuid()) :
+				address = json.loads(file_object.read())
+				address = (int(address["port"]), str(address["key"]))
+		finally :
+			file_object.close()
+	except (OSError, ValueError, KeyError, TypeError) as e :
+		address = None
+
+	# build the request
+	request = {"args" : args, "cwd" : os.getcwd()}
+	if (len(args) > 1 and args[0].lower() == "batch" and args[1] == "-") :
+		# the manifest is read from stdin, so send it along
+		request["stdin"] = sys.stdin.read()
+
+	# connect to the daemon
+	client_socket = None
+	if (address != None) :
+		try :
+			client_socket = socket.create_connection(("127.0.0.1", address[0]), timeout = 1)
+			request["key"] = address[1]
+		except OSError as e :
+			client_socket = None
+
+	if (client_socket == None) :
+		# the daemon isn't running, so execute the action in this process
+		if ("stdin" in request) :
+			sys.stdin = io.StringIO(request["stdin"])
+		runpy.run_path(os.path.join(os.path.dirname(os.path.realpath(__file__)), "main.py"), run_name = "__main__")
+		sys.exit(0)
+
+	# send the request and read the reply
+	try :
+		# NOTE: the action can take any time to execute
+		client_socket.settimeout(None)
+		client_socket.sendall((json.dumps(request) + "\n").encode("utf-8"))
+
+		reply_bytes = b""
+		while (not reply_bytes.endswith(b"\n")) :
+			chunk = client_socket.recv(65536)
+			if (len(chunk) == 0) :
+				break
+			reply_bytes += chunk
+		client_socket.close()
+
+		reply = json.loads(reply_bytes.decode("utf-8"))
+	except (OSError, ValueError) as e :
+		# the daemon stopped while executing the action
+		print("=> ERROR: The daemon didn't reply to the request.")
+		sys.exit(1)
+
+	# print the daemon's reply
+	sys.stdout.write(reply["output"])
+	sys.exit(0 if (reply["success"]) else 1)
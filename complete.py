@@ -0,0 +1,24 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+# answers the shell's requests to complete the words of the command line, with one possible value per line
+# the arguments are the words of the command line, without the program, where the last one is the word being completed
+# used by the completion scripts in the completion directory
+# NOTE: this file only imports the classes needed to read the compiled JSON files, so it starts as fast as possible
+
+import os, sys
+from classes import Completer
+
+completer = Completer.Completer(os.path.join(os.path.dirname(os.path.realpath(__file__)), "data"))
+for value in completer.complete(sys.argv[1:]) :
+	print(value)
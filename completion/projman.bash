@@ -0,0 +1,37 @@
+# bash completion for the Python Project Manager
+# usage: source this file in ~/.bashrc, after defining the projman command, for example:
+#	alias projman="python3 /path/to/main.py"
+#	source /path/to/completion/projman.bash
+
+# the path to complete.py, next to this file's directory
+_projman_complete="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)/complete.py"
+
+_projman() {
+	# the command line up to the cursor, split into words
+	# NOTE: the colons in the types are word breaks for bash, so the words are split again by spaces only
+	local line="${COMP_LINE:0:$COMP_POINT}"
+	local -a words
+	read -r -a words <<< "$line"
+	if [[ "$line" == *" " ]] ; then
+		# the word being completed is empty
+		words+=("")
+	fi
+
+	local cur="${words[${#words[@]} - 1]}"
+	local IFS=$'\n'
+	COMPREPLY=($(python3 -S "$_projman_complete" "${words[@]:1}" 2> /dev/null))
+
+	# values ending with ":" or "=" aren't finished yet, so no space is added after them
+	if [[ ${#COMPREPLY[@]} -eq 1 && ( "${COMPREPLY[0]}" == *: || "${COMPREPLY[0]}" == *= ) ]] ; then
+		compopt -o nospace
+	fi
+
+	# bash only replaces the part of the word after its last colon, so remove the part before it
+	if [[ "$cur" == *:* && "$COMP_WORDBREAKS" == *:* ]] ; then
+		local colon_prefix="${cur%"${cur##*:}"}"
+		COMPREPLY=("${COMPREPLY[@]#"$colon_prefix"}")
+	fi
+}
+
+# when there are no values, the file names are completed instead (ex: for the path arguments)
+complete -o default -F _projman projman
@@ -11,13 +11,35 @@
 # 															  #
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-import traceback, os
+import time
+
+# the CPU time used by the interpreter before this file started running
+interpreter_time = time.process_time()
+start_time = time.perf_counter()
+
+import os
 from classes import Application
 
+# the time spent importing the application's code
+imports_time = time.perf_counter() - start_time
+
 # code that starts the entire application
-try :
-	# instantiate the application's main class
-	app = Application.Application(os.path.dirname(os.path.realpath(__file__)) + "\\data")
-except Exception as e :
-	traceback.print_exc()
-	print("\n")
+# NOTE: the processes that render files in parallel import this file too, so they must not start the application
+if (__name__ == "__main__") :
+	try :
+		# instantiate the application's main class
+		app = Application.Application(os.path.join(os.path.dirname(os.path.realpath(__file__)), "data"))
+	except Exception as e :
+		import traceback
+		traceback.print_exc()
+		print("\n")
+	else :
+		# print where the time was spent, if requested
+		if (app.cli_obj.options.get("startup-report", False)) :
+			# NOTE: printed with the feedback messages, which aren't on stdout when an archive is written to it
+			print("=> Startup report:", file = app.output)
+			print("\tinterpreter init (CPU time): %8.2f ms" % (interpreter_time * 1000), file = app.output)
+			print("\timports:                     %8.2f ms" % (imports_time * 1000), file = app.output)
+			print("\tdata loading:                %8.2f ms" % (app.timings["data"] * 1000), file = app.output)
+			print("\taction execution:            %8.2f ms" % (app.timings["action"] * 1000), file = app.output)
+			print("\ttotal since start:           %8.2f ms" % ((interpreter_time + time.perf_counter() - start_time) * 1000), file = app.output)
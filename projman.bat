@@ -3,8 +3,19 @@
 REM path to the main.py file of the program
 set "file_path=path\to\main.py"
 
-REM if the action is HELP, no processing is required
+REM if the action is HELP, BATCH, ROLLBACK, RESUME or DAEMON, no processing is required
 if {%1} == {help} goto help_action
+if {%1} == {batch} goto help_action
+if {%1} == {rollback} goto help_action
+if {%1} == {resume} goto help_action
+if {%1} == {daemon} goto help_action
+
+REM a file with the list of locations, prefixed with an @, is passed as it is
+set "first_arg=%~2"
+if "%first_arg:~0,1%" == "@" (
+	set "trg_path=%~2"
+	goto build_args
+)
 
 REM build the desired path for the action to be executed
 if {%2} == {.} (
@@ -15,6 +26,7 @@ if {%2} == {.} (
 	set "trg_path=%CD%%2"
 )
 
+:build_args
 REM build the list of remaining args to be passed to the python program
 set "args=%1 %trg_path%"
 shift
@@ -30,7 +42,7 @@ python %file_path% %args%
 
 goto end_file
 
-REM call the python program for the HELP action
+REM call the python program for the HELP, BATCH, ROLLBACK, RESUME and DAEMON actions
 :help_action
 python %file_path% %*
 
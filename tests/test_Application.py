@@ -0,0 +1,132 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import io, os, sys, json, shutil, tarfile, zipfile, tempfile, unittest
+from classes import Application
+
+class TestApplication(unittest.TestCase) :
+	"""Checks the Application class' methods that don't need a data directory."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+		self.app_obj = Application.Application(self.temp_path, False)
+
+	def tearDown(self) :
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# writes a manifest file with the provided content and returns its path
+	def writeManifest(self, content) :
+		manifest_path = os.path.join(self.temp_path, "manifest.json")
+		file_object = open(manifest_path, "w", encoding = "utf-8")
+		file_object.write(content)
+		file_object.close()
+
+		return(manifest_path)
+
+	def testManifestOptions(self) :
+		manifest_path = self.writeManifest(json.dumps([{"action" : "help", "topic" : "project", "options" : {"timings" : True, "startup-report" : False, "writers" : 8, "journal" : None}}]))
+		self.assertEqual(self.app_obj.readManifest(manifest_path), [["help", "project", "--timings", "--writers=8"]])
+
+	def testManifestLines(self) :
+		manifest_path = self.writeManifest('["help"]\n\n{"action" : "help", "topic" : "file"}\n')
+		self.assertEqual(self.app_obj.readManifest(manifest_path), [["help"], ["help", "file"]])
+
+	def testInvalidManifest(self) :
+		self.assertEqual(self.app_obj.readManifest(self.writeManifest('[{"action" : "help", "options" : ["--timings"]}]')), None)
+		self.assertEqual(self.app_obj.readManifest(self.writeManifest('[["help", 1]]')), None)
+		self.assertEqual(self.app_obj.readManifest(os.path.join(self.temp_path, "missing.json")), None)
+
+	def testCopyright(self) :
+		for name, data in (("keywords", {"name" : "n", "copyright" : {"text" : "(|!name!|)", "replaces" : {"js" : {}}}}), ("file", {"js" : {"extension" : "js", "content" : ""}})) :
+			file_object = open(os.path.join(self.temp_path, name + ".json"), "w", encoding = "utf-8")
+			json.dump(data, file_object)
+			file_object.close()
+		self.assertTrue(self.app_obj.prepareAction(["file", self.temp_path, "name", "js"]))
+
+		# the copyright text is only inserted in files with the |!copyright!| placeholder, as it is
+		self.assertEqual(self.app_obj.renderFile("a.js", "|!copyright!| |!copyright[uc]!| |!copyright{2}!|"), "(n) (N) (n)(n)")
+		self.assertEqual(self.app_obj.renderFile("b.js", "|!copyright[uc]!| |!copyright{2}!| |!file_name!|"), "  b")
+		self.app_obj.pack.close()
+
+	def testComputedKeywords(self) :
+		for name, data in (("keywords", {"name" : "n"}), ("file", {"js" : {"extension" : "js", "content" : ""}})) :
+			file_object = open(os.path.join(self.temp_path, name + ".json"), "w", encoding = "utf-8")
+			json.dump(data, file_object)
+			file_object.close()
+		self.assertTrue(self.app_obj.prepareAction(["file", self.temp_path, "name", "js"]))
+
+		# git is only asked for the author when a file references it, and only once per action
+		calls = []
+		self.app_obj.readGitConfig = lambda name : calls.append(name) or "author"
+		self.assertEqual(self.app_obj.renderFile("a.js", "|!name!| |!file_name!|"), "n a")
+		self.assertEqual(calls, [])
+		self.assertEqual(self.app_obj.renderFile("b.js", "|!git_author!| |!file_name!|"), "author b")
+		self.assertEqual(self.app_obj.renderFile("c.js", "|!git_author[uc]!| |!file_name!|"), "AUTHOR c")
+		self.assertEqual(calls, ["user.name"])
+		self.app_obj.pack.close()
+
+	# executes the project action from the command line, writing the project into an archive
+	# returns a tuple with the bytes written to stdout and the feedback messages printed to stderr
+	def runArchive(self, archive_path) :
+		stdout = io.TextIOWrapper(io.BytesIO(), encoding = "utf-8")
+		stderr = io.StringIO()
+		parent_argv, parent_stdout, parent_stderr = sys.argv, sys.stdout, sys.stderr
+		sys.argv = ["main.py", "project", self.temp_path, "proj", "bench", "--output-archive=" + archive_path, "--no-cache"]
+		sys.stdout, sys.stderr = stdout, stderr
+		try :
+			app_obj = Application.Application(self.temp_path)
+			app_obj.pack.close()
+
+			# the program's stdout is left as it was
+			self.assertIs(sys.stdout, stdout)
+		finally :
+			sys.argv, sys.stdout, sys.stderr = parent_argv, parent_stdout, parent_stderr
+
+		stdout.flush()
+		return((stdout.buffer.getvalue(), stderr.getvalue()))
+
+	def testArchives(self) :
+		for name, data in (("keywords", {}), ("project", {"bench" : {"src" : {"a.txt" : "|!project_name!| |!missing!|"}, "b.md" : "# |!project_name[uc]!|"}})) :
+			file_object = open(os.path.join(self.temp_path, name + ".json"), "w", encoding = "utf-8")
+			json.dump(data, file_object)
+			file_object.close()
+
+		# the same project always gives the same archive, byte for byte
+		archives = {}
+		for extension in ("tar", "tar.gz", "zip") :
+			archive_path = os.path.join(self.temp_path, "proj." + extension)
+			for i in range(2) :
+				stdout, stderr = self.runArchive(archive_path)
+				self.assertIn("=> Success: Project proj written to the archive", stdout.decode("utf-8"))
+				self.assertEqual(stderr, "")
+
+				file_object = open(archive_path, "rb")
+				content = file_object.read()
+				file_object.close()
+				self.assertEqual(archives.setdefault(extension, content), content)
+
+		tar_object = tarfile.open(fileobj = io.BytesIO(archives["tar"]))
+		self.assertEqual(tar_object.extractfile("proj/src/a.txt").read(), b"Proj ")
+		self.assertEqual(tar_object.extractfile("proj/b.md").read(), b"# PROJ")
+		tar_object.close()
+		zip_object = zipfile.ZipFile(io.BytesIO(archives["zip"]))
+		self.assertEqual(zip_object.read("proj/src/a.txt"), b"Proj ")
+		zip_object.close()
+
+		# the archive written to stdout is the tar archive, and the feedback messages are printed to stderr instead
+		stdout, stderr = self.runArchive("-")
+		self.assertEqual(stdout, archives["tar"])
+		self.assertIn("=> Success: Project proj written to stdout!", stderr)
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,53 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import io, os, tempfile, unittest
+from classes import CLI
+
+class TestCLI(unittest.TestCase) :
+	"""Checks how the command line arguments are processed, without executing any action."""
+
+	# returns the CLI object for the provided arguments, with its feedback messages discarded
+	def process(self, *args) :
+		return(CLI.CLI([""] + list(args), io.StringIO()))
+
+	def testLocationWithSeparators(self) :
+		# a location is never split, whatever characters it has
+		cli_obj = self.process("project", "C:\\work;old\\a:b", "name", "php")
+		self.assertEqual(cli_obj.args["locations"], ["C:\\work;old\\a:b\\"])
+
+	def testRepeatedLocations(self) :
+		# each --location adds a location, in the order they were given, without repeated ones
+		cli_obj = self.process("project", "C:\\a", "name", "php", "--location=C:\\b;c", "--location=C:\\d/", "--location=C:\\a\\")
+		self.assertEqual(cli_obj.args["locations"], ["C:\\a\\", "C:\\b;c\\", "C:\\d\\"])
+
+		# the option must have a value
+		self.assertEqual(self.process("project", "C:\\a", "name", "php", "--location=").action, None)
+
+		# the sync action only accepts one location
+		self.assertEqual(self.process("sync", "C:\\a", "name", "php", "--location=C:\\b").action, None)
+
+	def testLocationsFile(self) :
+		# the locations can be in a file, one per line, followed by the ones given with --location
+		file_object = tempfile.NamedTemporaryFile("w", suffix = ".txt", delete = False, encoding = "utf-8")
+		file_object.write("C:\\a;b\n\nC:\\c\n")
+		file_object.close()
+
+		try :
+			cli_obj = self.process("project", "@" + file_object.name, "name", "php", "--location=C:\\d")
+			self.assertEqual(cli_obj.args["locations"], ["C:\\a;b\\", "C:\\c\\", "C:\\d\\"])
+		finally :
+			os.remove(file_object.name)
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,53 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, sys, subprocess, unittest
+
+# the repository's root directory, with complete.py
+root_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+class TestCompleter(unittest.TestCase) :
+	"""Runs complete.py, as the completion scripts do, against the shipped data."""
+
+	# returns the list of values printed by complete.py for the provided words
+	def complete(self, *words) :
+		result = subprocess.run([sys.executable, os.path.join(root_path, "complete.py")] + list(words), stdout = subprocess.PIPE, stderr = subprocess.STDOUT, check = True)
+		return(result.stdout.decode("utf-8").splitlines())
+
+	def testActions(self) :
+		self.assertEqual(self.complete("p"), ["project"])
+		self.assertIn("help", self.complete(""))
+
+	def testProjectTypes(self) :
+		# only the project types are offered, not the directories inside them
+		self.assertEqual(self.complete("project", "path", "name", ""), ["php", "python", "ruby"])
+		self.assertEqual(self.complete("sync", "path", "name", "p"), ["php", "python"])
+		self.assertEqual(self.complete("project", "path", "name", "php:"), [])
+
+	def testFileTypes(self) :
+		# the groups of file types are completed one tier at a time
+		self.assertEqual(self.complete("file", "path", "name", ""), ["cpp:", "css", "js", "php:", "python:", "ruby:", "scss"])
+		self.assertEqual(self.complete("file", "path", "name", "php:"), ["php:ajax", "php:blank", "php:class"])
+		self.assertEqual(self.complete("file", "path", "name", "php:class", "-"), ["-f", "-o", "-fo"])
+
+	def testHelpTopics(self) :
+		# only the help topics are offered, not the texts inside them
+		self.assertEqual(self.complete("help", ""), ["batch", "daemon", "file", "project", "resume", "rollback", "sync"])
+		self.assertEqual(self.complete("help", "project:"), [])
+
+	def testOptions(self) :
+		self.assertIn("--timings", self.complete("project", "--tim"))
+		self.assertIn("--writers=", self.complete("project", "--wri"))
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,138 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, sys, json, time, signal, socket, shutil, tempfile, subprocess, unittest
+from classes import Daemon
+
+# the repository's root directory, with main.py and client.py
+root_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+class TestDaemon(unittest.TestCase) :
+	"""Starts a daemon with the shipped data and sends requests to it, directly and through client.py."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+		self.daemon_path = os.path.join(self.temp_path, "projman.daemon")
+		self.env = dict(os.environ, PROJMAN_DAEMON_FILE = self.daemon_path)
+
+		self.process = subprocess.Popen([sys.executable, os.path.join(root_path, "main.py"), "daemon"], env = self.env, stdout = subprocess.PIPE, stderr = subprocess.STDOUT)
+
+		# wait for the daemon to write its port and key
+		self.address = None
+		for i in range(200) :
+			self.address = Daemon.Daemon.readDaemonFile(self.daemon_path)
+			if (self.address != None or self.process.poll() != None) :
+				break
+			time.sleep(0.05)
+
+		if (self.address == None) :
+			self.stopDaemon()
+			self.fail("The daemon didn't start.")
+
+	def tearDown(self) :
+		self.stopDaemon()
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	def stopDaemon(self) :
+		if (self.process.poll() == None) :
+			if (os.name == "nt") :
+				self.process.terminate()
+			else :
+				self.process.send_signal(signal.SIGINT)
+
+		try :
+			self.process.communicate(timeout = 10)
+		except subprocess.TimeoutExpired as e :
+			self.process.kill()
+			self.process.communicate()
+
+	# sends a request to the daemon, either an object or the raw bytes, and returns the decoded reply
+	def sendRequest(self, request) :
+		client_socket = socket.create_connection(("127.0.0.1", self.address[0]), timeout = 10)
+		try :
+			client_socket.sendall(request if (isinstance(request, bytes)) else (json.dumps(request) + "\n").encode("utf-8"))
+
+			reply_bytes = b""
+			while (not reply_bytes.endswith(b"\n")) :
+				chunk = client_socket.recv(65536)
+				if (len(chunk) == 0) :
+					break
+				reply_bytes += chunk
+		finally :
+			client_socket.close()
+
+		return(json.loads(reply_bytes.decode("utf-8")))
+
+	def testClient(self) :
+		# the action executed by the daemon must print the same as when executed by main.py
+		expected = subprocess.run([sys.executable, os.path.join(root_path, "main.py"), "help", "file"], stdout = subprocess.PIPE).stdout
+		result = subprocess.run([sys.executable, os.path.join(root_path, "client.py"), "help", "file"], env = self.env, stdout = subprocess.PIPE)
+
+		self.assertEqual(result.returncode, 0)
+		self.assertEqual(result.stdout, expected)
+		self.assertIn(b"file", result.stdout)
+
+	def testClientFallback(self) :
+		self.stopDaemon()
+
+		# without the daemon, the action is executed by client.py's own process
+		expected = subprocess.run([sys.executable, os.path.join(root_path, "main.py"), "help", "file"], stdout = subprocess.PIPE).stdout
+		result = subprocess.run([sys.executable, os.path.join(root_path, "client.py"), "help", "file"], env = self.env, stdout = subprocess.PIPE)
+		self.assertEqual(result.returncode, 0)
+		self.assertEqual(result.stdout, expected)
+
+		# the processes that render files in parallel import client.py without running it, as multiprocessing's spawn does
+		code = "import runpy, sys; sys.argv = ['client.py', 'help']; runpy.run_path(sys.argv[0], run_name = '__mp_main__')"
+		result = subprocess.run([sys.executable, "-c", code], cwd = root_path, env = self.env, stdout = subprocess.PIPE, stderr = subprocess.STDOUT)
+		self.assertEqual(result.returncode, 0)
+		self.assertEqual(result.stdout, b"")
+
+	def testRequests(self) :
+		reply = self.sendRequest({"key" : self.address[1], "args" : ["help"], "metrics" : True})
+		self.assertTrue(reply["success"])
+		self.assertIn("metrics", reply)
+
+		reply = self.sendRequest({"key" : self.address[1], "args" : ["nope"]})
+		self.assertFalse(reply["success"])
+
+		# the daemon's stdout isn't the client's, so an archive can't be written to it
+		reply = self.sendRequest({"key" : self.address[1], "args" : ["project", self.temp_path, "name", "php", "--output-archive=-"], "cwd" : self.temp_path})
+		self.assertFalse(reply["success"])
+		self.assertIn("stdout", reply["output"])
+		self.assertEqual(os.listdir(self.temp_path), ["projman.daemon"])
+
+	def testInvalidRequests(self) :
+		# none of these requests can stop the daemon
+		for request in (b"not json\n", b"[1, 2]\n", b"\xff\n", {"args" : ["help"]}, {"key" : "wrong", "args" : ["help"]}, {"key" : self.address[1], "args" : "help"}, {"key" : self.address[1], "args" : ["help", 1]}, {"key" : self.address[1], "args" : ["help"], "cwd" : 1}) :
+			reply = self.sendRequest(request)
+			self.assertFalse(reply["success"], repr(request))
+			self.assertIn("isn't valid", reply["output"])
+
+		reply = self.sendRequest({"key" : self.address[1], "args" : ["help"], "cwd" : os.path.join(self.temp_path, "missing")})
+		self.assertFalse(reply["success"])
+		self.assertIn("couldn't be accessed", reply["output"])
+
+		# the daemon is still running
+		self.assertTrue(self.sendRequest({"key" : self.address[1], "args" : ["help"]})["success"])
+
+	def testStop(self) :
+		if (os.name == "nt") :
+			self.skipTest("Ctrl+C can't be sent to the daemon on this system.")
+
+		# the daemon file is removed once the daemon is stopped
+		self.stopDaemon()
+		self.assertEqual(self.process.returncode, 0)
+		self.assertFalse(os.path.exists(self.daemon_path))
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,121 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import io, os, json, shutil, tempfile, unittest
+from classes import Application, Journal, Writer
+
+class TestDedup(unittest.TestCase) :
+	"""Checks that the files with the same content are written once and linked, and copied when they can't be linked."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+
+		self.data_path = os.path.join(self.temp_path, "data")
+		os.mkdir(self.data_path)
+		structure = {("same" + str(i) + ".txt") : "the same content\n" for i in range(4)}
+		structure["other.txt"] = "other |!file_name!|\n"
+		structure["empty.txt"] = ""
+		for name, data in (("keywords", {}), ("project", {"bench" : structure})) :
+			file_object = open(os.path.join(self.data_path, name + ".json"), "w", encoding = "utf-8")
+			json.dump(data, file_object)
+			file_object.close()
+
+		self.output_path = os.path.join(self.temp_path, "output") + os.sep
+		os.mkdir(self.output_path)
+
+	def tearDown(self) :
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# creates the structure with the provided dedup mode
+	# returns the Application object, with the feedback messages in its output, and the journal with the files created
+	def createStructure(self, dedup_mode) :
+		app_obj = Application.Application(self.data_path, False)
+		self.assertTrue(app_obj.prepareAction(["project", self.output_path, "proj", "bench", "--dedup=" + dedup_mode, "--writers=2", "--no-cache"]))
+		self.assertTrue(app_obj.updateJsonData("bench"))
+		app_obj.output = io.StringIO()
+
+		journal = Journal.Journal()
+		self.assertTrue(app_obj.createStructure(app_obj.json_data, self.output_path, journal))
+		app_obj.pack.close()
+
+		return((app_obj, journal))
+
+	# returns the content of a file
+	def readFile(self, file_path) :
+		file_object = open(file_path, "r", encoding = "utf-8")
+		content = file_object.read()
+		file_object.close()
+
+		return(content)
+
+	def testHardlinks(self) :
+		app_obj, journal = self.createStructure("hardlink")
+
+		# the content is written once and the other files are links to that file
+		inodes = set(os.stat(self.output_path + "same" + str(i) + ".txt").st_ino for i in range(4))
+		self.assertEqual(len(inodes), 1)
+		self.assertEqual(os.stat(self.output_path + "same0.txt").st_nlink, 4)
+		self.assertEqual(self.readFile(self.output_path + "same3.txt"), "the same content\n")
+		self.assertIn("=> Dedup: 3 file(s) with the same content as another file, " + str(3 * len(app_obj.encodeContent("the same content\n"))) + " bytes saved.", app_obj.output.getvalue())
+
+		# empty files and files with their own content aren't linked, and every file is recorded to be removed
+		self.assertEqual(os.stat(self.output_path + "empty.txt").st_nlink, 1)
+		self.assertEqual(os.stat(self.output_path + "other.txt").st_nlink, 1)
+		self.assertEqual(len(journal.entries), 6)
+		self.assertTrue(journal.rollback())
+		self.assertEqual(os.listdir(self.output_path), [])
+
+	def testCopyMode(self) :
+		app_obj, journal = self.createStructure("copy")
+
+		# without dedup every file is written on its own
+		self.assertEqual(os.stat(self.output_path + "same0.txt").st_nlink, 1)
+		self.assertNotIn("=> Dedup:", app_obj.output.getvalue())
+
+	def testLinkFallback(self) :
+		source_path = os.path.join(self.temp_path, "source.txt")
+		file_object = open(source_path, "wb")
+		file_object.write(b"source content")
+		file_object.close()
+
+		# when the file can't be a link to the source file (ex: it's on another drive), the content is copied instead
+		link = os.link
+		def failLink(source, destination) :
+			raise OSError(18, "Invalid cross-device link")
+		os.link = failLink
+		try :
+			for link_mode in ("hardlink", "reflink") :
+				journal = Journal.Journal()
+				writer = Writer.Writer(0, journal)
+				file_path = os.path.join(self.temp_path, link_mode + ".txt")
+				writer.putCopy(0, file_path, source_path, link_mode)
+				self.assertEqual(writer.close(), None)
+
+				self.assertEqual(self.readFile(file_path), "source content")
+				self.assertEqual(os.stat(file_path).st_nlink, 1)
+				self.assertEqual(journal.entries, [["file", file_path]])
+		finally :
+			os.link = link
+
+		# and the structure is still created, with copies
+		os.link = failLink
+		try :
+			app_obj, journal = self.createStructure("hardlink")
+		finally :
+			os.link = link
+		for i in range(4) :
+			self.assertEqual(os.stat(self.output_path + "same" + str(i) + ".txt").st_nlink, 1)
+			self.assertEqual(self.readFile(self.output_path + "same" + str(i) + ".txt"), "the same content\n")
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,107 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import io, os, shutil, tempfile, unittest
+from classes import Application, CLI, Durability, Journal, Writer
+
+class TestDurability(unittest.TestCase) :
+	"""Checks what each durability mode syncs to the disk, and when, and how a failed sync is reported."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+
+	def tearDown(self) :
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# writes files with a Writer using the provided durability, and returns their paths
+	def writeFiles(self, durability, count) :
+		paths = [os.path.join(self.temp_path, "file" + str(i) + ".txt") for i in range(count)]
+		writer = Writer.Writer(2, Journal.Journal(), None, durability)
+		for index, file_path in enumerate(paths) :
+			writer.put(index, file_path, "content " + str(index))
+		self.assertEqual(writer.close(), None)
+
+		return(paths)
+
+	def testModes(self) :
+		# the option only accepts the known modes, and none is the default
+		for mode in ("none", "file", "batch") :
+			self.assertEqual(CLI.CLI(["", "help", "--durability=" + mode], io.StringIO()).options["durability"], mode)
+		self.assertEqual(CLI.CLI(["", "help"], io.StringIO()).options["durability"], "none")
+		self.assertEqual(CLI.CLI(["", "help", "--durability=always"], io.StringIO()).action, None)
+
+	def testFileMode(self) :
+		durability = Durability.Durability("file")
+		self.writeFiles(durability, 5)
+
+		# each file is synced as it's written, together with its directory, except on Windows, where directories can't be synced
+		self.assertEqual(durability.file_count, 5)
+		self.assertEqual(durability.directory_count, 0 if (os.name == "nt") else 5)
+		self.assertEqual(durability.pending_paths, {})
+
+		# there is nothing left to be synced at the end
+		durability.finish()
+		self.assertEqual(durability.file_count, 5)
+		self.assertIn("5 file(s) and", durability.report())
+
+	def testBatchMode(self) :
+		durability = Durability.Durability("batch")
+		paths = self.writeFiles(durability, 5)
+
+		# nothing is synced until the end, where the files are synced all at once, or one at a time if the system can't
+		self.assertEqual((durability.file_count, durability.directory_count), (0, 0))
+		self.assertEqual(sorted(durability.pending_paths), [] if (hasattr(os, "sync")) else sorted(paths))
+		durability.syncDirectory(self.temp_path)
+		self.assertEqual(durability.directory_count, 0)
+
+		durability.finish()
+		self.assertEqual(durability.pending_paths, {})
+		self.assertIn("Everything synced to the disk at the end", durability.report())
+
+	def testFinishDurability(self) :
+		app_obj = Application.Application(self.temp_path, False)
+		app_obj.output = io.StringIO()
+
+		# without durability there is nothing to sync or report
+		self.assertTrue(app_obj.finishDurability(self.temp_path))
+		self.assertEqual(app_obj.output.getvalue(), "")
+
+		# the time spent syncing is reported once everything is synced
+		app_obj.durability = Durability.Durability("file")
+		self.assertTrue(app_obj.finishDurability(self.temp_path))
+		self.assertTrue(app_obj.output.getvalue().startswith("=> Durability: "))
+
+		# a sync that failed fails the action
+		def failSync() :
+			raise OSError("sync failed")
+		app_obj.durability = Durability.Durability("batch")
+		app_obj.durability.finish = failSync
+		self.assertFalse(app_obj.finishDurability())
+		self.assertEqual(app_obj.errors, ["The directories and files couldn't be synced to the disk."])
+
+	def testRollback(self) :
+		app_obj = Application.Application(self.temp_path, False)
+		app_obj.output = io.StringIO()
+		journal = Journal.Journal()
+		dir_path = os.path.join(self.temp_path, "dir")
+		os.mkdir(dir_path)
+		journal.record("dir", dir_path)
+
+		# the directories with the removed entries are synced as well
+		app_obj.durability = Durability.Durability("file")
+		self.assertTrue(app_obj.rollbackJournal(journal))
+		self.assertFalse(os.path.exists(dir_path))
+		self.assertEqual(app_obj.durability.directory_count, 0 if (os.name == "nt") else 1)
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,118 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import io, os, json, shutil, tempfile, unittest
+from classes import Application, CLI, Pack
+
+class TestFileAction(unittest.TestCase) :
+	"""Checks the file action with many names: a single look at the directory, and the flags applied to all the names."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+
+		data_path = os.path.join(self.temp_path, "data")
+		os.mkdir(data_path)
+		for name, data in (("keywords", {}), ("file", {"text" : {"extension" : "txt", "content" : "|!file_name!| in |!dir_name!|"}})) :
+			self.writeFile(os.path.join(data_path, name + ".json"), json.dumps(data))
+
+		self.app_obj = Application.Application(data_path, False, Pack.Pack.openData(data_path + os.sep))
+		self.files_path = os.path.join(self.temp_path, "files") + os.sep
+		os.mkdir(self.files_path)
+
+	def tearDown(self) :
+		self.app_obj.pack.close()
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# creates a file with the provided content
+	def writeFile(self, file_path, content) :
+		file_object = open(file_path, "w", encoding = "utf-8")
+		file_object.write(content)
+		file_object.close()
+
+	# returns the content of a file
+	def readFile(self, file_path) :
+		file_object = open(file_path, "r", encoding = "utf-8")
+		content = file_object.read()
+		file_object.close()
+
+		return(content)
+
+	# executes the file action in a directory, with the provided names and flags
+	# returns a tuple with True if successful or False otherwise, and the feedback messages
+	# NOTE: the directory is given with the system's separator, which the command line would change
+	def createFiles(self, files_path, names, flags = "") :
+		cli_obj = CLI.CLI(["", "file", files_path, names, "text"] + (["-" + flags] if (len(flags) > 0) else []) + ["--no-cache"], io.StringIO())
+		self.assertNotEqual(cli_obj.action, None)
+		cli_obj.args["action_path"] = files_path
+
+		return(self.app_obj.executeCaptured(None, cli_obj))
+
+	# replaces os.scandir with a function that counts its calls, until the end of the test
+	# returns the list where each call's path is added
+	def countScandir(self) :
+		calls = []
+		scandir = os.scandir
+		def countedScandir(path) :
+			calls.append(path)
+			return(scandir(path))
+		os.scandir = countedScandir
+		self.addCleanup(setattr, os, "scandir", scandir)
+
+		return(calls)
+
+	def testManyNames(self) :
+		calls = self.countScandir()
+		success, output = self.createFiles(self.files_path, "Model{1..200}")
+
+		# the directory is read once, for all the names
+		self.assertTrue(success, output)
+		self.assertEqual(calls, [self.files_path])
+		self.assertIn("=> Success: 200 files created!", output)
+		self.assertEqual(len(os.listdir(self.files_path)), 200)
+		self.assertEqual(self.readFile(self.files_path + "Model137.txt"), "Model137 in files")
+		self.assertEqual(len(self.app_obj.created_paths), 200)
+
+	def testExistingFiles(self) :
+		self.writeFile(self.files_path + "b.txt", "user b")
+		self.writeFile(self.files_path + "d.txt", "user d")
+
+		# without flags, none of the files are created if any of them exists, and all those that exist are listed
+		success, output = self.createFiles(self.files_path, "a,b,c,d")
+		self.assertFalse(success)
+		self.assertIn("The file(s) b.txt, d.txt already exist.", output)
+		self.assertEqual(sorted(os.listdir(self.files_path)), ["b.txt", "d.txt"])
+
+		# with the flag "o" they're overwritten, and the directory isn't read at all
+		calls = self.countScandir()
+		success, output = self.createFiles(self.files_path, "a,b,c,d", "o")
+		self.assertTrue(success, output)
+		self.assertEqual(calls, [])
+		for name in "abcd" :
+			self.assertEqual(self.readFile(self.files_path + name + ".txt"), name + " in files")
+
+	def testMissingDirectories(self) :
+		files_path = os.path.join(self.temp_path, "a", "b") + os.sep
+
+		# without the flag "f" the files can't be created in a directory that doesn't exist
+		success, output = self.createFiles(files_path, "x,y")
+		self.assertFalse(success)
+		self.assertFalse(os.path.exists(os.path.join(self.temp_path, "a")))
+
+		# with it, the directories are created once for all the names
+		success, output = self.createFiles(files_path, "x,y", "f")
+		self.assertTrue(success, output)
+		self.assertEqual(sorted(os.listdir(files_path)), ["x.txt", "y.txt"])
+		self.assertEqual(self.readFile(files_path + "y.txt"), "y in b")
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,217 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, json, shutil, tempfile, unittest
+from classes import Application, Durability, Journal, Writer
+
+class TestJournal(unittest.TestCase) :
+	"""Checks that a rollback removes exactly the directories and files created by an action."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+
+	def tearDown(self) :
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# creates a file with the provided content
+	def writeFile(self, file_path, content) :
+		file_object = open(file_path, "w", encoding = "utf-8")
+		file_object.write(content)
+		file_object.close()
+
+	# returns the content of a file
+	def readFile(self, file_path) :
+		file_object = open(file_path, "r", encoding = "utf-8")
+		content = file_object.read()
+		file_object.close()
+
+		return(content)
+
+	# returns an Application object with an empty project type loaded, and the location where the project is created
+	def buildProjectApplication(self) :
+		data_path = os.path.join(self.temp_path, "data")
+		os.mkdir(data_path)
+		for name, data in (("keywords", {}), ("project", {"bench" : {}})) :
+			self.writeFile(os.path.join(data_path, name + ".json"), json.dumps(data))
+
+		location = os.path.join(self.temp_path, "location") + os.sep
+		os.mkdir(location)
+
+		app_obj = Application.Application(data_path, False)
+		self.assertTrue(app_obj.prepareAction(["project", location, "proj", "bench"]))
+		self.assertTrue(app_obj.updateJsonData("bench"))
+
+		return((app_obj, location))
+
+	def testRollback(self) :
+		journal = Journal.Journal()
+		dir_path = os.path.join(self.temp_path, "dir")
+		os.mkdir(dir_path)
+		journal.record("dir", dir_path)
+		file_path = os.path.join(dir_path, "file.txt")
+		self.writeFile(file_path, "new")
+		journal.record("file", file_path)
+
+		self.assertTrue(journal.rollback())
+		self.assertEqual(os.listdir(self.temp_path), [])
+		self.assertEqual(journal.entries, [])
+
+	def testForeignEntries(self) :
+		journal = Journal.Journal()
+		dir_path = os.path.join(self.temp_path, "dir")
+		os.mkdir(dir_path)
+		journal.record("dir", dir_path)
+
+		# a directory with a file not created by the action isn't removed, and is kept to be undone later
+		self.writeFile(os.path.join(dir_path, "user.txt"), "user")
+		# an entry that no longer exists is ignored
+		journal.record("file", os.path.join(dir_path, "removed.txt"))
+
+		self.assertFalse(journal.rollback())
+		self.assertEqual(self.readFile(os.path.join(dir_path, "user.txt")), "user")
+		self.assertEqual(journal.entries, [["dir", dir_path]])
+
+	def testJournalFile(self) :
+		journal_path = os.path.join(self.temp_path, "action.journal")
+		journal = Journal.Journal(journal_path, ["project", "test"], self.temp_path)
+		self.assertTrue(journal.open())
+
+		dir_path = os.path.join(self.temp_path, "dir")
+		os.mkdir(dir_path)
+		journal.record("dir", dir_path)
+
+		# the entries can be read back from the file, as if the program had stopped
+		loaded = Journal.Journal.load(journal_path)
+		self.assertEqual(loaded.command, ["project", "test"])
+		self.assertEqual(loaded.cwd, self.temp_path)
+		self.assertEqual(loaded.entries, [["dir", dir_path]])
+
+		self.assertTrue(loaded.rollback())
+		loaded.close()
+		journal.file_object.close()
+		self.assertFalse(os.path.exists(dir_path))
+		self.assertFalse(os.path.exists(journal_path))
+
+	def testOverwrittenFiles(self) :
+		existing_path = os.path.join(self.temp_path, "existing.txt")
+		self.writeFile(existing_path, "user")
+		source_path = os.path.join(self.temp_path, "source.txt")
+		self.writeFile(source_path, "source")
+		new_path = os.path.join(self.temp_path, "new.txt")
+		copied_path = os.path.join(self.temp_path, "copied.txt")
+
+		for thread_count in (0, 2) :
+			journal = Journal.Journal()
+			writer = Writer.Writer(thread_count, journal)
+			writer.put(0, existing_path, "overwritten")
+			writer.put(1, new_path, iter(["new", " content"]))
+			writer.putCopy(2, copied_path, source_path, "copy")
+			self.assertEqual(writer.close(), None)
+
+			self.assertEqual(self.readFile(existing_path), "overwritten")
+			self.assertEqual(self.readFile(new_path), "new content")
+			self.assertEqual(self.readFile(copied_path), "source")
+
+			# only the files created by the action are removed, while an overwritten file is kept
+			self.assertEqual(sorted(entry[1] for entry in journal.entries), sorted([new_path, copied_path]))
+			self.assertTrue(journal.rollback())
+			self.assertTrue(os.path.isfile(existing_path))
+			self.assertFalse(os.path.exists(new_path))
+			self.assertFalse(os.path.exists(copied_path))
+
+			self.writeFile(existing_path, "user")
+
+	def testRelativeDirectories(self) :
+		app_obj = Application.Application(self.temp_path, False)
+		journal = Journal.Journal()
+
+		# a relative path whose parents don't exist is created from the current directory
+		cwd = os.getcwd()
+		os.chdir(self.temp_path)
+		try :
+			app_obj.makeDirs(os.path.join("a", "b", "c"), journal)
+		finally :
+			os.chdir(cwd)
+
+		self.assertTrue(os.path.isdir(os.path.join(self.temp_path, "a", "b", "c")))
+		self.assertEqual(journal.entries, [["dir", "a"], ["dir", os.path.join("a", "b")], ["dir", os.path.join("a", "b", "c")]])
+
+	def testRebase(self) :
+		journal_path = os.path.join(self.temp_path, "action.journal")
+		journal = Journal.Journal(journal_path, ["project", "test"], self.temp_path)
+		self.assertTrue(journal.open())
+		journal.record("dir", "C:\\.proj.1234abcd.staging")
+		journal.record("file", "C:\\.proj.1234abcd.staging\\a.txt")
+		journal.record("file", "C:\\.proj.1234abcd.stagingx\\b.txt")
+
+		# only the moved directory and its content change, in memory and in the journal file
+		journal.rebase("C:\\.proj.1234abcd.staging\\", "C:\\proj\\")
+		journal.record("file", "C:\\proj\\c.txt")
+		journal.file_object.close()
+		expected = [["dir", "C:\\proj"], ["file", "C:\\proj\\a.txt"], ["file", "C:\\.proj.1234abcd.stagingx\\b.txt"], ["file", "C:\\proj\\c.txt"]]
+		self.assertEqual(journal.entries, expected)
+		self.assertEqual(Journal.Journal.load(journal_path).entries, expected)
+		self.assertEqual(Journal.Journal.load(journal_path).command, ["project", "test"])
+
+	def testCreateProject(self) :
+		app_obj, location = self.buildProjectApplication()
+		journal = Journal.Journal()
+
+		# the project is moved into place, and the journal records it there instead of in the staging directory
+		self.assertTrue(app_obj.createProject("proj", location, journal))
+		self.assertEqual(os.listdir(location), ["proj"])
+		self.assertEqual(journal.entries, [["dir", location + "proj"]])
+
+		# so that it's removed if anything fails afterwards
+		self.assertTrue(app_obj.rollbackJournal(journal))
+		self.assertEqual(os.listdir(location), [])
+		app_obj.pack.close()
+
+	def testCreateProjectFailures(self) :
+		app_obj, location = self.buildProjectApplication()
+
+		# the structure couldn't be created, so the staging directory is removed by the rollback
+		journal = Journal.Journal()
+		app_obj.createStructure = lambda *args : False
+		self.assertFalse(app_obj.createProject("proj", location, journal))
+		self.assertEqual(len(os.listdir(location)), 1)
+		self.assertTrue(app_obj.rollbackJournal(journal))
+		self.assertEqual(os.listdir(location), [])
+		del app_obj.createStructure
+
+		# the move couldn't be synced, after the project was moved into place, so the project is removed by the rollback
+		def failSync(path) :
+			raise OSError("sync failed")
+		journal = Journal.Journal()
+		app_obj.durability = Durability.Durability("batch")
+		app_obj.durability.syncDirectory = failSync
+		self.assertFalse(app_obj.createProject("proj", location, journal))
+		self.assertEqual(os.listdir(location), ["proj"])
+		self.assertTrue(app_obj.rollbackJournal(journal))
+		self.assertEqual(os.listdir(location), [])
+		app_obj.pack.close()
+
+	def testStaleStaging(self) :
+		app_obj, location = self.buildProjectApplication()
+
+		# the staging directories left by the project are removed, but not the ones of other projects or the user's
+		for name in (".proj.0123abcd.staging", ".other.0123abcd.staging", ".proj.backup") :
+			os.mkdir(location + name)
+		self.writeFile(location + ".proj.0123abcd.staging" + os.sep + "a.txt", "old")
+
+		self.assertTrue(app_obj.createProject("proj", location, Journal.Journal()))
+		self.assertEqual(sorted(os.listdir(location)), [".other.0123abcd.staging", ".proj.backup", "proj"])
+		app_obj.pack.close()
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,73 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import unittest
+from classes import ComputedKeywords, KeywordScope, Template
+
+class TestKeywordScope(unittest.TestCase) :
+	"""Checks that the keyword scopes search their layers in order and only compute the keywords that are used."""
+
+	def setUp(self) :
+		# the number of times each computed keyword was evaluated
+		self.calls = {"date" : 0, "author" : 0}
+		self.computed = ComputedKeywords.ComputedKeywords({
+			"date" : lambda : self.compute("date", "2016-01-01"),
+			"author" : lambda : self.compute("author", "Pedro")
+		})
+		self.action = KeywordScope.KeywordScope({"name" : "projman", "nested" : "|!name!| by |!author!|"}, self.computed)
+
+	# counts an evaluation of a computed keyword and returns its value
+	def compute(self, keyword, value) :
+		self.calls[keyword] += 1
+
+		return(value)
+
+	def testLayers(self) :
+		directory = KeywordScope.KeywordScope({"dir_name" : "src", "name" : "directory"}, self.action)
+		file = KeywordScope.KeywordScope({"file_name" : "a.py"}, directory)
+
+		# the closest layer wins, and the parent layers aren't changed by setting a keyword
+		self.assertEqual(file["name"], "directory")
+		self.assertEqual(file.get("file_name"), "a.py")
+		self.assertEqual(file.get("missing", "default"), "default")
+		self.assertNotIn("missing", file)
+		self.assertRaises(KeyError, lambda : file["missing"])
+		file["dir_name"] = "lib"
+		self.assertEqual(file["dir_name"], "lib")
+		self.assertEqual(directory["dir_name"], "src")
+
+	def testResolve(self) :
+		file = KeywordScope.KeywordScope({"file_name" : "a.py"}, self.action)
+
+		# the keywords used by the values are resolved too, and the missing ones are left out
+		self.assertEqual(file.resolve(("file_name", "nested", "missing")), {"file_name" : "a.py", "nested" : "|!name!| by |!author!|", "name" : "projman", "author" : "Pedro"})
+		self.assertEqual(self.calls, {"date" : 0, "author" : 1})
+
+	def testComputedOnlyWhenUsed(self) :
+		file = KeywordScope.KeywordScope({"file_name" : "a.py"}, self.action)
+
+		# a template that doesn't reference a computed keyword never evaluates it
+		self.assertEqual(Template.Template.compile("|!file_name!| of |!name!|").render(file), "a.py of projman")
+		self.assertEqual(self.calls, {"date" : 0, "author" : 0})
+
+		# a referenced one is evaluated once, and kept for the following files
+		for i in range(3) :
+			self.assertEqual(Template.Template.compile("|!date!| |!file_name!|").render(KeywordScope.KeywordScope({"file_name" : str(i)}, self.action)), "2016-01-01 " + str(i))
+		self.assertEqual(self.calls, {"date" : 1, "author" : 0})
+
+		# a keyword with the same name in an upper layer takes precedence, without computing it
+		self.assertEqual(KeywordScope.KeywordScope({"author" : "me"}, self.action)["author"], "me")
+		self.assertEqual(self.calls, {"date" : 1, "author" : 0})
+
+if (__name__ == "__main__") :
+	unittest.main()
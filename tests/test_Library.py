@@ -0,0 +1,130 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, json, shutil, tempfile, unittest
+from classes import ActionError, Library
+
+class TestLibrary(unittest.TestCase) :
+	"""Checks how the Library class passes the arguments to the actions and reports their errors, without creating any files."""
+
+	@classmethod
+	def setUpClass(cls) :
+		cls.library = Library.Library()
+
+	@classmethod
+	def tearDownClass(cls) :
+		cls.library.pack.close()
+
+	# replaces the execution of the actions with the provided function, which is called with the action's CLI object
+	def replaceAction(self, function) :
+		app_obj = self.library.app_obj
+		app_obj.runAction = lambda : function(app_obj.cli_obj)
+		self.addCleanup(vars(app_obj).pop, "runAction", None)
+
+	def testNamesAsGiven(self) :
+		actions = []
+		self.replaceAction(lambda cli_obj : actions.append(cli_obj) or True)
+
+		# the names and locations are neither split nor expanded
+		self.library.createFile("work", ["a,b", "Model{1..3}", "@names.txt", "a,b"], "python:class", "fo")
+		self.assertEqual(actions[-1].args["file_names"], ["a,b", "Model{1..3}", "@names.txt"])
+		self.assertEqual(actions[-1].args["config_flags"], ["f", "o"])
+
+		self.library.createProject(["C:\\a;b", "C:\\c:d"], "site", "php", writers = 2, root_markers = [".git", "a,b"])
+		self.assertEqual(actions[-1].args["locations"], ["C:\\a;b\\", "C:\\c:d\\"])
+		self.assertEqual(actions[-1].options["writers"], 2)
+		self.assertEqual(actions[-1].options["root-markers"], (".git", "a,b"))
+
+	def testInvalidArguments(self) :
+		with self.assertRaises(ActionError.ArgumentError) :
+			self.library.createProject([], "site", "php")
+		with self.assertRaises(ActionError.ArgumentError) :
+			self.library.createFile("work", "", "python:class")
+		with self.assertRaises(ActionError.ArgumentError) :
+			self.library.createFile("work", "name", "python:class", writers = 0)
+		with self.assertRaises(ActionError.ArgumentError) :
+			self.library.createFile("work", "name", "python:class", unknown = True)
+		with self.assertRaises(ActionError.TypeNotFoundError) :
+			self.library.createFile("work", "name", "python:unknown")
+
+	def testErrors(self) :
+		# the error has all the messages reported by the action
+		def failAction(cli_obj) :
+			self.library.app_obj.printError("The 1st error.")
+			self.library.app_obj.printError("The 2nd error.\n")
+			return(False)
+
+		self.replaceAction(failAction)
+		with self.assertRaises(ActionError.ActionError) as context :
+			self.library.createFile("work", "name", "python:class")
+
+		self.assertEqual(str(context.exception), "The 1st error.\nThe 2nd error.")
+		self.assertEqual(context.exception.result.errors, ["The 1st error.", "The 2nd error."])
+		self.assertEqual(context.exception.__cause__, None)
+
+		# an unexpected exception is the error's cause
+		exception = OSError(28, "No space left on device")
+		def raiseException(cli_obj) :
+			raise exception
+
+		self.replaceAction(raiseException)
+		with self.assertRaises(ActionError.ActionError) as context :
+			self.library.createFile("work", "name", "python:class")
+
+		self.assertIs(context.exception.__cause__, exception)
+		self.assertEqual(context.exception.result.errors, ["OSError: [Errno 28] No space left on device"])
+
+	def testRejectedAfterSuccess(self) :
+		def createAction(cli_obj) :
+			self.library.app_obj.created_paths.append("C:\\work\\name.py")
+			return(True)
+
+		self.replaceAction(createAction)
+		self.assertEqual(self.library.createFile("work", "name", "python:class").paths, ["C:\\work\\name.py".replace("\\", os.sep)])
+
+		# an action rejected before it's executed doesn't report what the previous action created
+		with self.assertRaises(ActionError.ActionError) as context :
+			self.library.createProject("C:\\work", "site", "php", output_archive = "-")
+		self.assertEqual(context.exception.result.paths, [])
+		self.assertEqual(context.exception.result.bytes, 0)
+
+	def testCreatedProject(self) :
+		if (os.name != "nt") :
+			self.skipTest("The projects are created with Windows paths.")
+
+		temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+		self.addCleanup(shutil.rmtree, temp_path, True)
+		data_path = os.path.join(temp_path, "data")
+		os.mkdir(data_path)
+		for name, data in (("keywords", {}), ("project", {"bench" : {"src" : {"a.txt" : "|!project_name!|"}, "b.txt" : "bb"}}), ("file", {"text" : {"extension" : "txt", "content" : "|!file_name!|!"}})) :
+			file_object = open(os.path.join(data_path, name + ".json"), "w", encoding = "utf-8")
+			json.dump(data, file_object)
+			file_object.close()
+
+		library = Library.Library(data_path)
+		try :
+			# the result has the project's directory and the number of files and bytes written
+			result = library.createProject(temp_path, "proj", "bench", no_cache = True)
+			self.assertEqual(result.paths, [os.path.join(temp_path, "proj")])
+			self.assertEqual((result.files, result.bytes), (2, 6))
+			self.assertTrue(os.path.isfile(os.path.join(temp_path, "proj", "src", "a.txt")))
+
+			# and the next action's result only has what it created
+			result = library.createFile(os.path.join(temp_path, "proj"), ["c", "d"], "text", no_cache = True)
+			self.assertEqual(result.paths, [os.path.join(temp_path, "proj", "c.txt"), os.path.join(temp_path, "proj", "d.txt")])
+			self.assertEqual((result.files, result.bytes), (2, 4))
+		finally :
+			library.pack.close()
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,120 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, json, time, shutil, tempfile, unittest
+from classes import Pack, Template
+
+# the directory with the shipped JSON files
+data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "data")
+
+class TestPack(unittest.TestCase) :
+	"""Checks that the compiled version of the JSON files has the same content as the JSON files themselves."""
+
+	def setUp(self) :
+		# NOTE: the JSON files are copied, so that the compiled file in the data directory isn't touched
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+		self.json_path = os.path.join(self.temp_path, "data") + os.sep
+		shutil.copytree(data_path, self.json_path, ignore = shutil.ignore_patterns("templates.pack", "*.tmp"))
+
+	def tearDown(self) :
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# returns the decoded content of one of the JSON files
+	def loadJSON(self, name) :
+		file_object = open(self.json_path + name + ".json", "r", encoding = "utf-8")
+		data = json.load(file_object)
+		file_object.close()
+
+		return(data)
+
+	# writes one of the JSON files
+	def writeJSON(self, name, data) :
+		file_object = open(self.json_path + name + ".json", "w", encoding = "utf-8")
+		json.dump(data, file_object)
+		file_object.close()
+
+	def testShippedData(self) :
+		pack = Pack.Pack.openData(self.json_path)
+		try :
+			for name in Pack.Pack.json_names :
+				self.assertEqual(pack.getNode(name), self.loadJSON(name), name)
+		finally :
+			pack.close()
+
+	def testNodes(self) :
+		data = {"a" : {"b:c" : {"d" : "|!x!| and |!y[uc]!|"}, "e" : "text", "f" : 1, "g" : [1, "two"], "h" : None, "i" : {}}, "Σ" : {"j" : "ü"}}
+		self.writeJSON("project", data)
+
+		pack = Pack.Pack.openData(self.json_path)
+		pack.template_loader = Template.Template.preload
+		try :
+			self.assertEqual(pack.getNode("project"), data)
+			self.assertEqual(pack.getNode("project", ("a", "b:c")), data["a"]["b:c"])
+			self.assertEqual(pack.getNode("project", ("a", "e")), "text")
+			self.assertEqual(pack.getNode("project", ("missing",)), None)
+			self.assertEqual(pack.getKeys("project"), ["a", "Σ"])
+
+			# the strings' segments are reused by the templates, which must render the same as the string compiled again
+			template = Template.Template.cache[data["a"]["b:c"]["d"]]
+			self.assertEqual(template.render({"x" : "1", "y" : "two"}), Template.Template(data["a"]["b:c"]["d"]).render({"x" : "1", "y" : "two"}))
+		finally :
+			pack.close()
+
+	def testSameBuild(self) :
+		# building the compiled file again from the same JSON files gives the same file, byte for byte
+		pack = Pack.Pack.openData(self.json_path)
+		pack.close()
+		file_object = open(self.json_path + "templates.pack", "rb")
+		first_build = file_object.read()
+		file_object.close()
+
+		os.remove(self.json_path + "templates.pack")
+		pack = Pack.Pack.openData(self.json_path)
+		pack.close()
+		file_object = open(self.json_path + "templates.pack", "rb")
+		second_build = file_object.read()
+		file_object.close()
+
+		self.assertEqual(first_build, second_build)
+
+	def testRefresh(self) :
+		pack = Pack.Pack.openData(self.json_path)
+		pack.close()
+
+		# a JSON file changed after the compiled file was built is compiled again
+		data = self.loadJSON("file")
+		data["new_type"] = {"extension" : "txt", "content" : "new"}
+		self.writeJSON("file", data)
+		stats = os.stat(self.json_path + "file.json")
+		os.utime(self.json_path + "file.json", ns = (stats.st_atime_ns, stats.st_mtime_ns + 1000000000))
+
+		pack = Pack.Pack.openData(self.json_path)
+		try :
+			self.assertEqual(pack.getNode("file"), data)
+			self.assertIn(("new_type", "file"), pack.getTypes("file"))
+		finally :
+			pack.close()
+
+	def testTypes(self) :
+		self.writeJSON("file", {"class" : {"php" : {"extension" : "php", "content" : ""}, "js" : {"extension" : "js", "content" : ""}}, "css" : {"extension" : "css", "content" : ""}})
+
+		pack = Pack.Pack.openData(self.json_path)
+		try :
+			self.assertEqual(pack.getTypes("file", kinds = ("file",)), [("class:js", "file"), ("class:php", "file"), ("css", "file")])
+			self.assertEqual(pack.getTypes("file", "class:p"), [("class:php", "file")])
+			self.assertEqual(pack.getKind("file", ("class",)), "group")
+		finally :
+			pack.close()
+
+if (__name__ == "__main__") :
+	unittest.main()
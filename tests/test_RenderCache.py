@@ -0,0 +1,87 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, shutil, tempfile, unittest
+from classes import Application, Metrics, RenderCache
+
+# the directory with the shipped JSON files
+data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "data")
+
+class TestRenderCache(unittest.TestCase) :
+	"""Checks that the content of the files found in the cache is the same as the content rendered without it."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+		self.cache_path = os.path.join(self.temp_path, "renders.db")
+
+		self.app_obj = Application.Application(data_path, False)
+		self.assertTrue(self.app_obj.prepareAction(["project", self.temp_path, "name", "php"]))
+
+		# every file is looked for in the cache, whatever its size
+		self.app_obj.cache_file_length = 0
+		self.app_obj.cache_length = 0
+
+		# the files of all the shipped project types, plus a large file full of placeholders
+		self.plan = []
+		for project_type in self.app_obj.pack.getKeys("project") :
+			self.assertTrue(self.app_obj.updateJsonData(project_type))
+			self.app_obj.keywords["project_name"] = project_type.title()
+			self.app_obj.planStructure(self.app_obj.json_data, project_type + "\\", (), self.plan)
+		self.plan.append(("file", "dense.js", "dense.js", "|!copyright!|\n" + "|!project_name!| |!file_name[uc]!| |!missing!|\n" * 5000, ()))
+		self.files = [entry for entry in self.plan if (entry[0] == "file")]
+
+		# the content of the files rendered without the cache
+		self.expected = self.renderFiles(None)
+
+	def tearDown(self) :
+		self.app_obj.pack.close()
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# renders the plan's files with the provided cache, or without a cache if it's None, and returns their content
+	def renderFiles(self, render_cache) :
+		self.app_obj.render_cache = render_cache
+		self.app_obj.selectRenderCache(self.plan)
+
+		self.app_obj.rendered_files = {}
+		rendered = [self.app_obj.renderFile(entry[1], entry[3]) for entry in self.files]
+		self.app_obj.rendered_files = {}
+
+		if (render_cache != None) :
+			render_cache.flush()
+
+		return(rendered)
+
+	def testSameContent(self) :
+		# the 1st time the files are rendered and added to the cache
+		render_cache = RenderCache.RenderCache(self.cache_path)
+		self.assertEqual(self.renderFiles(render_cache), self.expected)
+
+		# the 2nd time they're found in the cache, from the database
+		render_cache = RenderCache.RenderCache(self.cache_path)
+		render_cache.metrics = Metrics.Metrics()
+		self.assertEqual(self.renderFiles(render_cache), self.expected)
+		self.assertGreater(render_cache.metrics.counters["cache_hits"], 0)
+		self.assertEqual(render_cache.metrics.counters["cache_misses"], 0)
+		render_cache.disable()
+
+	def testUnusableCache(self) :
+		# the files are rendered as usual if the database can't be created
+		file_object = open(os.path.join(self.temp_path, "file.txt"), "w", encoding = "utf-8")
+		file_object.close()
+
+		render_cache = RenderCache.RenderCache(os.path.join(self.temp_path, "file.txt", "renders.db"))
+		self.assertEqual(self.renderFiles(render_cache), self.expected)
+		self.assertTrue(render_cache.failed)
+
+if (__name__ == "__main__") :
+	unittest.main()
@@ -0,0 +1,98 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, shutil, tempfile, unittest
+from classes import Application, Metrics, RenderCache
+
+# the directory with the shipped JSON files
+data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "data")
+
+class TestRenderPool(unittest.TestCase) :
+	"""Checks that the content of the files rendered by a pool of processes is the same as the content rendered by the program's own process."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+
+		self.app_obj = Application.Application(data_path, False)
+		self.assertTrue(self.app_obj.prepareAction(["project", self.temp_path, "name", "php", "--jobs=2", "--no-cache"]))
+
+		# every structure is rendered by the pool, whatever its size
+		self.app_obj.parallel_length = 0
+
+		# the files of all the shipped project types, plus large files full of placeholders
+		self.plan = []
+		for project_type in self.app_obj.pack.getKeys("project") :
+			self.assertTrue(self.app_obj.updateJsonData(project_type))
+			self.app_obj.keywords["project_name"] = project_type.title()
+			self.app_obj.planStructure(self.app_obj.json_data, project_type + "\\", (), self.plan)
+		for name in ("dense.js", "dense.py", "other.js") :
+			self.plan.append(("file", name, name, "|!copyright!|\n" + "|!project_name!| |!file_name[uc]!| |!missing!|\n" * 5000, ()))
+		self.files = [(index, entry) for index, entry in enumerate(self.plan) if (entry[0] == "file")]
+
+		# the content of the files rendered by the program's own process
+		self.app_obj.rendered_files = {}
+		self.expected = {index : self.app_obj.renderFile(entry[1], entry[3]) for index, entry in self.files}
+		self.app_obj.rendered_files = {}
+
+	def tearDown(self) :
+		self.app_obj.pack.close()
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	def testSameContent(self) :
+		rendered = self.app_obj.renderInParallel(self.plan)
+
+		# all the files are rendered by the pool, except the ones whose placeholders could overlap
+		self.assertGreater(len(rendered), len(self.files) // 2)
+		for index in rendered :
+			self.assertEqual(rendered[index], self.expected[index])
+
+		# the files the pool didn't render are rendered by the program's own process, as usual
+		rendered = self.app_obj.renderStructure(self.plan)
+		self.assertEqual(rendered, self.expected)
+
+	def testWithCache(self) :
+		# every file is looked for in the cache, whatever its size
+		self.app_obj.render_cache = RenderCache.RenderCache(os.path.join(self.temp_path, "renders.db"))
+		self.app_obj.render_cache.metrics = Metrics.Metrics()
+		self.app_obj.cache_file_length = 0
+		self.app_obj.cache_length = 0
+
+		# the 1st time the files are rendered by the pool and added to the cache, and the 2nd time they're found in it
+		for i in range(2) :
+			self.assertEqual(self.app_obj.renderStructure(self.plan), self.expected)
+			self.app_obj.render_cache.flush()
+		self.assertGreater(self.app_obj.render_cache.metrics.counters["cache_hits"], 0)
+		self.app_obj.render_cache.disable()
+
+	def testOtherKeywords(self) :
+		self.app_obj.render_cache = RenderCache.RenderCache(os.path.join(self.temp_path, "renders.db"))
+		self.app_obj.cache_file_length = 0
+		self.app_obj.cache_length = 0
+
+		# a value that forms a placeholder with the text around it makes the file use a keyword it doesn't reference
+		self.app_obj.keywords["open"] = "|"
+		plan = [("file", "a.txt", "a.txt", "|!open!|!project_name!| |!file_name!|\n" * 100, ()), ("file", "b.txt", "b.txt", "|!project_name!| |!file_name!|\n" * 100, ()), ("file", "c.txt", "c.txt", "|!file_name!| |!project_name!|\n" * 100, ())]
+
+		# so it isn't rendered by the pool, or kept in the cache, and it's never rendered with a previous project's name
+		for project_name in ("First", "Second") :
+			self.app_obj.keywords["project_name"] = project_name
+			self.assertEqual(sorted(self.app_obj.renderInParallel(plan)), [1, 2])
+
+			rendered = self.app_obj.renderStructure(plan)
+			self.assertEqual(rendered[0], (project_name + " a\n") * 100)
+			self.assertEqual(rendered[1], (project_name + " b\n") * 100)
+			self.app_obj.render_cache.flush()
+		self.app_obj.render_cache.disable()
+
+if (__name__ == "__main__") :
+	unittest.main()
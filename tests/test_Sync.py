@@ -0,0 +1,116 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, json, shutil, tempfile, unittest
+from classes import Application
+
+class TestSync(unittest.TestCase) :
+	"""Checks that the sync action compares the files by size and then by content, and only writes the missing and changed ones."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+
+		data_path = os.path.join(self.temp_path, "data")
+		os.mkdir(data_path)
+		structure = {("file" + str(i) + ".txt") : "file |!file_name!| of |!project_name!|\n" for i in range(10)}
+		for name, data in (("keywords", {}), ("project", {"bench" : structure})) :
+			self.writeFile(os.path.join(data_path, name + ".json"), json.dumps(data))
+
+		self.project_path = os.path.join(self.temp_path, "proj") + os.sep
+		os.mkdir(self.project_path)
+
+		self.app_obj = Application.Application(data_path, False)
+		self.assertTrue(self.app_obj.prepareAction(["sync", self.project_path, "proj", "bench", "--writers=4", "--no-cache"]))
+		self.assertTrue(self.app_obj.updateJsonData("bench"))
+		self.app_obj.keywords["project_name"] = "Proj"
+
+	def tearDown(self) :
+		self.app_obj.pack.close()
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# creates a file with the provided content
+	def writeFile(self, file_path, content) :
+		file_object = open(file_path, "w", encoding = "utf-8")
+		file_object.write(content)
+		file_object.close()
+
+	# returns the content of a file
+	def readFile(self, file_path) :
+		file_object = open(file_path, "r", encoding = "utf-8")
+		content = file_object.read()
+		file_object.close()
+
+		return(content)
+
+	def testCompareFile(self) :
+		file_path = os.path.join(self.temp_path, "a.txt")
+		self.assertEqual(self.app_obj.compareFile(file_path, "abc"), "added")
+
+		self.writeFile(file_path, "abc")
+		self.assertEqual(self.app_obj.compareFile(file_path, "abc"), "unchanged")
+		self.assertEqual(self.app_obj.compareFile(file_path, "abd"), "changed")
+		self.assertEqual(self.app_obj.compareFile(file_path, "abcd"), "changed")
+
+		# content whose size isn't known is compared a chunk at a time, including anything left in the file
+		self.assertEqual(self.app_obj.compareFile(file_path, iter(["a", "bc"])), "unchanged")
+		self.assertEqual(self.app_obj.compareFile(file_path, iter(["a", "b"])), "changed")
+		self.assertEqual(self.app_obj.compareFile(file_path, iter(["a", "bcd"])), "changed")
+
+	def testSizeBeforeContent(self) :
+		file_path = os.path.join(self.temp_path, "a.txt")
+		self.writeFile(file_path, "abc")
+		source_path = os.path.join(self.temp_path, "source.txt")
+		self.writeFile(source_path, "abcd")
+
+		# a source file with a different size isn't read at all
+		reads = []
+		class Source :
+			def __init__(self, source_object) :
+				self.source_object = source_object
+			def fileno(self) :
+				return(self.source_object.fileno())
+			def read(self, size) :
+				reads.append(size)
+				return(self.source_object.read(size))
+
+		source_object = open(source_path, "rb")
+		try :
+			self.assertEqual(self.app_obj.compareFile(file_path, Source(source_object)), "changed")
+		finally :
+			source_object.close()
+		self.assertEqual(reads, [])
+
+	def testSyncStructure(self) :
+		# the 1st sync creates all the files
+		self.assertEqual(self.app_obj.syncStructure(self.app_obj.json_data, self.project_path), {"added" : 10, "changed" : 0, "unchanged" : 0})
+		self.assertEqual(self.readFile(self.project_path + "file3.txt"), "file file3 of Proj\n")
+
+		# only the missing and changed files are written again, while the others and the user's files aren't touched
+		os.remove(self.project_path + "file1.txt")
+		self.writeFile(self.project_path + "file2.txt", "file file2 of Proj\n".upper())
+		self.writeFile(self.project_path + "file4.txt", "edited")
+		self.writeFile(self.project_path + "user.txt", "user")
+		for name in os.listdir(self.project_path) :
+			os.utime(self.project_path + name, (1000000000, 1000000000))
+
+		self.assertEqual(self.app_obj.syncStructure(self.app_obj.json_data, self.project_path), {"added" : 1, "changed" : 2, "unchanged" : 7})
+		for i in range(10) :
+			self.assertEqual(self.readFile(self.project_path + "file" + str(i) + ".txt"), "file file" + str(i) + " of Proj\n")
+			self.assertEqual(os.stat(self.project_path + "file" + str(i) + ".txt").st_mtime == 1000000000, i not in (1, 2, 4))
+		self.assertEqual(self.readFile(self.project_path + "user.txt"), "user")
+
+		# and once everything is in sync, nothing is written
+		self.assertEqual(self.app_obj.syncStructure(self.app_obj.json_data, self.project_path), {"added" : 0, "changed" : 0, "unchanged" : 10})
+
+if (__name__ == "__main__") :
+	unittest.main()
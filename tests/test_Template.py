@@ -0,0 +1,169 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import re, random, unittest
+from classes import Template
+
+# the original implementation of Application.replaceKeyWords(), which replaces one placeholder at a time
+# used as the reference for the output of the compiled templates, which must be the same, byte for byte
+def referenceRender(replacements, string) :
+	re_pattern = "\\|!([^{!\\[\\]]+)(\\{\\d+\\})?(\\[[^{!\\[\\]]+\\])?!\\|"
+	str_func = {"lc" : "lower", "uc" : "upper", "t" : "title"}
+
+	re_matches = re.search(re_pattern, string)
+	while (re_matches != None) :
+		match_groups = re_matches.groups("")
+
+		if (match_groups[0] in replacements and isinstance(replacements[match_groups[0]], str)) :
+			new_string = replacements[match_groups[0]]
+		else :
+			new_string = ""
+
+		if (len(new_string) > 0) :
+			for group in match_groups[1:] :
+				if (group.startswith("{") and group.endswith("}")) :
+					new_string *= int(group[1:-1])
+				elif (group.startswith("[") and group.endswith("]")) :
+					case_enforcer = group[1:-1].lower()
+					if (case_enforcer in str_func) :
+						new_string = getattr(new_string, str_func[case_enforcer])()
+
+		string = string.replace("|!" + "".join(match_groups) + "!|", new_string)
+		re_matches = re.search(re_pattern, string)
+
+	return(string)
+
+class TestTemplate(unittest.TestCase) :
+	"""Checks that the compiled templates render the same strings as the original implementation."""
+
+	# the keywords used to render the templates
+	# NOTE: the values with placeholders of their own only use the keywords after them, so they can't expand forever
+	replacements = {
+		"name" : "my project",
+		"Greek" : "Σισυφος Σ",
+		"empty" : "",
+		"pipe" : "a|b",
+		"open" : "|!",
+		"close" : "!|",
+		"nested" : "<|!name[uc]!|>",
+		"nested_twice" : "(|!nested!| |!name{2}!|)",
+		"dict" : {"text" : "not a string"},
+		"number" : 10
+	}
+
+	# the templates whose output is checked
+	templates = [
+		"",
+		"no placeholders at all",
+		"|!name!|",
+		"start |!name!| middle |!name[uc]!| end",
+		"|!name{3}!||!name[t]!||!name[LC]!||!name[bad]!|",
+		"|!name{2}[t]!| |!Greek[lc]!| |!Greek{3}[t]!| |!Greek[uc]!|",
+		"|!missing!| |!dict!| |!number!| |!empty{5}[uc]!|",
+		"|!nested!| and |!nested_twice[uc]!|",
+		"|!open!|name|!close!|",
+		"|!open!|name!|",
+		"|!|!name!|!|",
+		"|!pipe!| |!a|b!| |!name|!|",
+		"||!name!|| !|!name!|! |!!|",
+		"|!name{0}!| |!name{00}!| |!name{12}!|",
+		"|!na{me!| |!na[me!| |!name]!|",
+		"|!copyright!| |!copyright[uc]!| |!copyright{2}!|"
+	]
+
+	# the pieces the random templates are made of
+	pieces = ["|!", "!|", "|", "!", "name", "Greek", "empty", "pipe", "open", "close", "nested", "missing", "{2}", "{3}", "[uc]", "[t]", "[lc]", " ", "x", "\n"]
+
+	def testTemplates(self) :
+		for string in self.templates :
+			Template.Template.clearCache()
+			self.assertEqual(Template.Template.compile(string).render(self.replacements), referenceRender(self.replacements, string), repr(string))
+
+	def testRandomTemplates(self) :
+		generator = random.Random(2016)
+		for i in range(3000) :
+			string = "".join(generator.choice(self.pieces) for j in range(generator.randint(1, 25)))
+			self.assertEqual(Template.Template.compile(string).render(self.replacements), referenceRender(self.replacements, string), repr(string))
+
+	def testChunks(self) :
+		# the chunks yielded by iterRender() must add up to the same string as render()
+		chunk_size = Template.Template.chunk_size
+		Template.Template.chunk_size = 7
+		try :
+			generator = random.Random(1)
+			for string in self.templates + ["".join(generator.choice(self.pieces) for j in range(40)) for i in range(500)] :
+				template = Template.Template.compile(string)
+				self.assertEqual("".join(template.iterRender(self.replacements)), template.render(self.replacements), repr(string))
+		finally :
+			Template.Template.chunk_size = chunk_size
+
+	def testLargeMultiplier(self) :
+		template = Template.Template.compile("|!name{20000}[t]!|!")
+		expected = referenceRender(self.replacements, template.string)
+		self.assertEqual(template.render(self.replacements), expected)
+		self.assertEqual("".join(template.iterRender(self.replacements)), expected)
+		self.assertEqual(template.estimateLength(self.replacements), len(expected))
+
+	def testSelfContained(self) :
+		# a template that is self contained renders the same string with only the values of its own keywords
+		generator = random.Random(2020)
+		counts = {True : 0, False : 0}
+		for string in self.templates + ["".join(generator.choice(self.pieces) for j in range(generator.randint(1, 25))) for i in range(3000)] :
+			template = Template.Template.compile(string)
+			values = tuple(self.replacements.get(keyword, None) for keyword in template.getKeywords())
+			self_contained = template.isSelfContained(values)
+			counts[self_contained] += 1
+			if (self_contained) :
+				replacements = {keyword : self.replacements[keyword] for keyword in template.getKeywords() if (keyword in self.replacements)}
+				self.assertEqual(template.render(replacements), referenceRender(self.replacements, string), repr(string))
+
+		self.assertGreater(counts[True], 0)
+		self.assertGreater(counts[False], 0)
+
+		# the delimiters can be formed by the replacement strings, or by the literal text around an empty one
+		self.assertTrue(Template.Template.compile("Hello |!name!|!").isSelfContained(("my project",)))
+		self.assertFalse(Template.Template.compile("|!open!|name|!close!|").isSelfContained(("|!", "!|")))
+		self.assertFalse(Template.Template.compile("a||!name!|b").isSelfContained(("!",)))
+		self.assertFalse(Template.Template.compile("a||!empty!|!name!|").isSelfContained(("",)))
+		self.assertFalse(Template.Template.compile("|!name{2}!|name!|").isSelfContained(("!x|",)))
+
+	def testCacheLimit(self) :
+		cache_limit = Template.Template.cache_limit
+		Template.Template.clearCache()
+		Template.Template.cache_limit = 25
+		try :
+			first = Template.Template.compile("a|!name!|a")
+			Template.Template.compile("b|!name!|b")
+
+			# the least recently used template is removed once the limit is reached
+			self.assertIs(Template.Template.compile("a|!name!|a"), first)
+			Template.Template.compile("c|!name!|c")
+			self.assertEqual(list(Template.Template.cache), ["a|!name!|a", "c|!name!|c"])
+			self.assertEqual(Template.Template.cache_length, 20)
+
+			# a template longer than the limit is kept on its own
+			Template.Template.compile("d" * 30)
+			self.assertEqual(list(Template.Template.cache), ["d" * 30])
+			self.assertEqual(Template.Template.cache_length, 30)
+		finally :
+			Template.Template.cache_limit = cache_limit
+			Template.Template.clearCache()
+
+	def testKeywords(self) :
+		template = Template.Template.compile("|!b!| |!a{2}!| |!b[uc]!| |!c!|")
+		self.assertEqual(template.getKeywords(), ("b", "a", "c"))
+		self.assertFalse(template.overlapping)
+		self.assertTrue(Template.Template.compile("|!a|b!|").overlapping)
+
+if (__name__ == "__main__") :
+	unittest.main()
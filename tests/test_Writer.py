@@ -0,0 +1,111 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#															  #
+# Python Project Manager v1.3.0								  #
+#															  #
+# Copyright 2016, PedroHenriques 							  #
+# http://www.pedrojhenriques.com 							  #
+# https://github.com/PedroHenriques 						  #
+# 															  #
+# Free to use under the MIT license.			 			  #
+# http://www.opensource.org/licenses/mit-license.php 		  #
+# 															  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import os, json, shutil, tempfile, threading, unittest
+from classes import Application, Journal, Writer
+
+class TestWriter(unittest.TestCase) :
+	"""Checks that the pool of writer threads writes every file, reports the 1st one that failed and always stops its threads."""
+
+	def setUp(self) :
+		self.temp_path = tempfile.mkdtemp(prefix = "projman-test.")
+		self.thread_count = threading.active_count()
+
+	def tearDown(self) :
+		shutil.rmtree(self.temp_path, ignore_errors = True)
+
+	# returns the content of a file
+	def readFile(self, file_path) :
+		file_object = open(file_path, "r", encoding = "utf-8")
+		content = file_object.read()
+		file_object.close()
+
+		return(content)
+
+	def testPool(self) :
+		for thread_count in (0, 1, 4) :
+			journal = Journal.Journal()
+			writer = Writer.Writer(thread_count, journal)
+			paths = [os.path.join(self.temp_path, str(thread_count) + "-" + str(i) + ".txt") for i in range(50)]
+			for index, file_path in enumerate(paths) :
+				writer.put(index, file_path, "file " + str(index) if (index % 2 == 0) else iter(["file ", str(index)]))
+			self.assertEqual(writer.close(), None)
+
+			# every file is written and recorded, and the threads are stopped
+			for index, file_path in enumerate(paths) :
+				self.assertEqual(self.readFile(file_path), "file " + str(index))
+			self.assertEqual(sorted(entry[1] for entry in journal.entries), sorted(paths))
+			self.assertEqual(threading.active_count(), self.thread_count)
+
+	def testFailedFile(self) :
+		for thread_count in (0, 4) :
+			writer = Writer.Writer(thread_count)
+			writer.put(0, os.path.join(self.temp_path, "a.txt"), "a")
+			writer.put(1, os.path.join(self.temp_path, "missing", "b.txt"), "b")
+			writer.put(2, os.path.join(self.temp_path, "missing", "c.txt"), "c")
+
+			# the 1st file that couldn't be written is reported
+			self.assertEqual(writer.close(), 1)
+			self.assertTrue(writer.failed())
+			self.assertEqual(threading.active_count(), self.thread_count)
+
+	def testException(self) :
+		# content that raises an exception while it's rendered
+		def failingContent() :
+			yield "start"
+			raise ValueError("rendering failed")
+
+		for thread_count in (0, 4) :
+			writer = Writer.Writer(thread_count)
+			writer.put(0, os.path.join(self.temp_path, "a" + str(thread_count) + ".txt"), failingContent())
+
+			# the exception is raised by close(), in the caller's thread, once the threads are stopped
+			with self.assertRaises(ValueError) :
+				writer.close()
+			self.assertEqual(threading.active_count(), self.thread_count)
+
+	def testRenderingError(self) :
+		data_path = os.path.join(self.temp_path, "data")
+		os.mkdir(data_path)
+		for name, data in (("keywords", {}), ("project", {"bench" : {("file" + str(i) + ".txt") : "|!file_name!|" for i in range(20)}})) :
+			file_object = open(os.path.join(data_path, name + ".json"), "w", encoding = "utf-8")
+			json.dump(data, file_object)
+			file_object.close()
+
+		app_obj = Application.Application(data_path, False)
+		self.assertTrue(app_obj.prepareAction(["project", self.temp_path, "proj", "bench", "--writers=4", "--no-cache"]))
+		self.assertTrue(app_obj.updateJsonData("bench"))
+
+		# a file that can't be rendered stops the action, after the files already queued are written
+		render_file = app_obj.renderFile
+		def renderFile(key, file_content, scope = None) :
+			if (key == "file10.txt") :
+				raise RuntimeError("rendering failed")
+			return(render_file(key, file_content, scope))
+		app_obj.renderFile = renderFile
+
+		output_path = os.path.join(self.temp_path, "output")
+		os.mkdir(output_path)
+		journal = Journal.Journal()
+		with self.assertRaises(RuntimeError) :
+			app_obj.createStructure(app_obj.json_data, output_path + os.sep, journal)
+		self.assertEqual(threading.active_count(), self.thread_count)
+
+		# and everything they created can still be removed
+		self.assertGreater(len(journal.entries), 0)
+		self.assertTrue(journal.rollback())
+		self.assertEqual(os.listdir(output_path), [])
+		app_obj.pack.close()
+
+if (__name__ == "__main__") :
+	unittest.main()